@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Import-time report for the modules of the Cloudera CDP Collection
+
+Imports each module in a new Python process with 'python -X importtime' and reports the total import time, the time
+spent importing Ansible, CDPy (with the CDP CLI beneath it) and the collection itself, and the packages with the
+largest import times. Exits with a non-zero status if the import of any module exceeds --max-ms.
+
+    python benchmarks/import_time.py                     # Report on every module
+    python benchmarks/import_time.py -k iam --max-ms 150  # Report on the iam modules, failing above 150 ms
+
+Requires ansible-core and cdpy.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from run import COLLECTION_ROOT, collections_path
+
+MODULES_DIR = os.path.join(COLLECTION_ROOT, 'plugins', 'modules')
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def parse_importtime(output):
+    """Returns a list of (self us, cumulative us, depth, name) for each import reported by -X importtime"""
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            imports.append((int(match.group(1)), int(match.group(2)), (len(match.group(3)) - 1) // 2,
+                            match.group(4)))
+    return imports
+
+
+def _package_time(imports, package):
+    """Returns the cumulative time of the outermost import of package, i.e. including its dependencies"""
+    return max([c for s, c, d, n in imports if n == package or n.startswith(package + '.')] or [0])
+
+
+def report(module, path):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [path, os.environ.get('PYTHONPATH')])))
+    child = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                            'import ansible_collections.cloudera.cloud.plugins.modules.%s' % module],
+                           env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    imports = parse_importtime(child.stderr)
+    if child.returncode != 0:
+        return dict(module=module, failed=True, msg=child.stderr.strip().splitlines()[-1])
+
+    packages = dict()
+    for self_us, _, _, name in imports:
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0) + self_us
+
+    return dict(
+        module=module,
+        failed=False,
+        total_ms=sum(s for s, _, _, _ in imports) / 1000.0,
+        ansible_ms=_package_time(imports, 'ansible') / 1000.0,
+        cdpy_ms=_package_time(imports, 'cdpy') / 1000.0,
+        collection_ms=sum(s for s, _, _, n in imports if n.startswith('ansible_collections.cloudera.cloud')) / 1000.0,
+        top=[dict(package=p, self_ms=t / 1000.0) for p, t in sorted(packages.items(), key=lambda i: -i[1])[:5]],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the import time of the modules of cloudera.cloud')
+    parser.add_argument('-k', '--keyword', action='append', default=[],
+                        help='report only on the modules whose names contain the keyword; may be repeated')
+    parser.add_argument('--max-ms', type=float, help='fail if the import of any module exceeds this time')
+    parser.add_argument('-o', '--output', help='the path of a file to which the report is written as JSON')
+    options = parser.parse_args()
+
+    modules = sorted(m[:-3] for m in os.listdir(MODULES_DIR) if m.endswith('.py') and not m.startswith('_'))
+    modules = [m for m in modules if not options.keyword or any(k in m for k in options.keyword)]
+
+    path = collections_path()
+    results, failures = [], []
+    print('%-32s %10s %10s %10s %12s  %s' % ('Module', 'total (ms)', 'ansible', 'cdpy', 'collection',
+                                             'largest packages (ms)'))
+    try:
+        for module in modules:
+            result = report(module, path)
+            results.append(result)
+            if result['failed']:
+                failures.append(module)
+                print('%-32s FAILED: %s' % (module, result['msg']))
+                continue
+            if options.max_ms is not None and result['total_ms'] > options.max_ms:
+                failures.append(module)
+            print('%-32s %10.1f %10.1f %10.1f %12.1f  %s' % (
+                module, result['total_ms'], result['ansible_ms'], result['cdpy_ms'], result['collection_ms'],
+                ', '.join('%s %.1f' % (t['package'], t['self_ms']) for t in result['top'])))
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if failures and options.max_ms is not None:
+        print('Modules failing or exceeding %.1f ms: %s' % (options.max_ms, ', '.join(failures)))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks of the module execution paths of the Cloudera CDP Collection
+
+Each case executes a module against the fake CDP backend (see plugins/module_utils/cdp_fake.py), seeded with a
+synthetic account, in a separate Python process, and measures the wall time of the module execution, the number of
+CDP API calls made, and the peak RSS of the process. The results are compared to a baseline file, and the script
+exits with a non-zero status if any case regresses beyond the tolerances.
+
+    python benchmarks/run.py                         # Run all cases and compare to benchmarks/baseline.json
+    python benchmarks/run.py -k env_info -r 5        # Run the env_info cases, five times each
+    python benchmarks/run.py --update-baseline       # Run all cases and record the results as the baseline
+
+Requires ansible-core and cdpy.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTION_ROOT = os.path.dirname(BENCHMARKS_DIR)
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+
+def _case(module, args, **account):
+    return dict(module=module, args=args, account=account)
+
+
+# Each case: the module, its arguments, and the synthetic account, as CDP_FAKE_* settings
+CASES = {
+    'env_info-10': _case('env_info', dict(), environments=10),
+    'env_info-100': _case('env_info', dict(), environments=100),
+    'env_info-1000': _case('env_info', dict(), environments=1000),
+    'env_info-descendants-100': _case('env_info', dict(descendants=True, parallelism=8), environments=100),
+    'iam_user_info-30k': _case('iam_user_info', dict(), users=30000),
+    'iam_user_info-30k-filter': _case('iam_user_info', dict(filter=dict(workloadUsername='^user0[0-4]'),
+                                                            fields=['crn', 'workloadUsername']), users=30000),
+    'datahub_template_info-500': _case('datahub_template_info', dict(), templates=500),
+    'datahub_template_info-500-content': _case('datahub_template_info', dict(return_content=True, parallelism=8),
+                                               templates=500),
+    'iam_group-purge-1000': _case('iam_group', dict(name='group0000', purge=True, parallelism=8,
+                                                    users=['user%05d' % i for i in range(1000)]),
+                                  users=2000, groups=2),
+    'env_idbroker-1000': _case('env_idbroker', dict(
+        name='env0500', data_access='arn:aws:iam::123456789012:role/data-access',
+        ranger_audit='arn:aws:iam::123456789012:role/ranger-audit',
+        mappings=[dict(accessor='crn:altus:iam:us-west-1:altus:role:PowerUser',
+                       role='arn:aws:iam::123456789012:role/power-user')]), environments=1000),
+}
+
+# The relative increase of each measure over its baseline that is reported as a regression
+TOLERANCES = dict(wall_time=0.5, calls=0.0, peak_rss_mb=0.25)
+
+# Increases below these absolute amounts are never reported, as they are within the noise of a CI runner
+NOISE_FLOORS = dict(wall_time=0.05, calls=0, peak_rss_mb=4.0)
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def run_case(name):
+    """Executes the case in this process and returns its measures; called in the child process"""
+    case = CASES[name]
+    from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import module_args
+    from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_fake import CdpFakeBackend
+
+    backend = CdpFakeBackend.from_environment()
+    backend.initialize()
+    module = importlib.import_module('ansible_collections.cloudera.cloud.plugins.modules.%s' % case['module'])
+    calls, rss = backend.calls, _peak_rss_mb()
+
+    stdout = io.StringIO()
+    start = time.time()
+    with module_args(case['args']), contextlib.redirect_stdout(stdout):
+        try:
+            module.main()
+        except SystemExit:
+            pass
+    wall_time = time.time() - start
+
+    try:
+        output = json.loads(stdout.getvalue())
+    except ValueError:
+        output = dict(failed=True, msg=stdout.getvalue()[-1000:])
+
+    return dict(wall_time=wall_time, calls=backend.calls - calls, peak_rss_mb=_peak_rss_mb(),
+                rss_growth_mb=_peak_rss_mb() - rss, failed=bool(output.get('failed')), msg=output.get('msg'))
+
+
+def collections_path():
+    """Returns a directory in which the collection is importable as ansible_collections.cloudera.cloud"""
+    path = tempfile.mkdtemp(prefix='cdp-benchmarks-')
+    os.makedirs(os.path.join(path, 'ansible_collections', 'cloudera'))
+    os.symlink(COLLECTION_ROOT, os.path.join(path, 'ansible_collections', 'cloudera', 'cloud'))
+    return path
+
+
+def measure(name, repeat, path):
+    """Executes the case repeat times, each in a new process, and returns the best of its measures"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [path, os.environ.get('PYTHONPATH')])),
+               CDP_FAKE_BACKEND='memory', CDP_FAKE_SEED='0')
+    for key in [k for k in env if k.startswith('CDP_FAKE_') and k not in ('CDP_FAKE_BACKEND', 'CDP_FAKE_SEED')]:
+        del env[key]
+    for setting, value in CASES[name]['account'].items():
+        env['CDP_FAKE_%s' % setting.upper()] = str(value)
+
+    runs = []
+    for _ in range(repeat):
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name], env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        if child.returncode != 0:
+            return dict(failed=True, msg=child.stderr.strip().splitlines()[-1] if child.stderr.strip() else
+                        'exited with status %s' % child.returncode)
+        runs.append(json.loads(child.stdout))
+        if runs[-1]['failed']:
+            return runs[-1]
+
+    return dict(wall_time=min(r['wall_time'] for r in runs), calls=max(r['calls'] for r in runs),
+                peak_rss_mb=min(r['peak_rss_mb'] for r in runs), rss_growth_mb=min(r['rss_growth_mb'] for r in runs),
+                failed=False, msg=None)
+
+
+def regressions(result, baseline):
+    """Returns a description of each measure of result that exceeds its baseline beyond the tolerances"""
+    found = []
+    for measure_name, tolerance in TOLERANCES.items():
+        if measure_name not in baseline:
+            continue
+        limit = max(baseline[measure_name] * (1 + tolerance), baseline[measure_name] + NOISE_FLOORS[measure_name])
+        if result[measure_name] > limit:
+            found.append('%s %.3f > %.3f' % (measure_name, result[measure_name], limit))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the module execution paths of cloudera.cloud')
+    parser.add_argument('-k', '--keyword', action='append', default=[],
+                        help='run only the cases whose names contain the keyword; may be repeated')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='the number of runs of each case')
+    parser.add_argument('-b', '--baseline', default=BASELINE_PATH, help='the path of the baseline file')
+    parser.add_argument('-o', '--output', help='the path of a file to which the results are written')
+    parser.add_argument('--update-baseline', action='store_true', help='record the results as the baseline')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.child:
+        print(json.dumps(run_case(options.child)))
+        return 0
+
+    names = [n for n in CASES if not options.keyword or any(k in n for k in options.keyword)]
+    baseline = dict()
+    if os.path.exists(options.baseline):
+        with open(options.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    elif not options.update_baseline:
+        parser.error('baseline file not found: %s; record one with --update-baseline' % options.baseline)
+
+    path = collections_path()
+    results, failures = dict(), []
+    print('%-36s %10s %8s %10s %10s  %s' % ('Case', 'time (s)', 'calls', 'RSS (MiB)', 'growth', 'status'))
+    try:
+        for name in names:
+            result = measure(name, options.repeat, path)
+            if result['failed']:
+                status = 'FAILED: %s' % result['msg']
+                failures.append(name)
+            else:
+                results[name] = dict((k, result[k]) for k in ('wall_time', 'calls', 'peak_rss_mb', 'rss_growth_mb'))
+                found = [] if options.update_baseline else regressions(result, baseline.get(name, dict()))
+                status = 'REGRESSED: %s' % ', '.join(found) if found else \
+                    'ok' if name in baseline or options.update_baseline else 'ok (no baseline)'
+                if found:
+                    failures.append(name)
+            print('%-36s %10.3f %8d %10.1f %10.1f  %s' % (name, result.get('wall_time', 0), result.get('calls', 0),
+                                                          result.get('peak_rss_mb', 0), result.get('rss_growth_mb', 0),
+                                                          status))
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    if options.update_baseline:
+        baseline.update(results)
+        with open(options.baseline, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
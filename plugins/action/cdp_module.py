@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Executes the modules of the Cloudera CDP Collection in the controller process
+
+The modules of the collection are routed to this action plugin (see meta/runtime.yml). In-process execution is
+opt-in: when the CDP_IN_PROCESS environment variable or the cdp_in_process variable is true, and a task runs on the
+controller with the local connection, without become or async, and with the controller's Python interpreter, the
+module is imported and executed in the worker process rather than packaged, transferred and executed in a new
+interpreter. The task's environment is applied to the worker process for the duration of the module. Its CDPy clients
+are taken from the process's client pool (see cdp_common.CdpClientPool), so that the items of a loop, and the
+concurrent calls of a module, reuse warm clients. Every other task is executed as a standard module.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import contextlib
+import importlib
+import importlib.util
+import inspect
+import io
+import os
+import sys
+import traceback
+
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible.vars.clean import remove_internal_keys
+
+display = Display()
+
+COLLECTION = 'cloudera.cloud'
+MODULES_PACKAGE = 'ansible_collections.cloudera.cloud.plugins.modules'
+
+
+@contextlib.contextmanager
+def _environment(variables):
+    """Sets the environment variables of the task for the duration of the module"""
+    previous = dict(os.environ)
+    os.environ.update(variables)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(previous)
+
+
+class ActionModule(ActionBase):
+
+    _supports_check_mode = True
+    _supports_async = True
+
+    def run(self, tmp=None, task_vars=None):
+        task_vars = task_vars or dict()
+        module_name = self._task.action.split('.')[-1]
+
+        module = self._in_process_module(module_name, task_vars)
+        if module is None:
+            return self._run_standard(task_vars)
+
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp  # tmp no longer has any effect
+
+        module_args = self._task.args.copy()
+        self._update_module_args('%s.%s' % (COLLECTION, module_name), module_args, task_vars)
+
+        from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_common
+        if cdp_common.CLIENT_POOL is None:
+            cdp_common.CLIENT_POOL = cdp_common.CdpClientPool()
+
+        stdout = io.StringIO()
+        try:
+            with _environment(self._task_environment()), cdp_common.module_args(module_args), \
+                    contextlib.redirect_stdout(stdout):
+                try:
+                    module.main()
+                except SystemExit:
+                    pass
+        except Exception as e:
+            result.update(failed=True, msg='MODULE FAILURE: %s' % e, module_stdout=stdout.getvalue(),
+                          module_stderr=traceback.format_exc(), rc=1)
+            return result
+        finally:
+            cdp_common.CLIENT_POOL.reclaim()
+
+        result.update(self._parse_output(stdout.getvalue()))
+        remove_internal_keys(result)
+        return result
+
+    def _in_process_module(self, module_name, task_vars):
+        """Returns the imported module if the task can be executed in-process, otherwise None"""
+        opt_in = task_vars.get('cdp_in_process', os.environ.get('CDP_IN_PROCESS', False))
+        if not boolean(self._templar.template(opt_in), strict=False):
+            return None
+        if getattr(self._connection, 'transport', None) not in ('local', 'ansible.builtin.local'):
+            return None
+        if self._play_context.become or self._task.async_val:
+            return None
+
+        interpreter = task_vars.get('ansible_python_interpreter')
+        if interpreter is not None:
+            interpreter = self._templar.template(interpreter)
+            if os.path.realpath(interpreter) != os.path.realpath(sys.executable):
+                return None
+
+        try:
+            if importlib.util.find_spec('cdpy') is None:
+                return None
+            module = importlib.import_module('%s.%s' % (MODULES_PACKAGE, module_name))
+        except ImportError as e:
+            display.vvv('Executing %s as a standard module: %s' % (module_name, e))
+            return None
+        return module if hasattr(module, 'main') else None
+
+    def _run_standard(self, task_vars):
+        """Executes the task as a standard module, packaged and executed in a new interpreter"""
+        normal = self._shared_loader_obj.action_loader.get(
+            'ansible.legacy.normal', task=self._task, connection=self._connection, play_context=self._play_context,
+            loader=self._loader, templar=self._templar, shared_loader_obj=self._shared_loader_obj)
+        return normal.run(task_vars=task_vars)
+
+    def _task_environment(self):
+        """Returns the environment variables set by the task and its play, as strings"""
+        variables = dict()
+        for environment in self._task.environment or []:
+            environment = self._templar.template(environment)
+            if isinstance(environment, dict):
+                variables.update((str(k), str(v)) for k, v in environment.items())
+        return variables
+
+    def _parse_output(self, stdout):
+        """Parses the JSON output of the module as the standard module execution does"""
+        res = dict(stdout=stdout, stderr='', rc=0)
+        if 'profile' in inspect.signature(self._parse_returned_data).parameters:
+            return self._parse_returned_data(res, 'legacy')
+        return self._parse_returned_data(res)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import time
+
+from ansible.plugins.callback import CallbackBase
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_metrics import LATENCY_BUCKETS, METRICS_FIELD
+
+DOCUMENTATION = r'''
+name: cdp_metrics
+type: aggregate
+short_description: Summarize CDP SDK call counts and timings
+description:
+  - Aggregates the CDP SDK call counts, latencies, errors, retries and polling sleeps reported by the modules of the
+    collection, per task and per SDK function.
+  - At the end of the playbook, displays a summary table and, if I(output) is set, writes the metrics as JSON or as a
+    Prometheus textfile.
+  - Enabling the callback sets the C(CDP_METRICS) environment variable, which enables the collection of metrics by
+    modules executed on the controller. For modules executed elsewhere, set C(CDP_METRICS=1) in the task environment.
+author:
+  - "Webster Mudge (@wmudge)"
+  - "Dan Chaffelson (@chaffelson)"
+requirements:
+  - enable in configuration
+options:
+  output:
+    description:
+      - The path of the file to which the metrics are written.
+      - If not set, the metrics are only displayed.
+    type: path
+    env:
+      - name: CDP_METRICS_OUTPUT
+    ini:
+      - section: cdp_metrics
+        key: output
+  format:
+    description:
+      - The format of the metrics file.
+    type: str
+    default: json
+    choices:
+      - json
+      - prometheus
+    env:
+      - name: CDP_METRICS_FORMAT
+    ini:
+      - section: cdp_metrics
+        key: format
+  top:
+    description:
+      - The number of SDK functions and tasks, by total time, to display in the summary.
+    type: int
+    default: 10
+    env:
+      - name: CDP_METRICS_TOP
+    ini:
+      - section: cdp_metrics
+        key: top
+'''
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'cloudera.cloud.cdp_metrics'
+    CALLBACK_NEEDS_WHITELIST = True
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, display=None):
+        super(CallbackModule, self).__init__(display=display)
+        self.calls = dict()
+        self.tasks = dict()
+        self.retries = 0
+        self.sleeps = 0
+        self.sleep_time = 0.0
+        self._task_start = dict()
+        self._task_elapsed = dict()
+
+        # Modules executed on the controller inherit its environment
+        os.environ.setdefault('CDP_METRICS', '1')
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._task_start[task._uuid] = time.time()
+
+    def v2_runner_on_ok(self, result):
+        self._record(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result)
+
+    def _record(self, result):
+        # The metrics of a looped task are carried by the result of each item
+        runs = [result._result.pop(METRICS_FIELD, None)]
+        for item in result._result.get('results') or []:
+            if isinstance(item, dict):
+                runs.append(item.pop(METRICS_FIELD, None))
+        runs = [metrics for metrics in runs if metrics is not None]
+        if not runs:
+            return
+
+        task = self.tasks.setdefault(result._task.get_name(), dict(
+            action=result._task.action, runs=0, calls=0, errors=0, sdk_time=0.0, sleep_time=0.0, elapsed=0.0))
+        task['runs'] += len(runs)
+
+        # The elapsed time of a task, run by many hosts, is from its start to the last host result
+        uuid = result._task._uuid
+        elapsed = time.time() - self._task_start.get(uuid, time.time())
+        previous = self._task_elapsed.get(uuid, 0.0)
+        if elapsed > previous:
+            task['elapsed'] += elapsed - previous
+            self._task_elapsed[uuid] = elapsed
+        for metrics in runs:
+            self._record_run(task, metrics)
+
+    def _record_run(self, task, metrics):
+        task['sleep_time'] += metrics.get('sleep_time', 0.0)
+
+        for name, call in metrics.get('calls', {}).items():
+            task['calls'] += call['count']
+            task['errors'] += call['errors']
+            task['sdk_time'] += call['time']
+            entry = self.calls.setdefault(name, dict(
+                count=0, errors=0, time=0.0, buckets=[0] * (len(LATENCY_BUCKETS) + 1)))
+            entry['count'] += call['count']
+            entry['errors'] += call['errors']
+            entry['time'] += call['time']
+            entry['buckets'] = [a + b for a, b in zip(entry['buckets'], call['buckets'])]
+
+        self.retries += metrics.get('retries', 0)
+        self.sleeps += metrics.get('sleeps', 0)
+        self.sleep_time += metrics.get('sleep_time', 0.0)
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.tasks:
+            return
+
+        top = self.get_option('top')
+        self._display.banner('CDP METRICS')
+        self._display.display('%-48s %8s %8s %10s %10s' % ('SDK function', 'calls', 'errors', 'total (s)',
+                                                           'mean (s)'))
+        for name, call in sorted(self.calls.items(), key=lambda c: c[1]['time'], reverse=True)[:top]:
+            self._display.display('%-48s %8d %8d %10.2f %10.3f' % (
+                name, call['count'], call['errors'], call['time'], call['time'] / max(call['count'], 1)))
+        self._display.display('')
+        self._display.display('%-48s %8s %8s %10s %10s' % ('Task', 'calls', 'runs', 'sdk (s)', 'sleep (s)'))
+        for name, task in sorted(self.tasks.items(), key=lambda t: t[1]['elapsed'], reverse=True)[:top]:
+            self._display.display('%-48s %8d %8d %10.2f %10.2f' % (
+                name[:48], task['calls'], task['runs'], task['sdk_time'], task['sleep_time']))
+        self._display.display('')
+        self._display.display('Retries: %d, polling sleeps: %d (%.2f s)' % (self.retries, self.sleeps,
+                                                                            self.sleep_time))
+
+        output = self.get_option('output')
+        if output:
+            with open(output, 'w') as metrics_file:
+                if self.get_option('format') == 'prometheus':
+                    metrics_file.write(self._prometheus())
+                else:
+                    json.dump(dict(calls=self.calls, tasks=self.tasks, retries=self.retries, sleeps=self.sleeps,
+                                   sleep_time=self.sleep_time, buckets=LATENCY_BUCKETS), metrics_file, indent=2)
+
+    def _prometheus(self):
+        lines = [
+            '# HELP cdp_sdk_call_duration_seconds CDP SDK call latency.',
+            '# TYPE cdp_sdk_call_duration_seconds histogram',
+        ]
+        for name, call in sorted(self.calls.items()):
+            svc, func = name.split('.', 1)
+            labels = 'service="%s",function="%s"' % (svc, func)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ['+Inf'], call['buckets']):
+                cumulative += count
+                lines.append('cdp_sdk_call_duration_seconds_bucket{%s,le="%s"} %d' % (labels, bound, cumulative))
+            lines.append('cdp_sdk_call_duration_seconds_sum{%s} %f' % (labels, call['time']))
+            lines.append('cdp_sdk_call_duration_seconds_count{%s} %d' % (labels, call['count']))
+        lines.extend([
+            '# HELP cdp_sdk_call_errors_total CDP SDK calls that returned errors.',
+            '# TYPE cdp_sdk_call_errors_total counter',
+        ])
+        for name, call in sorted(self.calls.items()):
+            svc, func = name.split('.', 1)
+            lines.append('cdp_sdk_call_errors_total{service="%s",function="%s"} %d' % (svc, func, call['errors']))
+        lines.extend([
+            '# HELP cdp_sdk_retries_total CDP SDK calls retried.',
+            '# TYPE cdp_sdk_retries_total counter',
+            'cdp_sdk_retries_total %d' % self.retries,
+            '# HELP cdp_polling_sleep_seconds_total Time spent sleeping while waiting for CDP resources.',
+            '# TYPE cdp_polling_sleep_seconds_total counter',
+            'cdp_polling_sleep_seconds_total %f' % self.sleep_time,
+        ])
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+    options:
+        cache:
+            description:
+                - Serve the CDP SDK responses of the module from a local, on-disk cache.
+                - C(enabled) returns unexpired responses from the cache and caches new responses.
+                - C(refresh) ignores any cached responses and caches new responses.
+                - C(disabled) neither reads nor writes the cache.
+                - Responses are cached per CDP profile and endpoint in C(~/.cache/cloudera.cloud/cdp_cache.sqlite),
+                  or in the file set by the C(CDP_CACHE_PATH) environment variable. The least recently used responses
+                  are evicted once the cache exceeds 64 MiB, or the size in bytes set by the C(CDP_CACHE_MAX_BYTES)
+                  environment variable.
+                - If not set, the value of the C(CDP_CACHE) environment variable is used, otherwise the cache is
+                  disabled.
+            type: str
+            required: False
+            choices:
+                - disabled
+                - enabled
+                - refresh
+        cache_ttl:
+            description:
+                - The time-to-live (in seconds) of cached responses.
+                - If not set, the default time-to-live of the module is used.
+            type: int
+            required: False
+    '''
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+    options:
+        fingerprint:
+            description:
+                - Detect converged runs with fingerprints recorded in a local store, rather than by describing the
+                  resource.
+                - After a run that leaves the resource in its target state, the module records a fingerprint of the
+                  resource's listing entry (its CRN, status and last-updated fields), a fingerprint of the module's
+                  parameters, and the resource's description. When the parameters are unchanged, the next run lists
+                  the resource and, if its fingerprint is unchanged, returns the recorded description without
+                  describing or reconciling the resource.
+                - Changes that do not alter the listing entry of the resource, e.g. changes made outside of the
+                  module, are not detected while the fingerprints match. The listings of most resources carry no
+                  last-updated field, so that only a change of the CRN or status alters the entry; for example, a
+                  change of the credential or security groups of an Environment is not detected.
+                - Recorded fingerprints therefore expire after I(fingerprint_ttl) seconds, after which the next run
+                  describes and reconciles the resource.
+                - Fingerprints are stored per CDP profile and endpoint in C(~/.cache/cloudera.cloud/cdp_state.sqlite),
+                  or in the file set by the C(CDP_STATE_PATH) environment variable.
+                - If not set, the value of the C(CDP_FINGERPRINT) environment variable is used, otherwise fingerprints
+                  are not used.
+            type: bool
+            required: False
+        fingerprint_ttl:
+            description:
+                - The time-to-live (in seconds) of recorded fingerprints.
+                - Set to C(0) for fingerprints that do not expire.
+                - If not set, the value of the C(CDP_FINGERPRINT_TTL) environment variable is used, otherwise
+                  fingerprints expire after 3600 seconds.
+            type: int
+            required: False
+    '''
@@ -34,4 +34,41 @@ class ModuleDocFragment(object):
             default: False
             aliases:
                 - debug_endpoints
+        debug_level:
+            description:
+                - The minimum level of the CDP SDK log records captured when I(debug=True).
+            type: str
+            required: False
+            default: DEBUG
+            choices:
+                - DEBUG
+                - INFO
+                - WARNING
+                - ERROR
+        debug_max_lines:
+            description:
+                - The maximum number of the most recent CDP SDK log records returned when I(debug=True).
+                - Earlier records are dropped; the returned log is also limited to 1 MiB of messages.
+            type: int
+            required: False
+            default: 1000
+        debug_file:
+            description:
+                - A file to which every captured CDP SDK log record is appended, as a line of JSON, when
+                  I(debug=True).
+                - The returned log is still limited by I(debug_max_lines).
+            type: path
+            required: False
+        broker:
+            description:
+                - Route CDP SDK calls through a persistent, local client broker.
+                - The broker is a daemon, started on demand, that keeps authenticated CDP clients and their
+                  connections open across tasks. It listens on a Unix socket under C(~/.cdp/broker), or under
+                  the directory set by the C(CDP_BROKER_DIR) environment variable, and exits after an idle period.
+                - If the broker is unavailable, SDK calls are made within the module.
+                - The broker is not used when I(debug=True).
+                - If not set, the value of the C(CDP_BROKER) environment variable is used, otherwise the broker
+                  is not used.
+            type: bool
+            required: False
     '''
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible.errors import AnsibleError
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+from ansible.utils.display import Display
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpyClient, fake_backend
+
+DOCUMENTATION = r'''
+name: cdp
+short_description: Build an inventory of the hosts of CDP Environments
+description:
+  - Builds groups and hosts from the CDP Environments of an account, their Datalakes, the instance groups of their
+    Datahubs, and their FreeIPA nodes.
+  - The Environments are described, and the Datalakes and Datahubs of each are listed and described, concurrently.
+  - The configuration file name must end with C(cdp.yml) or C(cdp.yaml).
+  - Hosts are added to the groups C(environment_<environment>), C(freeipa), C(datalake), C(datalake_<instance group>),
+    C(datahub), C(datahub_<cluster>) and C(datahub_<cluster>_<instance group>), and carry the variables
+    C(cdp_environment), C(cdp_service), C(cdp_crn), C(cdp_cluster), C(cdp_instance_group) and C(cdp_instance).
+author:
+  - "Webster Mudge (@wmudge)"
+  - "Dan Chaffelson (@chaffelson)"
+requirements:
+  - cdpy
+options:
+  plugin:
+    description:
+      - The name of the plugin.
+    type: str
+    required: True
+    choices:
+      - cloudera.cloud.cdp
+  environments:
+    description:
+      - The names of the Environments to include.
+      - If not set, all Environments of the account are included.
+    type: list
+    elements: str
+  services:
+    description:
+      - The services whose hosts are included.
+    type: list
+    elements: str
+    choices:
+      - freeipa
+      - datalake
+      - datahub
+    default:
+      - freeipa
+      - datalake
+      - datahub
+  parallelism:
+    description:
+      - The maximum number of concurrent CDP API requests.
+    type: int
+    default: 8
+  use_public_ip:
+    description:
+      - Set C(ansible_host) to the public IP address of each host, when it has one, rather than its private IP address.
+    type: bool
+    default: False
+  verify_tls:
+    description:
+      - Verify the TLS certificates of the CDP API endpoint.
+    type: bool
+    default: True
+extends_documentation_fragment:
+  - constructed
+  - inventory_cache
+notes:
+  - CDP authentication is configured as for the modules, e.g. with C(CDP_PROFILE).
+  - When the inventory cache is enabled, the CDP API is called only when the cache is empty or has expired, per
+    C(cache_timeout).
+'''
+
+EXAMPLES = r'''
+# cdp.yml: all hosts of all Environments, cached for 10 minutes
+plugin: cloudera.cloud.cdp
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.cache/ansible/cdp_inventory
+cache_timeout: 600
+
+# cdp.yml: the Datahub hosts of two Environments, reached by public IP and grouped by instance type
+plugin: cloudera.cloud.cdp
+environments:
+  - example-env
+  - example-env-2
+services:
+  - datahub
+use_public_ip: true
+keyed_groups:
+  - key: cdp_instance.instanceType
+    prefix: type
+'''
+
+display = Display()
+
+
+def _first(record, *fields):
+    """Returns the first of fields that is set in record"""
+    for field in fields:
+        if record.get(field):
+            return record[field]
+    return None
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+
+    NAME = 'cloudera.cloud.cdp'
+
+    def __init__(self):
+        super(InventoryModule, self).__init__()
+        self._local = threading.local()
+        self._call_wrappers = []
+
+    def verify_file(self, path):
+        return super(InventoryModule, self).verify_file(path) and path.endswith(('cdp.yml', 'cdp.yaml'))
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        use_cache = self.get_option('cache') and cache
+        update_cache = self.get_option('cache') and not cache
+
+        resources = None
+        if use_cache:
+            try:
+                resources = self._cache[cache_key]
+            except KeyError:
+                update_cache = True
+
+        if resources is None:
+            resources = self._gather()
+
+        if update_cache:
+            self._cache[cache_key] = resources
+
+        self._populate(resources)
+
+    # CDP API
+
+    @staticmethod
+    def _raise_error(error):
+        raise AnsibleError('CDP API error: %s' % getattr(error, 'message', error))
+
+    @staticmethod
+    def _warn(warning):
+        display.warning(str(getattr(warning, 'message', warning)))
+
+    def _client(self):
+        """Returns the CDPy client of the current thread, creating it if necessary"""
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = CdpyClient(self._call_wrappers, debug=False, tls_verify=self.get_option('verify_tls'),
+                                strict_errors=False, error_handler=self._raise_error, warning_handler=self._warn)
+            self._local.client = client
+        return client
+
+    def _map(self, func, items):
+        """Calls func(item) for each item concurrently; failures are reported as warnings and return None"""
+        def _invoke(item):
+            try:
+                return func(item)
+            except AnsibleError as e:
+                display.warning('Unable to gather %s: %s' % (item, e))
+                return None
+
+        items = list(items)
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.get_option('parallelism'), len(items)))) as executor:
+            return list(executor.map(_invoke, items))
+
+    def _gather(self):
+        """Returns the descriptors of the Environments, Datalakes and Datahubs of the inventory"""
+        fake = fake_backend()
+        self._call_wrappers = [fake.wrap] if fake is not None else []
+        self._local = threading.local()
+
+        services = self.get_option('services')
+        names = [e['environmentName'] for e in self._client().environments.list_environments() or []]
+        if self.get_option('environments'):
+            names = [n for n in names if n in self.get_option('environments')]
+
+        # Describe the Environments and list their services, each request concurrently
+        listings = [('environment', n) for n in names]
+        listings.extend(('datalakes', n) for n in names if 'datalake' in services)
+        listings.extend(('datahubs', n) for n in names if 'datahub' in services)
+        results = dict(zip(listings, self._map(self._list, listings)))
+
+        environments = [results[('environment', n)] for n in names if results[('environment', n)]]
+        clusters = []
+        for kind, name in listings:
+            if kind != 'environment':
+                clusters.extend((kind, c) for c in results[(kind, name)] or [])
+
+        # Describe the Datalakes and Datahubs, for their instance groups
+        described = self._map(self._describe, clusters)
+        return dict(
+            environments=environments,
+            datalakes=[d for (kind, _), d in zip(clusters, described) if d and kind == 'datalakes'],
+            datahubs=[d for (kind, _), d in zip(clusters, described) if d and kind == 'datahubs'],
+        )
+
+    def _list(self, request):
+        kind, name = request
+        client = self._client()
+        if kind == 'environment':
+            return client.environments.describe_environment(name)
+        if kind == 'datalakes':
+            return [d['datalakeName'] for d in client.datalake.list_datalakes(name) or []]
+        return [c['clusterName'] for c in client.datahub.list_clusters(name) or []]
+
+    def _describe(self, request):
+        kind, name = request
+        client = self._client()
+        if kind == 'datalakes':
+            return client.datalake.describe_datalake(name)
+        return client.datahub.describe_cluster(name)
+
+    # Inventory
+
+    def _populate(self, resources):
+        services = self.get_option('services')
+        environments = dict((e['crn'], e['environmentName']) for e in resources['environments'])
+
+        for env in resources['environments']:
+            freeipa = env.get('freeipa') or dict()
+            if 'freeipa' not in services or not freeipa:
+                continue
+            instances = freeipa.get('instances') or [
+                dict(discoveryFQDN='%s%s.%s' % (freeipa.get('hostname', 'ipaserver'), i, freeipa.get('domain')),
+                     privateIp=ip) for i, ip in enumerate(freeipa.get('serverIP') or [])]
+            for instance in instances:
+                self._add_host(instance, ['freeipa'], dict(
+                    cdp_environment=env['environmentName'], cdp_service='freeipa', cdp_crn=freeipa.get('crn'),
+                    cdp_cluster=None, cdp_instance_group='freeipa'))
+
+        for datalake in resources['datalakes']:
+            env = environments.get(datalake.get('environmentCrn'), datalake.get('environmentName'))
+            for group in datalake.get('instanceGroups') or []:
+                for instance in group.get('instances') or []:
+                    self._add_host(instance, ['datalake', 'datalake_%s' % group['name']], dict(
+                        cdp_environment=env, cdp_service='datalake', cdp_crn=datalake.get('crn'),
+                        cdp_cluster=datalake.get('datalakeName'), cdp_instance_group=group['name']))
+
+        for datahub in resources['datahubs']:
+            env = environments.get(datahub.get('environmentCrn'), datahub.get('environmentName'))
+            name = datahub.get('clusterName')
+            for group in datahub.get('instanceGroups') or []:
+                for instance in group.get('instances') or []:
+                    self._add_host(instance, ['datahub', 'datahub_%s' % name, 'datahub_%s_%s' % (name, group['name'])],
+                                   dict(cdp_environment=env, cdp_service='datahub', cdp_crn=datahub.get('crn'),
+                                        cdp_cluster=name, cdp_instance_group=group['name']))
+
+    def _add_host(self, instance, groups, hostvars):
+        name = _first(instance, 'discoveryFQDN', 'fqdn', 'privateIp', 'privateIP', 'id', 'instanceId')
+        if name is None:
+            return
+
+        hostvars['cdp_instance'] = instance
+        address = _first(instance, 'privateIp', 'privateIP')
+        if self.get_option('use_public_ip'):
+            address = _first(instance, 'publicIp', 'publicIP') or address
+        if address:
+            hostvars['ansible_host'] = address
+
+        for group in ['environment_%s' % hostvars['cdp_environment']] + groups:
+            group = self.inventory.add_group(self._sanitize_group_name(group))
+            self.inventory.add_host(name, group=group)
+        for var, value in hostvars.items():
+            self.inventory.set_variable(name, var, value)
+
+        strict = self.get_option('strict')
+        self._set_composite_vars(self.get_option('compose'), hostvars, name, strict=strict)
+        self._add_host_to_composed_groups(self.get_option('groups'), hostvars, name, strict=strict)
+        self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, name, strict=strict)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.lookup import LookupBase
+from ansible.utils.display import Display
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpyClient, fake_backend
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import field_value
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_resolver import CdpResolver, KINDS
+
+DOCUMENTATION = r'''
+name: cdp_lookup
+short_description: Resolve CDP resource names to CRNs and descriptors
+description:
+  - Returns the CRN, a field of the descriptor, or the descriptor of each named CDP Environment, Datalake or Datahub.
+  - CRNs are written to the on-disk response cache for I(ttl) seconds, so that a name is resolved to its CRN once
+    rather than by the lookups of each task. CRNs are also memoized within the lookups of a task for a host.
+  - A resource that is deleted and recreated with the same name within I(ttl) resolves to its previous CRN. Set
+    I(ttl=0) to resolve the name on each task.
+  - Other fields, and entire descriptors, are described on each lookup, so that changing fields such as the status
+    are current.
+author:
+  - "Webster Mudge (@wmudge)"
+  - "Dan Chaffelson (@chaffelson)"
+requirements:
+  - cdpy
+options:
+  _terms:
+    description:
+      - The names of the resources. For C(datalake), the names of the Environments of the Datalakes.
+    type: list
+    elements: str
+    required: True
+  resource:
+    description:
+      - The kind of the resources.
+    type: str
+    default: environment
+    choices:
+      - environment
+      - datalake
+      - datahub
+  field:
+    description:
+      - The field of the descriptor to return, as a key or as dot-separated nested keys, e.g. C(freeipa.domain).
+      - Set to an empty string to return the entire descriptor.
+    type: str
+    default: crn
+  ttl:
+    description:
+      - The time, in seconds, for which CRNs are cached on disk.
+      - Set to C(0) to disable the on-disk cache.
+    type: int
+    default: 3600
+    env:
+      - name: CDP_RESOLVER_TTL
+  verify_tls:
+    description:
+      - Verify the TLS certificates of the CDP API endpoint.
+    type: bool
+    default: True
+  errors:
+    description:
+      - How to handle names that do not resolve.
+    type: str
+    default: strict
+    choices:
+      - strict
+      - warn
+      - ignore
+notes:
+  - CDP authentication is configured as for the modules, e.g. with C(CDP_PROFILE).
+  - The on-disk cache is the response cache of the collection, at C(CDP_CACHE_PATH).
+'''
+
+EXAMPLES = r'''
+- name: Resolve the CRN of an Environment
+  ansible.builtin.debug:
+    msg: "{{ lookup('cloudera.cloud.cdp_lookup', 'example-env') }}"
+
+- name: Look up the cloud platform of an Environment
+  ansible.builtin.set_fact:
+    platform: "{{ lookup('cloudera.cloud.cdp_lookup', 'example-env', field='cloudPlatform') }}"
+
+- name: Run a task only if the Datalake of the Environment is running
+  ansible.builtin.debug:
+    msg: The Datalake is running
+  when: lookup('cloudera.cloud.cdp_lookup', 'example-env', resource='datalake', field='status') == 'RUNNING'
+
+- name: Return the descriptors of two Datahubs
+  ansible.builtin.debug:
+    msg: "{{ query('cloudera.cloud.cdp_lookup', 'example-dh', 'example-dh-2', resource='datahub', field='') }}"
+'''
+
+RETURN = r'''
+_raw:
+  description:
+    - The CRN, the requested field, or the descriptor of each resource.
+    - C(None) for names that do not resolve when I(errors=ignore) or I(errors=warn).
+  type: list
+  elements: raw
+'''
+
+display = Display()
+
+# Resolvers, by settings, reused by the lookups of this process
+_resolvers = dict()
+
+
+def _raise_error(error):
+    raise AnsibleLookupError('CDP API error: %s' % getattr(error, 'message', error))
+
+
+def _warn(warning):
+    display.warning(str(getattr(warning, 'message', warning)))
+
+
+class LookupModule(LookupBase):
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        kind = self.get_option('resource')
+        if kind not in KINDS:
+            raise AnsibleLookupError("Unknown resource '%s'; expected one of %s" % (kind, ', '.join(KINDS)))
+        field = self.get_option('field')
+
+        resolver = self._resolver()
+        results = []
+        for term in terms:
+            if field == 'crn':
+                crn = resolver.crn(kind, term)
+                descriptor = dict(crn=crn) if crn is not None else None
+            else:
+                descriptor = resolver.describe(kind, term, refresh=True)
+            if descriptor is None:
+                message = "Unable to resolve %s '%s'" % (kind, term)
+                if self.get_option('errors') == 'strict':
+                    raise AnsibleLookupError(message)
+                if self.get_option('errors') == 'warn':
+                    display.warning(message)
+                results.append(None)
+            elif field:
+                results.append(field_value(descriptor, field.split('.')))
+            else:
+                results.append(descriptor)
+        return results
+
+    def _resolver(self):
+        key = (self.get_option('verify_tls'), self.get_option('ttl'))
+        if key not in _resolvers:
+            fake = fake_backend()
+            client = CdpyClient([fake.wrap] if fake is not None else [], debug=False,
+                                tls_verify=self.get_option('verify_tls'), strict_errors=False,
+                                error_handler=_raise_error, warning_handler=_warn)
+            _resolvers[key] = CdpResolver(client, ttl=self.get_option('ttl'))
+        return _resolvers[key]
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A persistent CDP client broker for the Cloudera CDP Collection
+
+The broker is a local daemon, listening on a Unix socket, that keeps warm, authenticated CDPy clients (and their
+HTTP connection pools) across module executions. Modules submit SDK calls to the broker as newline-delimited JSON
+and fall back to in-process calls if the broker is unavailable.
+"""
+
+import datetime
+import fcntl
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from functools import wraps
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# Environment variables that select the CDP identity and endpoint; each distinct set is served by its own broker
+IDENTITY_VARIABLES = ['CDP_PROFILE', 'CDP_ACCESS_KEY_ID', 'CDP_PRIVATE_KEY', 'CDP_CREDENTIALS_FILE',
+                      'CDP_CONFIG_FILE', 'CDP_ENDPOINT_URL', 'CDP_REGION']
+
+BROKER_DIR = os.environ.get('CDP_BROKER_DIR', os.path.join(os.path.expanduser('~'), '.cdp', 'broker'))
+BROKER_IDLE_TIMEOUT = int(os.environ.get('CDP_BROKER_IDLE_TIMEOUT', 900))
+BROKER_START_TIMEOUT = 5
+
+
+class CdpBrokerUnavailable(Exception):
+    """Raised when the broker cannot be reached"""
+    pass
+
+
+def identity_digest(variables=None):
+    """
+    Returns a digest of the CDP identity and endpoint of the current process environment, the values of
+    IDENTITY_VARIABLES, and of the values of the further variables
+    """
+    identity = hashlib.sha256()
+    for var in IDENTITY_VARIABLES + list(variables or []):
+        identity.update(("%s=%s\n" % (var, os.environ.get(var, ''))).encode('utf-8'))
+    return identity.hexdigest()
+
+
+def broker_socket_path():
+    """Returns the broker socket path for the CDP identity of the current process environment"""
+    return os.path.join(BROKER_DIR, 'broker-%s.sock' % identity_digest()[:16])
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode(message):
+    return (json.dumps(message, default=_json_default) + '\n').encode('utf-8')
+
+
+def _squelch_fields(squelch):
+    return dict(squelch) if isinstance(squelch, dict) else dict(vars(squelch))
+
+
+class CdpBrokerClient(object):
+    """Submits CDPy SDK calls to a running broker, one connection per calling thread."""
+
+    def __init__(self, path, tls_verify=False, strict_errors=False):
+        self.path = path
+        self.options = dict(tls_verify=tls_verify, strict_errors=strict_errors)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.path)
+            except (OSError, socket.error) as e:
+                raise CdpBrokerUnavailable(str(e))
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+        return conn
+
+    def _close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+            self._local.conn = None
+
+    def ping(self):
+        return self.request(dict(op='ping')).get('pong', False)
+
+    def request(self, message):
+        sock, reader = self._connection()
+        try:
+            sock.sendall(_encode(message))
+            line = reader.readline()
+        except (OSError, socket.error) as e:
+            self._close()
+            raise CdpBrokerUnavailable(str(e))
+        if not line:
+            self._close()
+            raise CdpBrokerUnavailable('Broker closed the connection')
+        return json.loads(line.decode('utf-8'))
+
+    def wrap(self, sdk):
+        """Returns a replacement for the SDK call function of the CdpcliWrapper, sdk, that routes through the broker"""
+        from cdpy.common import CdpError, CdpWarning
+
+        call = sdk.call
+
+        @wraps(call)
+        def _call(svc, func, ret_field=None, squelch=None, ret_error=False, **kwargs):
+            message = dict(op='call', options=self.options, svc=svc, func=func, ret_field=ret_field,
+                           squelch=[_squelch_fields(s) for s in squelch] if squelch else None,
+                           ret_error=ret_error, kwargs=kwargs)
+            try:
+                response = self.request(message)
+            except CdpBrokerUnavailable:
+                return call(svc, func, ret_field=ret_field, squelch=squelch, ret_error=ret_error, **kwargs)
+
+            for warning in response.get('warnings', []):
+                sdk.throw_warning(CdpWarning(warning))
+            if 'error' in response:
+                error = CdpError(response['error'].get('message'))
+                error.__dict__.update(response['error'])
+                if ret_error:
+                    return error
+                return sdk.throw_error(error)
+            return response.get('result')
+
+        return _call
+
+
+def connect(path=None, tls_verify=False, strict_errors=False, start=True):
+    """
+    Returns a CdpBrokerClient for the current CDP identity, starting the broker daemon if requested and necessary.
+    Returns None if the broker is unavailable.
+    """
+    path = path or broker_socket_path()
+    client = CdpBrokerClient(path, tls_verify=tls_verify, strict_errors=strict_errors)
+    try:
+        return client if client.ping() else None
+    except CdpBrokerUnavailable:
+        if not start or not _spawn(path):
+            return None
+
+    deadline = time.time() + BROKER_START_TIMEOUT
+    while time.time() < deadline:
+        try:
+            if client.ping():
+                return client
+        except CdpBrokerUnavailable:
+            time.sleep(0.1)
+    return None
+
+
+def _private_directory(path):
+    """Creates the directory of path, if needed, accessible only to the current user"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.chmod(directory, 0o700)
+
+
+def _spawn(path):
+    """Forks a detached broker daemon listening on path; returns False if the daemon could not be forked"""
+    try:
+        _private_directory(path)
+        pid = os.fork()
+    except OSError:
+        return False
+
+    if pid > 0:
+        os.waitpid(pid, 0)
+        return True
+
+    # First child; detach from the module process and its output streams
+    try:
+        os.setsid()
+        if os.fork() > 0:
+            os._exit(0)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.closerange(3, 1024)
+        serve(path)
+    finally:
+        os._exit(0)
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            self.server.touch()
+            try:
+                response = self.server.dispatch(json.loads(line.decode('utf-8')))
+            except Exception as e:
+                response = dict(error=dict(message='Broker failure: %s' % e))
+            self.wfile.write(_encode(response))
+            self.wfile.flush()
+            self.server.touch()
+
+
+class CdpBrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves SDK calls from warm CDPy clients, keyed by the client options of each call."""
+
+    daemon_threads = True
+
+    def __init__(self, path, idle_timeout=BROKER_IDLE_TIMEOUT):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.last_activity = time.time()
+        self._clients = dict()
+        self._clients_lock = threading.Lock()
+        self._local = threading.local()
+        if os.path.exists(path):
+            os.unlink(path)
+        # The socket is created without group or other access, within the private broker directory
+        previous = os.umask(0o077)
+        try:
+            socketserver.UnixStreamServer.__init__(self, path, _BrokerHandler)
+        finally:
+            os.umask(previous)
+
+    def touch(self):
+        self.last_activity = time.time()
+
+    def _raise_error(self, error):
+        raise error
+
+    def _collect_warning(self, warning):
+        self._local.warnings.append(warning.message)
+
+    def _client(self, options):
+        key = (bool(options.get('tls_verify')), bool(options.get('strict_errors')))
+        with self._clients_lock:
+            if key not in self._clients:
+                from cdpy.cdpy import Cdpy
+                self._clients[key] = Cdpy(tls_verify=key[0], strict_errors=key[1],
+                                          error_handler=self._raise_error, warning_handler=self._collect_warning)
+            return self._clients[key]
+
+    def dispatch(self, request):
+        if request.get('op') == 'ping':
+            return dict(pong=True)
+
+        from cdpy.common import CdpError, Squelch
+
+        self._local.warnings = []
+        client = self._client(request.get('options', {}))
+        squelch = [Squelch(**s) for s in request['squelch']] if request.get('squelch') else None
+        try:
+            result = client.sdk.call(request['svc'], request['func'], ret_field=request.get('ret_field'),
+                                     squelch=squelch, ret_error=request.get('ret_error', False),
+                                     **request.get('kwargs', {}))
+        except CdpError as e:
+            return dict(error=dict((k, v) for k, v in vars(e).items() if k != 'base_error'),
+                        warnings=self._local.warnings)
+        if isinstance(result, CdpError):
+            return dict(error=dict((k, v) for k, v in vars(result).items() if k != 'base_error'),
+                        warnings=self._local.warnings)
+        return dict(result=result, warnings=self._local.warnings)
+
+    def run(self):
+        self.timeout = 1
+        try:
+            while time.time() - self.last_activity < self.idle_timeout:
+                self.handle_request()
+        finally:
+            self.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+def serve(path=None, idle_timeout=BROKER_IDLE_TIMEOUT):
+    """
+    Runs the broker in the foreground until it has been idle for idle_timeout seconds.
+    Returns immediately if another broker already holds the socket path.
+    """
+    path = path or broker_socket_path()
+    _private_directory(path)
+    with open(path + '.lock', 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (OSError, IOError):
+            return
+        CdpBrokerServer(path, idle_timeout=idle_timeout).run()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A persistent, on-disk cache of CDP SDK responses for the read-only modules of the Cloudera CDP Collection
+
+Entries are keyed by the CDP identity and endpoint, e.g. the profile and credentials file, and the service, function
+and parameters of the call. Entries expire after a caller-supplied TTL and the least recently used entries are evicted
+once the cache exceeds its maximum size.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from functools import wraps
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_broker import identity_digest
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+CACHE_PATH = os.environ.get('CDP_CACHE_PATH',
+                            os.path.join(os.path.expanduser('~'), '.cache', 'cloudera.cloud', 'cdp_cache.sqlite'))
+CACHE_MAX_BYTES = int(os.environ.get('CDP_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Cache modes
+DISABLED = 'disabled'
+ENABLED = 'enabled'
+REFRESH = 'refresh'
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+
+def cache_identity():
+    """
+    Returns a digest of the CDP identity and endpoint, as for the broker (see cdp_broker.IDENTITY_VARIABLES), and the
+    fake backend of the current process environment
+    """
+    return identity_digest(['CDP_FAKE_BACKEND'])
+
+
+class CdpResponseCache(object):
+    """A size-bounded, least-recently-used cache of SDK responses, stored in a local SQLite database."""
+
+    def __init__(self, path=CACHE_PATH, ttl=3600, max_bytes=CACHE_MAX_BYTES, refresh=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._identity = cache_identity()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        os.chmod(path, 0o600)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                             'size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+
+    def key(self, svc, func, ret_field, params):
+        return hashlib.sha256(json.dumps(dict(identity=self._identity, svc=svc, func=func, ret_field=ret_field,
+                                              params=params), sort_keys=True, default=_json_default)
+                              .encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Returns a tuple of (found, value) for the key; expired entries are not found"""
+        if self.refresh:
+            return False, None
+        now = time.time()
+        try:
+            with self._lock, self._db:
+                row = self._db.execute('SELECT value, created FROM entries WHERE key = ?', (key,)).fetchone()
+                if row is None or row[1] + self.ttl < now:
+                    return False, None
+                self._db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+        except sqlite3.Error:
+            return False, None
+        return True, json.loads(row[0])
+
+    def put(self, key, value):
+        """Stores the value for the key; a cache that cannot be written is ignored"""
+        encoded = json.dumps(value, default=_json_default)
+        now = time.time()
+        try:
+            with self._lock, self._db:
+                self._db.execute('INSERT OR REPLACE INTO entries (key, value, size, created, accessed) '
+                                 'VALUES (?, ?, ?, ?, ?)', (key, encoded, len(encoded), now, now))
+                self._evict()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self._db.execute('SELECT key, size FROM entries ORDER BY accessed ASC'):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._db.executemany('DELETE FROM entries WHERE key = ?', stale)
+
+    def wrap(self, sdk):
+        """Returns a replacement for the SDK call function of the CdpcliWrapper, sdk, that consults the cache"""
+        from cdpy.common import CdpError
+
+        call = sdk.call
+
+        @wraps(call)
+        def _call(svc, func, ret_field=None, squelch=None, ret_error=False, **kwargs):
+            key = self.key(svc, func, ret_field, kwargs)
+            found, value = self.get(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = call(svc, func, ret_field=ret_field, squelch=squelch, ret_error=ret_error, **kwargs)
+            if not isinstance(value, CdpError):
+                self.put(key, value)
+            return value
+
+        return _call
@@ -17,12 +17,35 @@
 
 """
 A common Ansible Module for shared functions in the Cloudera CDP Collection
+
+CDPy, and the CDP CLI beneath it, are imported only when a module makes its first SDK call, so that modules that
+fail argument validation or exit early do not pay for them. Likewise, the client broker, response cache, fingerprint
+store and resource waiter are imported only by the modules that use them.
+
+When modules are executed in the controller process by the cloudera.cloud.cdp_module action plugin, the action plugin
+sets CLIENT_POOL so that the SDK and service clients are built once and reused by each module the process executes.
 """
 
+import contextlib
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+
 from functools import wraps
+from typing import TYPE_CHECKING
+
+from ansible.module_utils.basic import env_fallback
+
+from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_metrics
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_logging import CdpLogBuffer
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import DEFAULT_DELAY, PollingStrategy, \
+    field_value, wait_for_state
 
-from cdpy.cdpy import Cdpy
-from cdpy.common import CdpError, CdpWarning
+if TYPE_CHECKING:
+    from cdpy.common import CdpError, CdpWarning
 
 
 __credits__ = ["cleroy@cloudera.com"]
@@ -31,18 +54,163 @@ __maintainer__ = [
     "wmudge@cloudera.com"
 ]
 
+# The CDPy service clients, by attribute of the CDPy client, as (module, class)
+CDPY_SERVICES = dict(
+    datahub=('cdpy.datahub', 'CdpyDatahub'),
+    datalake=('cdpy.datalake', 'CdpyDatalake'),
+    df=('cdpy.df', 'CdpyDf'),
+    dw=('cdpy.dw', 'CdpyDw'),
+    environments=('cdpy.environments', 'CdpyEnvironments'),
+    iam=('cdpy.iam', 'CdpyIam'),
+    ml=('cdpy.ml', 'CdpyMl'),
+    opdb=('cdpy.opdb', 'CdpyOpdb'),
+)
+
+
+# The pool of warm clients of a process that executes modules in-process; see cdp_module.py in plugins/action
+CLIENT_POOL = None
+
+
+def fake_backend():
+    """Returns the fake CDP control plane selected by CDP_FAKE_BACKEND, or None; see cdp_fake.CdpFakeBackend"""
+    if not os.environ.get('CDP_FAKE_BACKEND'):
+        return None
+    from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_fake import CdpFakeBackend
+    return CdpFakeBackend.from_environment()
+
+
+@contextlib.contextmanager
+def module_args(args):
+    """Exposes args to the AnsibleModule of a module executed in the current process"""
+    try:
+        from ansible.module_utils.testing import patch_module_args
+    except ImportError:
+        from ansible.module_utils import basic
+        previous = basic._ANSIBLE_ARGS
+        basic._ANSIBLE_ARGS = json.dumps(dict(ANSIBLE_MODULE_ARGS=args)).encode('utf-8')
+        try:
+            yield
+        finally:
+            basic._ANSIBLE_ARGS = previous
+    else:
+        with patch_module_args(args):
+            yield
+
+
+class CdpClientPool(object):
+    """
+    Idle CDPy SDK and service clients, by settings, for reuse by the modules executed in one process.
+    Each client is leased exclusively by the module that acquires it until the pool reclaims it.
+    """
+
+    def __init__(self):
+        self._idle = dict()
+        self._leased = []
+        self._cleanups = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name, settings):
+        """Returns the pool key of the client name built with settings and the current CDP environment variables"""
+        return (name, settings.get('tls_verify'), settings.get('strict_errors'),
+                tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith('CDP_'))))
+
+    def acquire(self, key):
+        """Returns an idle (client, sdk, call) for key, leased to the caller, or None if there is none"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if not idle:
+                return None
+            entry = idle.pop()
+            self._leased.append((key, entry))
+            return entry
+
+    def lease(self, key, entry):
+        """Records a new (client, sdk, call) for key as leased, to be pooled when reclaimed"""
+        with self._lock:
+            self._leased.append((key, entry))
+
+    def defer(self, func):
+        """Registers func to be called when the pool next reclaims its clients"""
+        with self._lock:
+            self._cleanups.append(func)
+
+    def reclaim(self):
+        """Returns the leased clients to the pool and calls the deferred functions; called after each module"""
+        with self._lock:
+            leased, self._leased = self._leased, []
+            cleanups, self._cleanups = self._cleanups, []
+            for key, entry in leased:
+                self._idle.setdefault(key, []).append(entry)
+        for func in cleanups:
+            func()
+
+
+class CdpyClient(object):
+    """
+    A stand-in for the CDPy client that imports and builds its SDK wrapper and each service client on first use,
+    applying the SDK call interceptors to each as it is built. If pool is set, the clients are taken from, and
+    returned to, the pool rather than built for each CdpyClient.
+    """
+
+    def __init__(self, call_wrappers, pool=None, **settings):
+        self._call_wrappers = call_wrappers
+        self._pool = pool
+        self._settings = settings
+
+    def __getattr__(self, name):
+        # Only called for clients that have not yet been built
+        if name != 'sdk' and name not in CDPY_SERVICES:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+        key = CdpClientPool.key(name, self._settings) if self._pool is not None else None
+        entry = self._pool.acquire(key) if key is not None else None
+        if entry is not None:
+            # A warm client: restore its SDK call function and direct its errors to this client's handlers
+            client, sdk, call = entry
+            sdk.call = call
+            sdk.throw_error = self._settings['error_handler']
+            sdk.throw_warning = self._settings['warning_handler']
+        else:
+            client, sdk = self._build(name)
+            if key is not None:
+                self._pool.lease(key, (client, sdk, sdk.call))
+
+        for wrapper in self._call_wrappers:
+            sdk.call = wrapper(sdk)
+        setattr(self, name, client)
+        return client
+
+    def _build(self, name):
+        """Returns the new client name, and its SDK wrapper"""
+        if name == 'sdk':
+            from cdpy.common import CdpcliWrapper
+            sdk = CdpcliWrapper(**self._settings)
+            return sdk, sdk
+        module_name, class_name = CDPY_SERVICES[name]
+        client = getattr(importlib.import_module(module_name), class_name)(**self._settings)
+        return client, client.sdk
+
 
 class CdpModule(object):
     """A base CDP module class for common parameters, fields, and methods."""
+
+    # Default polling profile for modules that wait on resource state changes
+    POLLING_PROFILE = 'fixed'
+
+    # Default time-to-live (in seconds) of cached SDK responses for modules that support the response cache
+    CACHE_TTL = None
+
     class _Decorators(object):
         @classmethod
         def process_debug(cls, f):
             @wraps(f)
             def _impl(self, *args, **kwargs):
                 result = f(self, *args, **kwargs)
-                if self.debug:
-                    self.log_out = self.cdpy.get_log()
-                    self.log_lines.append(self.log_out.splitlines())
+                if self.log_buffer is not None:
+                    self.log_buffer.flush()
+                    self.log_lines = self.log_buffer.lines()
+                    self.log_out = '\n'.join(self.log_lines)
                 return result
 
             return _impl
@@ -53,15 +221,63 @@ class CdpModule(object):
         self.tls = self._get_param('verify_tls', False)
         self.debug = self._get_param('debug', False)
         self.strict = self._get_param('strict', False)
+        self.broker = self._get_param('broker', False)
 
         # Initialize common return values
         self.log_out = None
         self.log_lines = []
         self.changed = False
 
+        # SDK call interceptors, applied to every client
+        self._call_wrappers = []
+
+        # Answer SDK calls from the local fake control plane, if selected
+        self.fake = fake_backend()
+        if self.fake is not None:
+            self._call_wrappers.append(self.fake.wrap)
+
+        # Capture the SDK debug log, and a record of each SDK call, in a bounded buffer
+        self.log_buffer = None
+        if self.debug:
+            try:
+                self.log_buffer = CdpLogBuffer(level=logging.getLevelName(self._get_param('debug_level', 'DEBUG')),
+                                               max_records=self._get_param('debug_max_lines', 1000),
+                                               spill_path=self._get_param('debug_file')).install()
+            except (IOError, OSError) as e:
+                self.module.fail_json(msg="Unable to open the debug log file, %s: %s" %
+                                          (self._get_param('debug_file'), e))
+            self._call_wrappers.append(self.log_buffer.wrap)
+            if CLIENT_POOL is not None:
+                CLIENT_POOL.defer(self.log_buffer.uninstall)
+
+        # Route SDK calls through the persistent client broker; debug logs are only captured in-process
+        if self.broker and not self.debug and self.fake is None:
+            from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_broker
+            broker = cdp_broker.connect(tls_verify=self.tls, strict_errors=self.strict)
+            if broker is not None:
+                self._call_wrappers.append(broker.wrap)
+
+        # Serve read-only SDK calls from the on-disk response cache
+        self.cache = self._response_cache()
+        if self.cache is not None:
+            self._call_wrappers.append(self.cache.wrap)
+
+        # Skip the description of resources unchanged since a converged run, using the local fingerprint store
+        self.state_store = self._state_store()
+        self._listing = None
+
+        # Time SDK calls and polling for the metrics callback plugin
+        self.metrics = cdp_metrics.CdpMetrics() if cdp_metrics.metrics_enabled() else None
+        if self.metrics is not None:
+            self._call_wrappers.append(self.metrics.wrap)
+            self.module.exit_json = self._with_metrics(self.module.exit_json)
+            self.module.fail_json = self._with_metrics(self.module.fail_json)
+
         # Client Wrapper
-        self.cdpy = Cdpy(debug=self.debug, tls_verify=self.tls, strict_errors=self.strict,
-                         error_handler=self._cdp_module_throw_error, warning_handler=self._cdp_module_throw_warning)
+        self.cdpy = self._build_cdpy(self._cdp_module_throw_error)
+
+        # Thread-local worker clients for concurrent calls
+        self._workers = threading.local()
 
     # Private functions
 
@@ -79,6 +295,209 @@ class CdpModule(object):
         """Warning handler for CDPy SDK"""
         self.module.warn(warning.message)
 
+    def _response_cache(self):
+        """Returns the response cache for the requested cache mode, or None if the module does not cache responses"""
+        from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_cache
+        mode = self._get_param('cache') or cdp_cache.DISABLED
+        if self.CACHE_TTL is None or mode == cdp_cache.DISABLED:
+            return None
+        try:
+            return cdp_cache.CdpResponseCache(ttl=self._get_param('cache_ttl') or self.CACHE_TTL,
+                                              refresh=mode == cdp_cache.REFRESH)
+        except (OSError, cdp_cache.sqlite3.Error) as e:
+            self.module.warn("Unable to open the CDP response cache, %s: %s" % (cdp_cache.CACHE_PATH, e))
+            return None
+
+    def _state_store(self):
+        """Returns the fingerprint store, or None if change detection with fingerprints is not requested"""
+        if not self._get_param('fingerprint'):
+            return None
+        from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_state
+        ttl = self._get_param('fingerprint_ttl')
+        try:
+            return cdp_state.CdpStateStore(ttl=cdp_state.STATE_TTL if ttl is None else ttl)
+        except (OSError, cdp_state.sqlite3.Error) as e:
+            self.module.warn("Unable to open the CDP fingerprint store, %s: %s" % (cdp_state.state_path(), e))
+            return None
+
+    def _list_resource(self, kind, name, environment=None):
+        """Returns the listing entry of the resource and its status, remembering both for _record_state"""
+        from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import RESOURCE_KINDS, find_resource
+        listing = find_resource(self.cdpy, kind, name, environment)
+        status = field_value(listing, RESOURCE_KINDS[kind]['status']) if listing is not None else None
+        self._listing = (kind, name, listing, status)
+        return listing, status
+
+    def _converged(self, kind, name, environment=None):
+        """
+        Returns the descriptor recorded for the resource if a single listing call shows that neither the resource nor
+        the module's parameters have changed since the last converged run, otherwise None
+        """
+        if self.state_store is None:
+            return None
+        from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_state
+        entry = self.state_store.get(kind, name, environment)
+        if entry is None or entry['params'] != cdp_state.params_fingerprint(type(self).__name__, self.module.params):
+            return None
+        listing, status = self._list_resource(kind, name, environment)
+        if listing is None or cdp_state.resource_fingerprint(listing, status) != entry['resource']:
+            return None
+        return entry['descriptor']
+
+    def _record_state(self, kind, name, descriptor, environment=None):
+        """Records the fingerprints of a resource left in its target state; forgets those of any other resource"""
+        if self.state_store is None or self.module.check_mode:
+            return
+        from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_state
+        from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import RESOURCE_KINDS
+        target = RESOURCE_KINDS[kind]['target']
+        if not descriptor or field_value(descriptor, RESOURCE_KINDS[kind]['status']) != target:
+            self.state_store.forget(kind, name, environment)
+            return
+        # The listing entry of the convergence check is current only if the run did not change the resource
+        if self.changed or self._listing is None or self._listing[:2] != (kind, name):
+            self._list_resource(kind, name, environment)
+        listing, status = self._listing[2:]
+        if listing is None or status != target:
+            self.state_store.forget(kind, name, environment)
+            return
+        self.state_store.put(kind, name, cdp_state.resource_fingerprint(listing, status),
+                             cdp_state.params_fingerprint(type(self).__name__, self.module.params), descriptor,
+                             environment)
+
+    def _with_metrics(self, exit_func):
+        """Returns exit_func with the collected metrics added to the module results"""
+        @wraps(exit_func)
+        def _exit(**kwargs):
+            kwargs[cdp_metrics.METRICS_FIELD] = self.metrics.as_dict()
+            return exit_func(**kwargs)
+
+        return _exit
+
+    def _sleep(self, seconds):
+        """Sleeps while polling, recording the time if metrics are enabled"""
+        if self.metrics is not None:
+            self.metrics.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _build_cdpy(self, error_handler):
+        """Returns a CDPy client whose SDK and service clients are built, with the module's interceptors, on use"""
+        # The SDK debug log is captured by the module's log buffer rather than by CDPy
+        return CdpyClient(self._call_wrappers, pool=CLIENT_POOL, debug=False, tls_verify=self.tls,
+                          strict_errors=self.strict, error_handler=error_handler,
+                          warning_handler=self._cdp_module_throw_warning)
+
+    @staticmethod
+    def _cdp_worker_throw_error(error: 'CdpError'):
+        """Error handler for CDPy SDK worker clients; raises so that the calling worker can report the failure"""
+        raise error
+
+    def _worker_cdpy(self):
+        """Returns the CDPy client for the current worker thread, creating it if necessary"""
+        client = getattr(self._workers, 'cdpy', None)
+        if client is None:
+            client = self._build_cdpy(self._cdp_worker_throw_error)
+            self._workers.cdpy = client
+        return client
+
+    def _polling_strategy(self, delay=None):
+        """
+        Returns the polling strategy for the requested polling profile. Without a requested profile, a delay selects
+        the 'fixed' profile and otherwise the module's default profile applies.
+        """
+        profile = self._get_param('polling_profile')
+        if profile is None:
+            profile = 'fixed' if delay is not None else self.POLLING_PROFILE
+        elif profile != 'fixed' and delay is not None:
+            self.module.warn("The delay of %s seconds is ignored by the '%s' polling profile; set "
+                             "polling_profile=fixed to poll at that interval" % (delay, profile))
+        return PollingStrategy.from_profile(profile, DEFAULT_DELAY if delay is None else delay)
+
+    def _wait_for_state(self, describe_func, params, field='status', state=None, delay=None, timeout=3600,
+                        ignore_failures=False):
+        """Waits for a resource to reach a state using the module's polling strategy; see cdp_polling.wait_for_state"""
+        return wait_for_state(self.cdpy.sdk, describe_func=describe_func, params=params, field=field, state=state,
+                              timeout=timeout, ignore_failures=ignore_failures,
+                              strategy=self._polling_strategy(delay), sleep=self._sleep)
+
+    def _job_handle(self, kind, name, state=None, environment=None):
+        """Returns a job handle for a change the module started without waiting; see cdp_waiter.job_handle"""
+        from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import job_handle
+        return job_handle(kind, name, state=state, environment=environment, timeout=self._get_param('timeout'))
+
+    @staticmethod
+    def _error_message(error):
+        """Returns the message of a CDPy SDK error or the string form of any other exception"""
+        message = getattr(error, 'message', None)
+        return str(message) if message is not None else str(error)
+
+    @staticmethod
+    def _transient_error(error):
+        """
+        Returns True if a CDPy SDK error is transient, i.e. throttling, a server error, or a failure to reach the
+        endpoint, for which the error has no HTTP status; client errors, e.g. not found or forbidden, are not
+        """
+        status_code = getattr(error, 'status_code', None)
+        if status_code is None:
+            return True
+        status_code = str(status_code)
+        return status_code == '429' or status_code.startswith('5')
+
+    def _parallel_map(self, func, items, parallelism, retries=0, retry_delay=1):
+        """
+        Calls func(client, item) for each item using a bounded pool of worker CDPy clients.
+        Calls that fail with a transient CDPy SDK error (see _transient_error) are retried up to retries times, with an
+        exponential backoff from retry_delay seconds.
+        Returns a list of (result, error) tuples in the same order as the submitted items; error is None on success.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from cdpy.common import CdpError
+
+        def _invoke(item):
+            attempt = 0
+            while True:
+                try:
+                    return func(self._worker_cdpy(), item), None
+                except CdpError as e:
+                    if attempt >= retries or not self._transient_error(e):
+                        return None, e
+                except Exception as e:
+                    return None, e
+                if self.metrics is not None:
+                    self.metrics.record_retry()
+                time.sleep(retry_delay * 2 ** attempt)
+                attempt += 1
+
+        items = list(items)
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(items)))) as executor:
+            return list(executor.map(_invoke, items))
+
+    def _describe_all(self, describe, items, name_key, kind, parallelism=1, retries=0):
+        """
+        Returns the descriptor of each item, in order, from describe(client, item), retrieved concurrently by up to
+        parallelism worker clients. Transient errors are retried up to retries times. If any descriptor cannot be
+        retrieved, the module fails and lists each failure with the name of its item, the value of name_key.
+        """
+        results = self._parallel_map(describe, items, parallelism, retries=retries)
+
+        descriptors = []
+        failures = []
+        for item, (descriptor, error) in zip(items, results):
+            if error is None and descriptor is None:
+                error = '%s not found' % kind
+            if error is not None:
+                failures.append(dict(name=item[name_key], error=self._error_message(error)))
+            else:
+                descriptors.append(descriptor)
+
+        if failures:
+            self.module.fail_json(msg="Failed to retrieve %s content for %s of %s %ss" %
+                                  (kind, len(failures), len(items), kind), failures=failures)
+        return descriptors
+
     @staticmethod
     def argument_spec(**spec):
         """Default Ansible Module spec values for convenience"""
@@ -86,5 +505,27 @@ class CdpModule(object):
             **spec,
             verify_tls=dict(required=False, type='bool', default=True, aliases=['tls']),
             debug=dict(required=False, type='bool', default=False, aliases=['debug_endpoints']),
+            debug_level=dict(required=False, type='str', default='DEBUG',
+                             choices=['DEBUG', 'INFO', 'WARNING', 'ERROR']),
+            debug_max_lines=dict(required=False, type='int', default=1000),
+            debug_file=dict(required=False, type='path'),
             strict=dict(required=False, type='bool', default=False, aliases=['strict_errors']),
+            broker=dict(required=False, type='bool', fallback=(env_fallback, ['CDP_BROKER'])),
+        )
+
+    @staticmethod
+    def cache_argument_spec():
+        """Ansible Module spec values for modules that support the response cache"""
+        return dict(
+            cache=dict(required=False, type='str', choices=['disabled', 'enabled', 'refresh'],
+                       fallback=(env_fallback, ['CDP_CACHE'])),
+            cache_ttl=dict(required=False, type='int'),
+        )
+
+    @staticmethod
+    def fingerprint_argument_spec():
+        """Ansible Module spec values for modules that support change detection with fingerprints"""
+        return dict(
+            fingerprint=dict(required=False, type='bool', fallback=(env_fallback, ['CDP_FINGERPRINT'])),
+            fingerprint_ttl=dict(required=False, type='int', fallback=(env_fallback, ['CDP_FINGERPRINT_TTL'])),
         )
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A dependency-aware scheduler of CDP resource changes for the Cloudera CDP Collection
+
+Each node of the graph starts a change to a resource, e.g. a create call, once every node it depends upon is done.
+The scheduler then waits for the resources in flight with the multi-resource waiter (see cdp_waiter.py), so that one
+listing call per resource kind and interval serves every resource, and starts the dependents of each resource as soon
+as it is ready. Independent branches of the graph are therefore started, and waited upon, concurrently. The nodes
+that depend, directly or not, upon a failed node are skipped.
+"""
+
+import time
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import PollingStrategy
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import CdpResourceWaiter
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# The states of a node
+PENDING = 'pending'
+WAITING = 'waiting'
+DONE = 'done'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+class CdpDagNode(object):
+    """
+    A node of the graph. The start function is called with a CDPy client once the nodes of depends_on are done, and
+    returns a tuple of a flag indicating a change and either a resource to wait upon, as for CdpResourceWaiter, or
+    None if the node is done once started.
+    """
+
+    def __init__(self, id, start, depends_on=None):
+        self.id = id
+        self.start = start
+        self.depends_on = list(depends_on or [])
+        self.state = PENDING
+        self.changed = False
+        self.resource = None
+        self.status = None
+        self.descriptor = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    def as_dict(self):
+        return dict(id=self.id, state=self.state, changed=self.changed, status=self.status, error=self.error,
+                    depends_on=self.depends_on,
+                    elapsed=self.finished - self.started if None not in (self.started, self.finished) else None,
+                    resource=self.descriptor)
+
+
+class CdpDagScheduler(object):
+    """
+    Runs the nodes of a graph in dependency order. The parallel_map function, as CdpModule._parallel_map, calls the
+    start functions of the nodes that become ready together, with up to parallelism concurrent calls.
+    """
+
+    def __init__(self, client, nodes, parallel_map, parallelism=8, strategy=None, timeout=3600, sleep=None):
+        self.client = client
+        self.nodes = list(nodes)
+        self.parallel_map = parallel_map
+        self.parallelism = parallelism
+        self.strategy = strategy or PollingStrategy(15, 15)
+        self.timeout = timeout
+        self.sleep = sleep or time.sleep
+        self.calls = 0
+        self._nodes = dict((n.id, n) for n in self.nodes)
+        self._validate()
+
+    def _validate(self):
+        """Raises ValueError if a node depends upon an unknown node or the graph has a cycle"""
+        for node in self.nodes:
+            unknown = [d for d in node.depends_on if d not in self._nodes]
+            if unknown:
+                raise ValueError("Node '%s' depends upon unknown nodes: %s" % (node.id, ', '.join(unknown)))
+
+        visited, path = set(), []
+
+        def _visit(node):
+            if node.id in path:
+                raise ValueError("Dependency cycle: %s" % ' -> '.join(path[path.index(node.id):] + [node.id]))
+            if node.id not in visited:
+                path.append(node.id)
+                for dependency in node.depends_on:
+                    _visit(self._nodes[dependency])
+                path.pop()
+                visited.add(node.id)
+
+        for node in self.nodes:
+            _visit(node)
+
+    def _skip_blocked(self):
+        """Skips the pending nodes that depend upon a failed or skipped node"""
+        blocked = True
+        while blocked:
+            blocked = False
+            for node in self.nodes:
+                if node.state == PENDING and any(self._nodes[d].state in (FAILED, SKIPPED) for d in node.depends_on):
+                    node.state = SKIPPED
+                    node.error = 'Skipped, as a dependency did not complete'
+                    blocked = True
+
+    def _start(self, nodes):
+        def _invoke(client, node):
+            return node.start(client)
+
+        for node in nodes:
+            node.started = time.time()
+        for node, (outcome, error) in zip(nodes, self.parallel_map(_invoke, nodes, self.parallelism)):
+            if error is not None:
+                node.state, node.finished = FAILED, time.time()
+                node.error = str(getattr(error, 'message', None) or error)
+                continue
+            node.changed, node.resource = outcome
+            if node.resource is None:
+                node.state, node.finished = DONE, time.time()
+            else:
+                node.state = WAITING
+
+    def _poll(self, nodes):
+        """Polls the resources of the waiting nodes; returns True if any node is done or has failed"""
+        waiter = CdpResourceWaiter(self.client, [n.resource for n in nodes])
+        results = waiter.poll()
+        self.calls += waiter.calls
+
+        progressed = False
+        for node, result in zip(nodes, results):
+            node.status = result['status']
+            node.descriptor = result['resource']
+            if result['ready']:
+                node.state, node.finished, progressed = DONE, time.time(), True
+            elif result['failed']:
+                node.state, node.finished, progressed = FAILED, time.time(), True
+                node.error = "%s '%s' reported a failure state, %s" % (result['kind'], result['name'],
+                                                                       result['status'])
+        return progressed
+
+    def run(self):
+        """Runs the graph to completion, or until the timeout, and returns the nodes"""
+        deadline = time.time() + self.timeout
+        last = None
+        while True:
+            self._skip_blocked()
+            ready = [n for n in self.nodes
+                     if n.state == PENDING and all(self._nodes[d].state == DONE for d in n.depends_on)]
+            if ready:
+                self._start(ready)
+                continue
+
+            waiting = [n for n in self.nodes if n.state == WAITING]
+            if not waiting:
+                return self.nodes
+            if self._poll(waiting):
+                continue
+
+            current = [n.status for n in waiting]
+            interval = self.strategy.next_delay(transitioned=last is not None and current != last)
+            last = current
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                for node in waiting:
+                    node.state, node.finished = FAILED, time.time()
+                    node.error = "Timeout waiting for %s '%s' (%s, expected %s)" % (
+                        node.resource['kind'], node.resource['name'], node.status, node.resource.get('state'))
+                continue
+            self.sleep(min(interval, remaining))
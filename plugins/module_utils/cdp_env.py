@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reconciliation of CDP Environment descriptors with the parameters of the Cloudera CDP Collection modules
+
+Each reconciled parameter is mapped, for each cloud platform, to a field of the Environment descriptor and, if the
+field can be changed after creation, to the update call that changes it. diff() compares the parameters with a
+descriptor, plan() groups the differences into the fewest update calls, e.g. a single security access update for both
+security groups, and apply() makes the calls. Differences in fields that are fixed at creation are violations, which
+only the recreation of the Environment resolves, except for those of the fields that are only reported, e.g. the tags.
+"""
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import field_value
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+CLOUDS = ['aws', 'azure', 'gcp']
+
+
+def _by_cloud(aws=None, azure=None, gcp=None):
+    return dict((c, f) for c, f in zip(CLOUDS, [aws, azure, gcp]) if f is not None)
+
+
+def _every_cloud(field):
+    return dict((c, field) for c in CLOUDS)
+
+
+# The reconciled parameters. For each: the descriptor field, as nested keys, for each cloud to which the parameter
+# applies; how the values are compared ('value', 'optional' for a value that an empty string removes, 'set' for lists
+# in any order, 'tags' for the tags that are set, or 'count' for the number of FreeIPA instances); and the update that
+# changes the field, or None if it is fixed at creation. A difference in a fixed field is a violation unless the field
+# is not strict, in which case it is only reported.
+FIELDS = [
+    dict(param='credential', field=_every_cloud(['credentialName']), compare='value', update='credential'),
+    dict(param='region', field=_every_cloud(['region']), compare='value', update=None),
+    dict(param='description', field=_every_cloud(['description']), compare='value', update=None),
+    dict(param='tunnel', field=_every_cloud(['tunnelEnabled']), compare='value', update=None),
+    dict(param='workload_analytics', field=_every_cloud(['workloadAnalytics']), compare='value',
+         update='telemetry'),
+    dict(param='proxy', field=_every_cloud(['proxyConfig', 'proxyConfigName']), compare='optional',
+         update='proxy'),
+    dict(param='tags', field=_every_cloud(['tags', 'userDefined']), compare='tags', update=None, strict=False),
+    dict(param='log_identity', field=_by_cloud(aws=['logStorage', 'awsDetails', 'instanceProfile'],
+                                               azure=['logStorage', 'azureDetails', 'managedIdentity'],
+                                               gcp=['logStorage', 'gcpDetails', 'serviceAccountEmail']),
+         compare='value', update=None),
+    dict(param='log_location', field=_by_cloud(aws=['logStorage', 'awsDetails', 'storageLocationBase'],
+                                               azure=['logStorage', 'azureDetails', 'storageLocationBase'],
+                                               gcp=['logStorage', 'gcpDetails', 'storageLocationBase']),
+         compare='value', update=None),
+    dict(param='public_key_id', field=_by_cloud(aws=['authentication', 'publicKeyId']), compare='value',
+         update='ssh_key'),
+    dict(param='public_key_text', field=_every_cloud(['authentication', 'publicKey']), compare='value',
+         update='ssh_key'),
+    dict(param='freeipa', field=_every_cloud(['freeipa', 'serverIP']), compare='count', update=None),
+    dict(param='network_cidr', field=_by_cloud(aws=['network', 'networkCidr']), compare='value', update=None),
+    dict(param='vpc_id', field=_by_cloud(aws=['network', 'aws', 'vpcId'], azure=['network', 'azure', 'networkId'],
+                                         gcp=['network', 'gcp', 'networkName']),
+         compare='value', update=None),
+    dict(param='subnet_ids', field=_every_cloud(['network', 'subnetIds']), compare='set', update=None),
+    dict(param='resource_gp', field=_by_cloud(azure=['network', 'azure', 'resourceGroupName']), compare='value',
+         update=None),
+    dict(param='project', field=_by_cloud(gcp=['network', 'gcp', 'sharedProjectId']), compare='value', update=None),
+    dict(param='public_ip', field=_by_cloud(azure=['network', 'azure', 'usePublicIp'],
+                                            gcp=['network', 'gcp', 'usePublicIp']),
+         compare='value', update=None),
+    dict(param='s3_guard_name', field=_by_cloud(aws=['awsDetails', 's3GuardTableName']), compare='value',
+         update=None),
+    dict(param='inbound_cidr', field=_by_cloud(aws=['securityAccess', 'cidr']), compare='value', update=None),
+    dict(param='default_sg', field=_every_cloud(['securityAccess', 'defaultSecurityGroupId']), compare='value',
+         update='security_access'),
+    dict(param='knox_sg', field=_every_cloud(['securityAccess', 'securityGroupIdForKnox']), compare='value',
+         update='security_access'),
+]
+
+# The argument specification of the reconciled parameters, as for M(cloudera.cloud.env)
+ARGUMENT_SPEC = dict(
+    region=dict(required=False, type='str'),
+    credential=dict(required=False, type='str'),
+    inbound_cidr=dict(required=False, type='str', aliases=['security_cidr']),
+    default_sg=dict(required=False, type='str', aliases=['default', 'default_security_group']),
+    knox_sg=dict(required=False, type='str', aliases=['knox', 'knox_security_group']),
+    public_key_text=dict(required=False, type='str', aliases=['ssh_key_text']),
+    public_key_id=dict(required=False, type='str', aliases=['public_key', 'ssh_key', 'ssh_key_id']),
+    log_location=dict(required=False, type='str', aliases=['storage_location_base']),
+    log_identity=dict(required=False, type='str', aliases=['instance_profile']),
+    network_cidr=dict(required=False, type='str'),
+    vpc_id=dict(required=False, type='str', aliases=['vpc', 'network']),  # TODO: Update Docs
+    subnet_ids=dict(required=False, type='list', elements='str', aliases=['subnets']),
+    public_ip=dict(required=False, type='bool'),  # TODO: add to docs
+    s3_guard_name=dict(required=False, type='str', aliases=['s3_guard', 's3_guard_table_name']),
+    resource_gp=dict(required=False, type='str', aliases=['resource_group_name']),
+    tags=dict(required=False, type='dict', aliases=['environment_tags']),
+    workload_analytics=dict(required=False, type='bool'),
+    description=dict(required=False, type='str', aliases=['desc']),
+    tunnel=dict(required=False, type='bool', aliases=['enable_tunnel', 'ssh_tunnel']),
+    freeipa=dict(required=False, type='dict', options=dict(instanceCountByGroup=dict(required=False, type='int'))),
+    project=dict(required=False, type='str'),
+    proxy=dict(required=False, type='str', aliases=['[proxy_config', 'proxy_config_name']),
+)
+
+
+def _credential_request(name, params, descriptor):
+    return dict(environmentName=name, credentialName=params['credential'])
+
+
+def _telemetry_request(name, params, descriptor):
+    return dict(environmentName=name, workloadAnalytics=params['workload_analytics'])
+
+
+def _proxy_request(name, params, descriptor):
+    if not params['proxy']:
+        return dict(environment=name, removeProxy=True)
+    return dict(environment=name, proxyConfigName=params['proxy'])
+
+
+def _ssh_key_request(name, params, descriptor):
+    if params.get('public_key_id') is not None:
+        return dict(environment=name, existingPublicKeyId=params['public_key_id'])
+    return dict(environment=name, newPublicKey=params['public_key_text'])
+
+
+def _security_access_request(name, params, descriptor):
+    # The update sets both security groups, so that one not set keeps its current value
+    access = descriptor.get('securityAccess') or dict()
+    default_sg = params.get('default_sg')
+    knox_sg = params.get('knox_sg')
+    return dict(environment=name,
+                defaultSecurityGroupId=access.get('defaultSecurityGroupId') if default_sg is None else default_sg,
+                gatewayNodeSecurityGroupId=access.get('securityGroupIdForKnox') if knox_sg is None else knox_sg)
+
+
+# The updates, in the order they are applied: the SDK service and function, and the request for the parameters and
+# the current descriptor
+UPDATES = [
+    ('credential', dict(svc='environments', func='change_environment_credential', request=_credential_request)),
+    ('security_access', dict(svc='environments', func='update_security_access', request=_security_access_request)),
+    ('ssh_key', dict(svc='environments', func='update_ssh_key', request=_ssh_key_request)),
+    ('proxy', dict(svc='environments', func='update_proxy_config', request=_proxy_request)),
+    ('telemetry', dict(svc='environments', func='set_telemetry_features', request=_telemetry_request)),
+]
+
+
+def _expected(spec, value):
+    if spec['compare'] == 'tags':
+        return dict((k, str(v)) for k, v in value.items())
+    if spec['compare'] == 'count':
+        return value.get('instanceCountByGroup')
+    return value
+
+
+def _actual(spec, value, expected):
+    if spec['compare'] == 'optional':
+        return '' if value is None else value
+    if spec['compare'] == 'set':
+        return sorted(value) if value is not None else None
+    if spec['compare'] == 'tags':
+        # Tags that are not set, e.g. those added by CDP, are not compared
+        return dict((k, (value or dict()).get(k)) for k in expected)
+    if spec['compare'] == 'count':
+        return len(value) if value is not None else None
+    return value
+
+
+def diff(cloud, params, descriptor):
+    """
+    Returns the differences between the parameters, for the cloud platform, and the Environment descriptor. Each
+    difference is a dict of the parameter, the descriptor field, the expected and actual values, and the update that
+    resolves it, or None. Parameters that are not set are not reconciled.
+    """
+    differences = []
+    for spec in FIELDS:
+        value = params.get(spec['param'])
+        if value is None or cloud not in spec['field']:
+            continue
+        expected = _expected(spec, value)
+        if expected is None:
+            continue
+        actual = _actual(spec, field_value(descriptor, spec['field'][cloud]), expected)
+        if (sorted(expected) if spec['compare'] == 'set' else expected) != actual:
+            differences.append(dict(param=spec['param'], field='.'.join(spec['field'][cloud]), expected=expected,
+                                    actual=actual, update=spec['update'], strict=spec.get('strict', True)))
+    return differences
+
+
+def violations(differences):
+    """Returns the strict differences that no update resolves, as [parameter, actual value] pairs"""
+    return [[d['param'], d['actual']] for d in differences if d['update'] is None and d['strict']]
+
+
+def unresolved(differences):
+    """Returns the differences that no update resolves but that are only reported, as [parameter, actual value] pairs"""
+    return [[d['param'], d['actual']] for d in differences if d['update'] is None and not d['strict']]
+
+
+def plan(name, params, differences, descriptor):
+    """Returns the update calls, in order, that resolve the differences of the named Environment and its descriptor"""
+    required = set(d['update'] for d in differences if d['update'] is not None)
+    return [dict(update=update, svc=spec['svc'], func=spec['func'], request=spec['request'](name, params, descriptor),
+                 params=[d['param'] for d in differences if d['update'] == update])
+            for update, spec in UPDATES if update in required]
+
+
+def apply(sdk, updates):
+    """Makes the update calls of a plan with the CDPy SDK wrapper"""
+    for update in updates:
+        sdk.call(update['svc'], update['func'], **update['request'])
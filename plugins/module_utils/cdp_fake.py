@@ -0,0 +1,888 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local stand-in for the CDP control plane, for offline testing and benchmarking of the Cloudera CDP Collection
+
+The fake backend replaces the SDK call function of the CDPy clients of a module and answers CDP API calls from an
+in-memory account model, optionally persisted to a JSON state file so that the state is shared across module
+executions. Resources move through their lifecycle states over (scaled) time, listings are paginated, and calls can
+be delayed and can fail with injected throttling and server errors.
+
+The backend is selected and configured with environment variables:
+
+    CDP_FAKE_BACKEND      The path of the state file, or 'memory' for a state that lasts only for the module execution
+    CDP_FAKE_LATENCY      The delay (in seconds) added to each call; default 0
+    CDP_FAKE_PAGE_SIZE    The default page size of listings; default 100
+    CDP_FAKE_SPEED        The factor applied to the passage of time for lifecycle transitions; default 1
+    CDP_FAKE_FAULTS       Comma-separated fault probabilities, e.g. 'throttle=0.05,server_error=0.01'
+    CDP_FAKE_SEED         The seed for fault injection and generated data
+    CDP_FAKE_USERS        The number of users generated in a new account; default 10
+    CDP_FAKE_ENVIRONMENTS The number of available environments, each with a running datalake, in a new account;
+                          default 0
+    CDP_FAKE_TEMPLATES    The number of cluster templates in a new account; default 4
+    CDP_FAKE_GROUPS       The number of groups in a new account, among which the users are evenly divided; default 0
+
+Within a process, the modules share a single backend for each configuration, so a 'memory' state lasts for the
+lifetime of the process.
+"""
+
+import base64
+import contextlib
+import copy
+import fcntl
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+
+from functools import wraps
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+MEMORY = 'memory'
+
+# The instance groups of Datalakes and Datahubs, as (name, instance count) pairs
+DATALAKE_GROUPS = [('master', 1), ('idbroker', 1)]
+DATAHUB_GROUPS = [('master', 1), ('worker', 3)]
+
+DEFAULT_TEMPLATES = ('Data Engineering', 'Data Mart', 'Flow Management', 'Streams Messaging')
+
+ACCOUNT_ID = '9d74eee4-1cad-45d7-b645-7ccf9edbb73d'
+REGION = 'us-west-1'
+
+# The lifecycle of each resource kind, as lists of (state, duration in seconds); a duration of None is terminal and
+# the deletion lifecycles end with the removal of the resource
+LIFECYCLES = dict(
+    environment=dict(
+        create=[('CREATION_INITIATED', 5), ('ENV_STACK_CREATION_IN_PROGRESS', 20),
+                ('FREEIPA_CREATION_IN_PROGRESS', 20), ('AVAILABLE', None)],
+        delete=[('DELETE_INITIATED', 10), ('FREEIPA_DELETE_IN_PROGRESS', 10)],
+        start=[('START_DATALAKE_STARTED', 10), ('START_DATAHUB_STARTED', 10), ('AVAILABLE', None)],
+        stop=[('STOP_DATAHUB_STARTED', 10), ('STOP_DATALAKE_STARTED', 10), ('ENV_STOPPED', None)],
+    ),
+    datalake=dict(
+        create=[('REQUESTED', 5), ('STACK_CREATION_IN_PROGRESS', 30), ('RUNNING', None)],
+        delete=[('DELETE_REQUESTED', 5), ('STACK_DELETION_IN_PROGRESS', 20)],
+    ),
+    datahub=dict(
+        create=[('REQUESTED', 5), ('UPDATE_IN_PROGRESS', 30), ('AVAILABLE', None)],
+        delete=[('DELETE_IN_PROGRESS', 20)],
+        start=[('START_IN_PROGRESS', 10), ('AVAILABLE', None)],
+        stop=[('STOP_IN_PROGRESS', 10), ('STOPPED', None)],
+    ),
+    ml=dict(
+        create=[('provision:started', 10), ('installation:started', 30), ('installation:finished', None)],
+        delete=[('deprovision:started', 20)],
+    ),
+    dw=dict(
+        create=[('Accepted', 5), ('Creating', 30), ('Running', None)],
+        delete=[('Deleting', 20)],
+    ),
+    opdb=dict(
+        create=[('PROVISIONING', 30), ('AVAILABLE', None)],
+        delete=[('STOPPING', 10), ('DELETING', 10)],
+    ),
+    df=dict(
+        create=[('ENABLING', 30), ('GOOD_HEALTH', None)],
+        delete=[('DISABLING', 20)],
+    ),
+)
+
+# For each resource kind: the state collection, the name field and the status field
+KINDS = dict(
+    environment=dict(collection='environments', name='environmentName', status='status'),
+    datalake=dict(collection='datalakes', name='datalakeName', status='status'),
+    datahub=dict(collection='datahubs', name='clusterName', status='status'),
+    ml=dict(collection='workspaces', name='instanceName', status='instanceStatus'),
+    dw=dict(collection='dw_clusters', name='id', status='status'),
+    opdb=dict(collection='databases', name='databaseName', status='status'),
+    df=dict(collection='df_services', name='environmentCrn', status='status'),
+)
+
+
+def make_crn(service, resource_type, name=None):
+    return 'crn:cdp:%s:%s:%s:%s:%s' % (service, REGION, ACCOUNT_ID, resource_type, name or uuid.uuid4())
+
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000000+00:00', time.gmtime())
+
+
+def _instance_groups(cluster, domain, groups):
+    """Returns the instance groups of a cluster, as (name, instance count) pairs, with their instances"""
+    instance_groups = []
+    for name, count in groups:
+        instances = []
+        for i in range(count):
+            digest = hashlib.sha256(('%s/%s/%s' % (cluster, name, i)).encode('utf-8')).digest()
+            instances.append(dict(id='i-%s' % base64.b16encode(digest[:8]).decode('ascii').lower(), state='HEALTHY',
+                                  instanceType='m5.xlarge', discoveryFQDN='%s-%s%s.%s' % (cluster, name, i, domain),
+                                  privateIp='10.%s.%s.%s' % tuple(bytearray(digest[8:11])), publicIp=None))
+        instance_groups.append(dict(name=name, instances=instances))
+    return instance_groups
+
+
+def _error(status_code, error_code, message):
+    from cdpy.common import CdpError
+
+    error = CdpError(message)
+    error.status_code = status_code
+    error.error_code = error_code
+    error.message = message
+    return error
+
+
+class FakeCallError(Exception):
+    """Raised by handlers to return a CDP API error"""
+
+    def __init__(self, status_code, error_code, message):
+        super(FakeCallError, self).__init__(message)
+        self.status_code = status_code
+        self.error_code = error_code
+        self.message = message
+
+
+def _not_found(kind, name):
+    return FakeCallError('404', 'NOT_FOUND', "%s '%s' not found" % (kind, name))
+
+
+class CdpFakeBackend(object):
+    """Answers CDP API calls from a modelled account; safe for concurrent use within and across processes."""
+
+    _shared = dict()
+
+    def __init__(self, path=MEMORY, latency=0.0, page_size=100, speed=1.0, faults=None, seed=None, users=10,
+                 environments=0, templates=len(DEFAULT_TEMPLATES), groups=0):
+        self.path = path
+        self.latency = latency
+        self.page_size = page_size
+        self.speed = speed
+        self.faults = faults or dict()
+        self.users = users
+        self.environments = environments
+        self.templates = templates
+        self.groups = groups
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._memory = None
+
+    @classmethod
+    def from_environment(cls):
+        """Returns the backend configured by the CDP_FAKE_* environment variables, or None if not selected"""
+        path = os.environ.get('CDP_FAKE_BACKEND')
+        if not path:
+            return None
+        faults = dict()
+        for fault in filter(None, os.environ.get('CDP_FAKE_FAULTS', '').split(',')):
+            kind, _, probability = fault.partition('=')
+            faults[kind.strip()] = float(probability)
+        seed = os.environ.get('CDP_FAKE_SEED')
+        settings = dict(path=path,
+                        latency=float(os.environ.get('CDP_FAKE_LATENCY', 0)),
+                        page_size=int(os.environ.get('CDP_FAKE_PAGE_SIZE', 100)),
+                        speed=float(os.environ.get('CDP_FAKE_SPEED', 1)),
+                        faults=faults,
+                        seed=int(seed) if seed is not None else None,
+                        users=int(os.environ.get('CDP_FAKE_USERS', 10)),
+                        environments=int(os.environ.get('CDP_FAKE_ENVIRONMENTS', 0)),
+                        templates=int(os.environ.get('CDP_FAKE_TEMPLATES', len(DEFAULT_TEMPLATES))),
+                        groups=int(os.environ.get('CDP_FAKE_GROUPS', 0)))
+        key = json.dumps(settings, sort_keys=True)
+        if key not in cls._shared:
+            cls._shared[key] = cls(**settings)
+        return cls._shared[key]
+
+    def initialize(self):
+        """Creates the account state, and its state file, if it does not yet exist"""
+        with self._state():
+            pass
+
+    # State
+
+    def _seed(self):
+        """Returns the state of a new account"""
+        rng = random.Random(self.users)
+        users = []
+        for i in range(self.users):
+            user_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            users.append(dict(userId=user_id, crn=make_crn('iam', 'user', user_id), email='user%05d@example.com' % i,
+                              firstName='User', lastName='%05d' % i, workloadUsername='user%05d' % i,
+                              accountAdmin=i == 0, identityProviderCrn=make_crn('iam', 'samlProvider', 'default'),
+                              creationDate=_now()))
+        templates = list(DEFAULT_TEMPLATES[:self.templates])
+        templates.extend('Custom %04d' % i for i in range(self.templates - len(templates)))
+        groups = []
+        for i in range(self.groups):
+            name = 'group%04d' % i
+            groups.append(dict(groupName=name, crn=make_crn('iam', 'group', name), creationDate=_now(),
+                               syncMembershipOnUserLogin=True, _members=[u['crn'] for u in users[i::self.groups]],
+                               _roles=[], _resource_roles=[]))
+        environments, datalakes = [], []
+        for i in range(self.environments):
+            name = 'env%04d' % i
+            environments.append(dict(
+                environmentName=name, crn=make_crn('environments', 'environment', name), credentialName='cred',
+                region=REGION, cloudPlatform='AWS', description=None, tunnelEnabled=True, status='AVAILABLE',
+                creationDate=_now(), freeipa=dict(crn=make_crn('freeipa', 'freeipa', name),
+                                                  domain='%s.cloudera.site' % name, hostname='ipaserver',
+                                                  serverIP=['10.0.0.10'])))
+            datalakes.append(dict(datalakeName='%s-dl' % name, crn=make_crn('datalake', 'datalake', name),
+                                  environmentCrn=environments[-1]['crn'], environmentName=name, cloudPlatform='AWS',
+                                  status='RUNNING', creationDate=_now(),
+                                  productVersions=[dict(name='CDH', version='7.2.12')],
+                                  instanceGroups=_instance_groups('%s-dl' % name, '%s.cloudera.site' % name,
+                                                                  DATALAKE_GROUPS)))
+        return dict(
+            account=dict(clouderaSSOLoginEnabled=True, workloadPasswordPolicy=dict(maxPasswordLifetimeDays=0)),
+            users=users,
+            machine_users=[],
+            groups=groups,
+            resource_roles=[dict(crn=make_crn('iam', 'resourceRole', r), rights=[]) for r in
+                            ('EnvironmentAdmin', 'EnvironmentUser', 'DWAdmin', 'DWUser', 'MLAdmin', 'MLUser')],
+            runtimes=[dict(runtimeVersion='7.2.11', defaultRuntimeVersion=False),
+                      dict(runtimeVersion='7.2.12', defaultRuntimeVersion=True)],
+            templates=[dict(clusterTemplateName='7.2.12 - %s' % t, crn=make_crn('datahub', 'clustertemplate', t),
+                            productVersion='7.2.12', instanceType='ON_DEMAND',
+                            status='DEFAULT' if t in DEFAULT_TEMPLATES else 'USER_MANAGED',
+                            clusterTemplateContent=json.dumps(dict(cdhVersion='7.2.12', displayName=t)))
+                       for t in templates],
+            definitions=[dict(clusterDefinitionName='7.2.12 - %s for AWS' % d,
+                              crn=make_crn('datahub', 'clusterdefinition', d),
+                              productVersion='7.2.12', nodeCount=3, cloudPlatform='AWS',
+                              workloadTemplate=json.dumps(dict(name=d)))
+                         for d in DEFAULT_TEMPLATES],
+            environments=environments, datalakes=datalakes, datahubs=[], workspaces=[], dw_clusters=[],
+            databases=[], df_services=[],
+        )
+
+    @contextlib.contextmanager
+    def _state(self, write=False):
+        """Yields the account state, loading and saving the state file under an exclusive lock"""
+        with self._lock:
+            if self.path == MEMORY:
+                if self._memory is None:
+                    self._memory = self._seed()
+                self._advance(self._memory)
+                yield self._memory
+                return
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(self.path + '.lock', 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    if os.path.exists(self.path):
+                        with open(self.path) as state_file:
+                            state = json.load(state_file)
+                    else:
+                        state, write = self._seed(), True
+                    self._advance(state)
+                    yield state
+                    if write:
+                        temp_path = self.path + '.tmp'
+                        with open(temp_path, 'w') as state_file:
+                            json.dump(state, state_file)
+                        os.rename(temp_path, self.path)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # Lifecycles
+
+    def _transition(self, resource, kind, lifecycle):
+        resource['_lifecycle'] = dict(kind=kind, name=lifecycle, since=time.time())
+        self._update_status(resource)
+
+    def _update_status(self, resource):
+        """Sets the status of the resource for the elapsed time; returns False if the resource has been removed"""
+        lifecycle = resource.get('_lifecycle')
+        if lifecycle is None:
+            return True
+        elapsed = (time.time() - lifecycle['since']) * self.speed
+        kind = KINDS[lifecycle['kind']]
+        for state, duration in LIFECYCLES[lifecycle['kind']][lifecycle['name']]:
+            if duration is None or elapsed < duration:
+                if lifecycle['kind'] == 'df':
+                    resource[kind['status']] = dict(state=state, detailedState=state, message='')
+                else:
+                    resource[kind['status']] = state
+                return True
+            elapsed -= duration
+        return lifecycle['name'] != 'delete'
+
+    def _advance(self, state):
+        for kind in KINDS.values():
+            state[kind['collection']] = [r for r in state[kind['collection']] if self._update_status(r)]
+
+    @staticmethod
+    def _public(resource):
+        return dict((k, copy.deepcopy(v)) for k, v in resource.items() if not k.startswith('_'))
+
+    # Calls
+
+    def wrap(self, sdk):
+        """Returns a replacement for the SDK call function of the CdpcliWrapper, sdk, that answers from the model"""
+        from cdpy.common import CdpWarning
+
+        @wraps(sdk.call)
+        def _call(svc, func, ret_field=None, squelch=None, ret_error=False, **kwargs):
+            try:
+                response = self.call(svc, func, **kwargs)
+                if 'pageSize' not in kwargs and 'startingToken' not in kwargs:
+                    response = self._remaining_pages(svc, func, response, **kwargs)
+            except FakeCallError as e:
+                error = _error(e.status_code, e.error_code, e.message)
+                for rule in squelch or []:
+                    if getattr(error, getattr(rule, 'field', 'error_code'), None) == rule.value:
+                        if getattr(rule, 'warning', None):
+                            sdk.throw_warning(CdpWarning(str(rule.warning)))
+                        return rule.default
+                if ret_error:
+                    return error
+                return sdk.throw_error(error)
+            if ret_field is not None:
+                return response.get(ret_field) if response else None
+            return response
+
+        return _call
+
+    def _remaining_pages(self, svc, func, response, **kwargs):
+        """Merges the remaining pages of a listing into response, as the SDK paginator does"""
+        while response and response.get('nextToken'):
+            page = self.call(svc, func, startingToken=response.pop('nextToken'), **kwargs)
+            for field, value in page.items():
+                if isinstance(value, list):
+                    response.setdefault(field, []).extend(value)
+                else:
+                    response[field] = value
+        return response
+
+    def call(self, svc, func, **kwargs):
+        """Returns the response of the CDP API function, svc.func, or raises FakeCallError"""
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self._random.random() < self.faults.get('throttle', 0):
+            raise FakeCallError('429', 'THROTTLED', 'Rate limit exceeded for %s.%s' % (svc, func))
+        if self._random.random() < self.faults.get('server_error', 0):
+            raise FakeCallError('500', 'INTERNAL_ERROR', 'Internal error in %s.%s' % (svc, func))
+
+        handler = getattr(self, '_%s__%s' % (svc, func), None)
+        if handler is None:
+            raise FakeCallError('501', 'UNIMPLEMENTED', 'The fake backend does not implement %s.%s' % (svc, func))
+        write = not func.startswith(('list_', 'describe_', 'get_'))
+        with self._state(write=write) as state:
+            return handler(state, **kwargs)
+
+    def _page(self, records, field, pageSize=None, startingToken=None, **kwargs):
+        start = int(startingToken or 0)
+        size = pageSize or self.page_size
+        response = {field: [self._public(r) if isinstance(r, dict) else r for r in records[start:start + size]]}
+        if start + size < len(records):
+            response['nextToken'] = str(start + size)
+        return response
+
+    @staticmethod
+    def _find(collection, field, value, kind):
+        for resource in collection:
+            if value is not None and (resource.get(field) == value or resource.get('crn') == value):
+                return resource
+        raise _not_found(kind, value)
+
+    def _create(self, state, kind, resource):
+        spec = KINDS[kind]
+        # Names are unique within an Environment
+        if any(r[spec['name']] == resource[spec['name']] and r.get('environmentCrn') == resource.get('environmentCrn')
+               for r in state[spec['collection']]):
+            raise FakeCallError('409', 'ALREADY_EXISTS', "%s '%s' already exists" % (kind, resource[spec['name']]))
+        resource.setdefault('creationDate', _now())
+        self._transition(resource, kind, 'create')
+        state[spec['collection']].append(resource)
+        return resource
+
+    def _environment(self, state, name):
+        return self._find(state['environments'], 'environmentName', name, 'Environment')
+
+    # Environments
+
+    def _create_environment(self, state, platform, environmentName, credentialName=None, region=None, **kwargs):
+        instances = (kwargs.get('freeIpa') or dict()).get('instanceCountByGroup') or 1
+        environment = dict(
+            environmentName=environmentName, crn=make_crn('environments', 'environment'),
+            credentialName=credentialName, region=region, cloudPlatform=platform,
+            description=kwargs.get('description'), tunnelEnabled=kwargs.get('enableTunnel', False),
+            workloadAnalytics=kwargs.get('workloadAnalytics', True),
+            tags=dict(userDefined=dict((t['key'], t['value']) for t in kwargs.get('tags') or [])),
+            freeipa=dict(crn=make_crn('freeipa', 'freeipa'), domain='%s.cloudera.site' % environmentName,
+                         hostname='ipaserver', serverIP=['10.0.0.%d' % (10 + i) for i in range(instances)]))
+        environment.update(self._environment_details(platform, kwargs))
+        if kwargs.get('proxyConfigName'):
+            environment['proxyConfig'] = dict(proxyConfigName=kwargs['proxyConfigName'])
+        return dict(environment=self._public(self._create(state, 'environment', environment)))
+
+    @staticmethod
+    def _environment_details(platform, request):
+        """Returns the cloud-specific fields of the descriptor of an Environment created with the request"""
+        access = request.get('securityAccess') or dict()
+        fields = ('cidr', 'defaultSecurityGroupId', 'securityGroupIdForKnox')
+        details = dict(securityAccess=dict((k, access.get(k)) for k in fields))
+        storage = request.get('logStorage') or dict()
+        network = request.get('existingNetworkParams') or dict()
+        if platform == 'AWS':
+            auth = request.get('authentication') or dict()
+            details.update(
+                authentication=dict(publicKey=auth.get('publicKey'), publicKeyId=auth.get('publicKeyId')),
+                logStorage=dict(awsDetails=dict(instanceProfile=storage.get('instanceProfile'),
+                                                storageLocationBase=storage.get('storageLocationBase'))),
+                network=dict(networkCidr=request.get('networkCidr'), subnetIds=request.get('subnetIds') or [],
+                             aws=dict(vpcId=request.get('vpcId'))),
+                awsDetails=dict(s3GuardTableName=request.get('s3GuardTableName')))
+        elif platform == 'AZURE':
+            details.update(
+                authentication=dict(publicKey=request.get('publicKey')),
+                logStorage=dict(azureDetails=dict(managedIdentity=storage.get('managedIdentity'),
+                                                  storageLocationBase=storage.get('storageLocationBase'))),
+                network=dict(subnetIds=network.get('subnetIds') or [],
+                             azure=dict(networkId=network.get('networkId'),
+                                        resourceGroupName=network.get('resourceGroupName'),
+                                        usePublicIp=request.get('usePublicIp'))))
+        else:
+            details.update(
+                authentication=dict(publicKey=request.get('publicKey')),
+                logStorage=dict(gcpDetails=dict(serviceAccountEmail=storage.get('serviceAccountEmail'),
+                                                storageLocationBase=storage.get('storageLocationBase'))),
+                network=dict(subnetIds=network.get('subnetNames') or [],
+                             gcp=dict(networkName=network.get('networkName'),
+                                      sharedProjectId=network.get('sharedProjectId'),
+                                      usePublicIp=request.get('usePublicIp'))))
+        return details
+
+    def _environments__create_aws_environment(self, state, **kwargs):
+        return self._create_environment(state, 'AWS', **kwargs)
+
+    def _environments__create_azure_environment(self, state, **kwargs):
+        return self._create_environment(state, 'AZURE', **kwargs)
+
+    def _environments__create_gcp_environment(self, state, **kwargs):
+        return self._create_environment(state, 'GCP', **kwargs)
+
+    def _environments__list_environments(self, state, **kwargs):
+        return self._page(state['environments'], 'environments', **kwargs)
+
+    def _environments__describe_environment(self, state, environmentName=None, **kwargs):
+        return dict(environment=self._public(self._environment(state, environmentName)))
+
+    def _environments__delete_environment(self, state, environmentName=None, cascading=False, **kwargs):
+        env = self._environment(state, environmentName)
+        children = [kind for kind in ('datalake', 'datahub', 'ml', 'dw', 'opdb', 'df')
+                    if any(r.get('environmentCrn') == env['crn'] for r in state[KINDS[kind]['collection']])]
+        if children and not cascading:
+            raise FakeCallError('409', 'FAILED_PRECONDITION', "Environment '%s' has attached services: %s" %
+                                (environmentName, ', '.join(children)))
+        for kind in children:
+            for resource in state[KINDS[kind]['collection']]:
+                if resource.get('environmentCrn') == env['crn']:
+                    self._transition(resource, kind, 'delete')
+        self._transition(env, 'environment', 'delete')
+        return dict()
+
+    def _environments__change_environment_credential(self, state, environmentName=None, credentialName=None,
+                                                     **kwargs):
+        env = self._environment(state, environmentName)
+        env['credentialName'] = credentialName
+        return dict(environment=self._public(env))
+
+    def _environments__update_security_access(self, state, environment=None, defaultSecurityGroupId=None,
+                                              gatewayNodeSecurityGroupId=None, **kwargs):
+        env = self._environment(state, environment)
+        env.setdefault('securityAccess', dict()).update(defaultSecurityGroupId=defaultSecurityGroupId,
+                                                        securityGroupIdForKnox=gatewayNodeSecurityGroupId)
+        return dict()
+
+    def _environments__update_ssh_key(self, state, environment=None, newPublicKey=None, existingPublicKeyId=None,
+                                      **kwargs):
+        env = self._environment(state, environment)
+        env['authentication'] = dict(publicKey=newPublicKey, publicKeyId=existingPublicKeyId)
+        return dict()
+
+    def _environments__update_proxy_config(self, state, environment=None, proxyConfigName=None, removeProxy=False,
+                                           **kwargs):
+        env = self._environment(state, environment)
+        if removeProxy:
+            env.pop('proxyConfig', None)
+        else:
+            env['proxyConfig'] = dict(proxyConfigName=proxyConfigName)
+        return dict()
+
+    def _environments__set_telemetry_features(self, state, environmentName=None, workloadAnalytics=None, **kwargs):
+        env = self._environment(state, environmentName)
+        if workloadAnalytics is not None:
+            env['workloadAnalytics'] = workloadAnalytics
+        return dict()
+
+    def _environments__start_environment(self, state, environmentName=None, **kwargs):
+        self._transition(self._environment(state, environmentName), 'environment', 'start')
+        return dict()
+
+    def _environments__stop_environment(self, state, environmentName=None, **kwargs):
+        self._transition(self._environment(state, environmentName), 'environment', 'stop')
+        return dict()
+
+    def _environments__get_keytab(self, state, environmentName=None, actorCrn=None, **kwargs):
+        self._environment(state, environmentName)
+        digest = hashlib.sha256(('%s/%s' % (environmentName, actorCrn)).encode('utf-8')).digest()
+        return dict(contents=base64.b64encode(digest).decode('ascii'))
+
+    def _environments__get_root_certificate(self, state, environmentName=None, **kwargs):
+        env = self._environment(state, environmentName)
+        return dict(contents='-----BEGIN CERTIFICATE-----\n%s\n-----END CERTIFICATE-----' %
+                             base64.b64encode(env['crn'].encode('utf-8')).decode('ascii'))
+
+    def _environments__get_freeipa_status(self, state, environmentName=None, **kwargs):
+        env = self._environment(state, environmentName)
+        return dict(environmentName=env['environmentName'], crn=env['freeipa']['crn'], status='AVAILABLE')
+
+    def _environments__get_id_broker_mappings(self, state, environmentName=None, **kwargs):
+        env = self._environment(state, environmentName)
+        mappings = env.get('_idbroker', dict(mappingsVersion=0, mappings=[]))
+        return dict(copy.deepcopy(mappings), baselineRole=None)
+
+    def _environments__set_id_broker_mappings(self, state, environmentName=None, setEmptyMappings=False, **kwargs):
+        env = self._environment(state, environmentName)
+        mappings = env.get('_idbroker', dict(mappingsVersion=0, mappings=[]))
+        for field in ('dataAccessRole', 'rangerAuditRole', 'rangerCloudAccessAuthorizerRole', 'mappings'):
+            if field in kwargs:
+                mappings[field] = copy.deepcopy(kwargs[field])
+        if setEmptyMappings:
+            mappings['mappings'] = []
+        mappings['mappingsVersion'] += 1
+        env['_idbroker'] = mappings
+        env['_idbroker_synced'] = False
+        return dict(copy.deepcopy(mappings))
+
+    def _environments__sync_id_broker_mappings(self, state, environmentName=None, **kwargs):
+        self._environment(state, environmentName)['_idbroker_synced'] = True
+        return dict()
+
+    def _environments__get_id_broker_mappings_sync_status(self, state, environmentName=None, **kwargs):
+        synced = self._environment(state, environmentName).get('_idbroker_synced', True)
+        return dict(syncNeeded=not synced, globalStatus=dict(status='COMPLETED' if synced else 'NEVER_RUN'),
+                    statuses=dict())
+
+    # Datalakes
+
+    def _create_datalake(self, state, platform, datalakeName, environmentName=None, **kwargs):
+        env = self._environment(state, environmentName)
+        return dict(datalake=self._public(self._create(state, 'datalake', dict(
+            datalakeName=datalakeName, crn=make_crn('datalake', 'datalake'), environmentCrn=env['crn'],
+            environmentName=env['environmentName'], cloudPlatform=platform,
+            instanceGroups=_instance_groups(datalakeName, env['freeipa']['domain'], DATALAKE_GROUPS),
+            productVersions=[dict(name='CDH', version=kwargs.get('runtime') or '7.2.12')]))))
+
+    def _datalake__create_aws_datalake(self, state, **kwargs):
+        return self._create_datalake(state, 'AWS', **kwargs)
+
+    def _datalake__create_azure_datalake(self, state, **kwargs):
+        return self._create_datalake(state, 'AZURE', **kwargs)
+
+    def _datalake__create_gcp_datalake(self, state, **kwargs):
+        return self._create_datalake(state, 'GCP', **kwargs)
+
+    def _datalake__list_datalakes(self, state, environmentName=None, **kwargs):
+        datalakes = [d for d in state['datalakes']
+                     if environmentName is None or environmentName in (d['environmentName'], d['environmentCrn'])]
+        return self._page(datalakes, 'datalakes', **kwargs)
+
+    def _datalake__describe_datalake(self, state, datalakeName=None, **kwargs):
+        return dict(datalakeDetails=self._public(self._find(state['datalakes'], 'datalakeName', datalakeName,
+                                                            'Datalake')))
+
+    def _datalake__delete_datalake(self, state, datalakeName=None, **kwargs):
+        self._transition(self._find(state['datalakes'], 'datalakeName', datalakeName, 'Datalake'), 'datalake',
+                         'delete')
+        return dict()
+
+    def _datalake__list_runtimes(self, state, **kwargs):
+        return dict(versions=copy.deepcopy(state['runtimes']))
+
+    # Datahubs
+
+    def _create_datahub(self, state, platform, clusterName, environmentName=None, **kwargs):
+        env = self._environment(state, environmentName)
+        return dict(cluster=self._public(self._create(state, 'datahub', dict(
+            clusterName=clusterName, crn=make_crn('datahub', 'cluster'), environmentCrn=env['crn'],
+            environmentName=env['environmentName'], cloudPlatform=platform,
+            workloadType=kwargs.get('clusterTemplateName') or kwargs.get('clusterDefinitionName'),
+            nodeCount=4, instanceGroups=_instance_groups(clusterName, env['freeipa']['domain'], DATAHUB_GROUPS)))))
+
+    def _datahub__create_aws_cluster(self, state, **kwargs):
+        return self._create_datahub(state, 'AWS', **kwargs)
+
+    def _datahub__create_azure_cluster(self, state, **kwargs):
+        return self._create_datahub(state, 'AZURE', **kwargs)
+
+    def _datahub__create_gcp_cluster(self, state, **kwargs):
+        return self._create_datahub(state, 'GCP', **kwargs)
+
+    def _datahub__list_clusters(self, state, environmentName=None, **kwargs):
+        clusters = [c for c in state['datahubs']
+                    if environmentName is None or environmentName in (c['environmentName'], c['environmentCrn'])]
+        return self._page(clusters, 'clusters', **kwargs)
+
+    def _datahub__describe_cluster(self, state, clusterName=None, **kwargs):
+        return dict(cluster=self._public(self._find(state['datahubs'], 'clusterName', clusterName, 'Datahub')))
+
+    def _datahub__delete_cluster(self, state, clusterName=None, **kwargs):
+        self._transition(self._find(state['datahubs'], 'clusterName', clusterName, 'Datahub'), 'datahub', 'delete')
+        return dict()
+
+    def _datahub__start_cluster(self, state, clusterName=None, **kwargs):
+        self._transition(self._find(state['datahubs'], 'clusterName', clusterName, 'Datahub'), 'datahub', 'start')
+        return dict()
+
+    def _datahub__stop_cluster(self, state, clusterName=None, **kwargs):
+        self._transition(self._find(state['datahubs'], 'clusterName', clusterName, 'Datahub'), 'datahub', 'stop')
+        return dict()
+
+    def _datahub__list_cluster_templates(self, state, **kwargs):
+        return self._page([dict((k, v) for k, v in t.items() if k != 'clusterTemplateContent')
+                           for t in state['templates']], 'clusterTemplates', **kwargs)
+
+    def _datahub__describe_cluster_template(self, state, clusterTemplateName=None, **kwargs):
+        return dict(clusterTemplate=self._public(self._find(state['templates'], 'clusterTemplateName',
+                                                            clusterTemplateName, 'Cluster Template')))
+
+    def _datahub__list_cluster_definitions(self, state, **kwargs):
+        return self._page([dict((k, v) for k, v in d.items() if k != 'workloadTemplate')
+                           for d in state['definitions']], 'clusterDefinitions', **kwargs)
+
+    def _datahub__describe_cluster_definition(self, state, clusterDefinitionName=None, **kwargs):
+        return dict(clusterDefinition=self._public(self._find(state['definitions'], 'clusterDefinitionName',
+                                                              clusterDefinitionName, 'Cluster Definition')))
+
+    # ML Workspaces
+
+    def _ml__create_workspace(self, state, workspaceName=None, environmentName=None, **kwargs):
+        env = self._environment(state, environmentName)
+        self._create(state, 'ml', dict(
+            instanceName=workspaceName, crn=make_crn('ml', 'workspace'), environmentCrn=env['crn'],
+            environmentName=env['environmentName'], cloudPlatform=env['cloudPlatform'],
+            instanceUrl='https://ml-%s.%s.cloudera.site' % (workspaceName, environmentName),
+            httpsEnabled=True, monitoringEnabled=kwargs.get('enableMonitoring', False)))
+        return dict()
+
+    def _ml__list_workspaces(self, state, **kwargs):
+        return self._page(state['workspaces'], 'workspaces', **kwargs)
+
+    def _ml__describe_workspace(self, state, workspaceName=None, workspaceCrn=None, environmentName=None, **kwargs):
+        workspace = self._find([w for w in state['workspaces']
+                                if environmentName in (None, w['environmentName'], w['environmentCrn'])],
+                               'instanceName', workspaceName or workspaceCrn, 'ML Workspace')
+        return dict(workspace=self._public(workspace))
+
+    def _ml__delete_workspace(self, state, workspaceName=None, workspaceCrn=None, environmentName=None, **kwargs):
+        workspace = self._find([w for w in state['workspaces']
+                                if environmentName in (None, w['environmentName'], w['environmentCrn'])],
+                               'instanceName', workspaceName or workspaceCrn, 'ML Workspace')
+        self._transition(workspace, 'ml', 'delete')
+        return dict()
+
+    # DW Clusters
+
+    def _dw__create_cluster(self, state, environmentCrn=None, **kwargs):
+        env = self._environment(state, environmentCrn)
+        cluster_id = 'env-%s' % uuid.uuid4().hex[:6]
+        self._create(state, 'dw', dict(id=cluster_id, name=env['environmentName'], environmentCrn=env['crn'],
+                                       cloudPlatform=env['cloudPlatform'], creator=state['users'][0]['crn']))
+        return dict(clusterId=cluster_id)
+
+    def _dw__list_clusters(self, state, **kwargs):
+        return self._page(state['dw_clusters'], 'clusters', **kwargs)
+
+    def _dw__describe_cluster(self, state, clusterId=None, **kwargs):
+        return dict(cluster=self._public(self._find(state['dw_clusters'], 'id', clusterId, 'DW Cluster')))
+
+    def _dw__delete_cluster(self, state, clusterId=None, **kwargs):
+        self._transition(self._find(state['dw_clusters'], 'id', clusterId, 'DW Cluster'), 'dw', 'delete')
+        return dict()
+
+    # OpDB Databases
+
+    def _opdb_databases(self, state, environmentName):
+        return [d for d in state['databases'] if environmentName in (d['environmentName'], d['environmentCrn'])]
+
+    def _opdb__create_database(self, state, environmentName=None, databaseName=None, **kwargs):
+        env = self._environment(state, environmentName)
+        database = self._create(state, 'opdb', dict(
+            databaseName=databaseName, crn=make_crn('opdb', 'database'), environmentCrn=env['crn'],
+            environmentName=env['environmentName'], hbaseVersion='2.2.6', storageLocation='s3a://%s' % databaseName))
+        return dict(databaseDetails=self._public(database))
+
+    def _opdb__list_databases(self, state, environmentName=None, **kwargs):
+        return self._page(self._opdb_databases(state, environmentName), 'databases', **kwargs)
+
+    def _opdb__describe_database(self, state, environmentName=None, databaseName=None, **kwargs):
+        return dict(databaseDetails=self._public(self._find(self._opdb_databases(state, environmentName),
+                                                            'databaseName', databaseName, 'OpDB Database')))
+
+    def _opdb__drop_database(self, state, environmentName=None, databaseName=None, **kwargs):
+        self._transition(self._find(self._opdb_databases(state, environmentName), 'databaseName', databaseName,
+                                    'OpDB Database'), 'opdb', 'delete')
+        return dict(status='STOPPING')
+
+    # DF Services
+
+    def _df__enable_service(self, state, environmentCrn=None, **kwargs):
+        env = self._environment(state, environmentCrn)
+        service = self._create(state, 'df', dict(environmentCrn=env['crn'], crn=make_crn('df', 'service'),
+                                                 name=env['environmentName'], cloudPlatform=env['cloudPlatform'],
+                                                 region=env['region']))
+        return dict(service=self._public(service))
+
+    def _df__list_services(self, state, **kwargs):
+        return self._page(state['df_services'], 'services', **kwargs)
+
+    def _df__describe_service(self, state, serviceCrn=None, **kwargs):
+        return dict(service=self._public(self._find(state['df_services'], 'crn', serviceCrn, 'DF Service')))
+
+    def _df__disable_service(self, state, serviceCrn=None, **kwargs):
+        self._transition(self._find(state['df_services'], 'crn', serviceCrn, 'DF Service'), 'df', 'delete')
+        return dict()
+
+    # IAM
+
+    def _iam_user(self, state, user):
+        for record in state['users'] + state['machine_users']:
+            if user in (record['crn'], record.get('userId'), record.get('machineUserName'),
+                        record.get('workloadUsername'), record.get('email')):
+                return record
+        raise _not_found('User', user)
+
+    def _iam_group(self, state, name):
+        for group in state['groups']:
+            if name is not None and (group['crn'] == name or group['groupName'].lower() == name.lower()):
+                return group
+        raise _not_found('Group', name)
+
+    def _iam__get_account(self, state, **kwargs):
+        return dict(account=copy.deepcopy(state['account']))
+
+    def _iam__get_user(self, state, userId=None, **kwargs):
+        return dict(user=self._public(self._iam_user(state, userId) if userId else state['users'][0]))
+
+    def _iam__list_users(self, state, userIds=None, **kwargs):
+        users = [self._iam_user(state, u) for u in userIds] if userIds else state['users']
+        return self._page(users, 'users', **kwargs)
+
+    def _iam__list_machine_users(self, state, machineUserNames=None, **kwargs):
+        users = [self._iam_user(state, u) for u in machineUserNames] if machineUserNames else state['machine_users']
+        return self._page(users, 'machineUsers', **kwargs)
+
+    def _iam__list_groups(self, state, groupNames=None, **kwargs):
+        groups = [self._iam_group(state, g) for g in groupNames] if groupNames else state['groups']
+        return self._page(groups, 'groups', **kwargs)
+
+    def _iam__create_group(self, state, groupName=None, syncMembershipOnUserLogin=True, **kwargs):
+        if any(g['groupName'].lower() == groupName.lower() for g in state['groups']):
+            raise FakeCallError('409', 'ALREADY_EXISTS', "Group '%s' already exists" % groupName)
+        group = dict(groupName=groupName, crn=make_crn('iam', 'group', groupName), creationDate=_now(),
+                     syncMembershipOnUserLogin=syncMembershipOnUserLogin, _members=[], _roles=[],
+                     _resource_roles=[])
+        state['groups'].append(group)
+        return dict(group=self._public(group))
+
+    def _iam__update_group(self, state, groupName=None, syncMembershipOnUserLogin=None, **kwargs):
+        group = self._iam_group(state, groupName)
+        if syncMembershipOnUserLogin is not None:
+            group['syncMembershipOnUserLogin'] = syncMembershipOnUserLogin
+        return dict(group=self._public(group))
+
+    def _iam__delete_group(self, state, groupName=None, **kwargs):
+        state['groups'].remove(self._iam_group(state, groupName))
+        return dict()
+
+    def _iam__add_user_to_group(self, state, groupName=None, userId=None, **kwargs):
+        group = self._iam_group(state, groupName)
+        user = self._iam_user(state, userId)
+        if user['crn'] not in group['_members']:
+            group['_members'].append(user['crn'])
+        return dict()
+
+    def _iam__add_machine_user_to_group(self, state, groupName=None, machineUserName=None, **kwargs):
+        return self._iam__add_user_to_group(state, groupName=groupName, userId=machineUserName)
+
+    def _iam__remove_user_from_group(self, state, groupName=None, userId=None, **kwargs):
+        group = self._iam_group(state, groupName)
+        user = self._iam_user(state, userId)
+        if user['crn'] in group['_members']:
+            group['_members'].remove(user['crn'])
+        return dict()
+
+    def _iam__remove_machine_user_from_group(self, state, groupName=None, machineUserName=None, **kwargs):
+        return self._iam__remove_user_from_group(state, groupName=groupName, userId=machineUserName)
+
+    def _iam__list_group_members(self, state, groupName=None, **kwargs):
+        return self._page(self._iam_group(state, groupName)['_members'], 'memberCrns', **kwargs)
+
+    def _iam__assign_group_role(self, state, groupName=None, role=None, **kwargs):
+        group = self._iam_group(state, groupName)
+        if role not in group['_roles']:
+            group['_roles'].append(role)
+        return dict()
+
+    def _iam__unassign_group_role(self, state, groupName=None, role=None, **kwargs):
+        group = self._iam_group(state, groupName)
+        if role in group['_roles']:
+            group['_roles'].remove(role)
+        return dict()
+
+    def _iam__list_group_assigned_roles(self, state, groupName=None, **kwargs):
+        return dict(roleCrns=list(self._iam_group(state, groupName)['_roles']))
+
+    def _iam__assign_group_resource_role(self, state, groupName=None, resourceCrn=None, resourceRoleCrn=None,
+                                         **kwargs):
+        group = self._iam_group(state, groupName)
+        assignment = dict(resourceCrn=resourceCrn, resourceRoleCrn=resourceRoleCrn)
+        if assignment not in group['_resource_roles']:
+            group['_resource_roles'].append(assignment)
+        return dict()
+
+    def _iam__unassign_group_resource_role(self, state, groupName=None, resourceCrn=None, resourceRoleCrn=None,
+                                           **kwargs):
+        group = self._iam_group(state, groupName)
+        assignment = dict(resourceCrn=resourceCrn, resourceRoleCrn=resourceRoleCrn)
+        if assignment in group['_resource_roles']:
+            group['_resource_roles'].remove(assignment)
+        return dict()
+
+    def _iam__list_group_assigned_resource_roles(self, state, groupName=None, **kwargs):
+        return dict(resourceAssignments=copy.deepcopy(self._iam_group(state, groupName)['_resource_roles']))
+
+    def _iam__list_resource_roles(self, state, resourceRoleNames=None, **kwargs):
+        roles = [r for r in state['resource_roles'] if not resourceRoleNames or r['crn'] in resourceRoleNames]
+        return self._page(roles, 'resourceRoles', **kwargs)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A streaming record filter for the listing modules of the Cloudera CDP Collection
+
+Records are read page by page from a CDP listing call and evaluated in a single pass: exact-match criteria are
+checked against hash sets before any (pre-compiled) regular expression, evaluation short-circuits, and each record
+is emitted at most once.
+"""
+
+import json
+import os
+import re
+import tempfile
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# The page size of streamed listings if the module sets none; without a page size, the SDK requests every page before
+# returning any record
+STREAM_PAGE_SIZE = 100
+
+
+def iterate_pages(sdk, svc, func, field, page_size=None, **kwargs):
+    """
+    Yields the records of field from each page of a CDP listing call, as a list per page, requesting the next page
+    only when the previous page has been consumed.
+    """
+    token = None
+    while True:
+        params = dict(kwargs)
+        if page_size:
+            params.update(pageSize=page_size)
+        if token:
+            params.update(startingToken=token)
+        response = sdk.call(svc, func, **params)
+        if not response:
+            return
+        yield response.get(field, [])
+        token = response.get('nextToken')
+        if not token:
+            return
+
+
+def iterate_records(sdk, svc, func, field, page_size=None, **kwargs):
+    """Yields each record of field from the pages of a CDP listing call; see iterate_pages"""
+    for page in iterate_pages(sdk, svc, func, field, page_size=page_size, **kwargs):
+        for record in page:
+            yield record
+
+
+def write_ndjson(path, records):
+    """
+    Writes each record as a line of JSON to path, replacing the file only once all records are written.
+    Returns the number of records written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.%s.' % os.path.basename(path))
+    count = 0
+    try:
+        with os.fdopen(fd, 'w') as output:
+            for record in records:
+                output.write(json.dumps(record, default=str))
+                output.write('\n')
+                count += 1
+        os.rename(temp_path, path)
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    return count
+
+
+def project(record, fields):
+    """Returns the record reduced to fields, or the full record if fields is not set"""
+    if not fields:
+        return record
+    return dict((f, record[f]) for f in fields if f in record)
+
+
+class RecordFilter(object):
+    """
+    Matches records against regular expression criteria, as {field: pattern}, and exact-match criteria, as
+    {field: [value, ...]}. In 'all' mode every criterion must match, in 'any' mode at least one. A record without the
+    field of a criterion does not match that criterion.
+    """
+
+    def __init__(self, patterns=None, exact=None, mode='all'):
+        if mode not in ('all', 'any'):
+            raise ValueError("Unknown filter mode '%s'" % mode)
+        self.mode = mode
+        self.exact = [(field, frozenset(values if isinstance(values, list) else [values]))
+                      for field, values in (exact or {}).items()]
+        self.patterns = [(field, re.compile(pattern)) for field, pattern in (patterns or {}).items()]
+
+    def __bool__(self):
+        return bool(self.exact or self.patterns)
+
+    __nonzero__ = __bool__
+
+    @staticmethod
+    def _exact(value, values):
+        try:
+            return value in values
+        except TypeError:
+            # Unhashable values, i.e. lists and dicts, match no exact value
+            return False
+
+    def _criteria(self, record):
+        for field, values in self.exact:
+            yield field in record and self._exact(record[field], values)
+        for field, pattern in self.patterns:
+            yield record.get(field) is not None and pattern.search(str(record[field])) is not None
+
+    def matches(self, record):
+        if not self:
+            return True
+        if self.mode == 'any':
+            return any(self._criteria(record))
+        return all(self._criteria(record))
+
+    def apply(self, records, key='crn', fields=None):
+        """Yields each matching record once, identified by key, projected to fields"""
+        seen = set()
+        for record in records:
+            identity = record.get(key)
+            if identity is not None:
+                if identity in seen:
+                    continue
+                seen.add(identity)
+            if self.matches(record):
+                yield project(record, fields)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+IAM Group reconciliation for the Cloudera CDP Collection
+
+The desired members, roles and resource roles of a group are compared to its current state as sets, producing a
+plan of mutations that are then applied by a bounded, rate-limited pool of workers.
+"""
+
+import threading
+import time
+
+from collections import namedtuple
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_filter import iterate_records
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# A single change to a group; action is the name of the CDPy IAM function and args its arguments after the group
+GroupMutation = namedtuple('GroupMutation', ['group', 'action', 'args'])
+
+
+def plan_group_mutations(name, existing, users=None, roles=None, resource_roles=None, purge=False):
+    """
+    Returns the list of GroupMutation needed to move the group, name, from its existing state (a gathered group
+    descriptor, or None if the group is to be created) to the desired users (as CRNs), roles and resource roles
+    (as dicts of 'resource' and 'role'). A desired value of None leaves that aspect of the group unchanged; purge
+    removes any current value not desired.
+    """
+    mutations = []
+    existing = existing or dict(users=[], roles=[], resource_roles=[])
+
+    if users is not None:
+        current = set(existing['users'])
+        desired = set(users)
+        mutations.extend(GroupMutation(name, 'add_group_user', (u,)) for u in users if u not in current)
+        if purge:
+            mutations.extend(GroupMutation(name, 'remove_group_user', (u,))
+                             for u in existing['users'] if u not in desired)
+
+    if roles is not None:
+        current = set(existing['roles'])
+        desired = set(roles)
+        mutations.extend(GroupMutation(name, 'assign_group_role', (r,)) for r in roles if r not in current)
+        if purge:
+            mutations.extend(GroupMutation(name, 'unassign_group_role', (r,))
+                             for r in existing['roles'] if r not in desired)
+
+    if resource_roles is not None:
+        current = set((a['resourceCrn'], a['resourceRoleCrn']) for a in existing['resource_roles'])
+        desired = set((a['resource'], a['role']) for a in resource_roles)
+        mutations.extend(GroupMutation(name, 'assign_group_resource_role', (a['resource'], a['role']))
+                         for a in resource_roles if (a['resource'], a['role']) not in current)
+        if purge:
+            mutations.extend(GroupMutation(name, 'unassign_group_resource_role',
+                                           (a['resourceCrn'], a['resourceRoleCrn']))
+                             for a in existing['resource_roles']
+                             if (a['resourceCrn'], a['resourceRoleCrn']) not in desired)
+
+    # Drop duplicate requests while keeping the plan order
+    planned = []
+    seen = set()
+    for mutation in mutations:
+        if mutation not in seen:
+            seen.add(mutation)
+            planned.append(mutation)
+    return planned
+
+
+def index_users(client, page_size=None):
+    """
+    Returns a dict mapping the CRN, identifier, name and workload username of every user and machine user of the
+    account to its CRN, built from a single listing of each.
+    """
+    index = dict()
+    for user in iterate_records(client.sdk, 'iam', 'list_users', 'users', page_size=page_size):
+        for key in ('crn', 'userId', 'email', 'workloadUsername'):
+            if user.get(key):
+                index.setdefault(user[key], user['crn'])
+    for user in iterate_records(client.sdk, 'iam', 'list_machine_users', 'machineUsers', page_size=page_size):
+        for key in ('crn', 'machineUserId', 'machineUserName', 'workloadUsername'):
+            if user.get(key):
+                index.setdefault(user[key], user['crn'])
+    return index
+
+
+class RateLimiter(object):
+    """Spaces calls, across all threads, to at most rate per second; a rate of None or 0 is unlimited."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.time()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def apply_group_mutations(cdp_module, mutations, parallelism=1, rate=None, retries=0):
+    """
+    Applies the mutations using the worker pool of the CdpModule, cdp_module, at no more than rate calls per second.
+    Returns a list of failures, each a dict of the group, action, arguments and error of the failed mutation.
+    """
+    limiter = RateLimiter(rate)
+
+    def _apply(client, mutation):
+        limiter.acquire()
+        return getattr(client.iam, mutation.action)(mutation.group, *mutation.args)
+
+    results = cdp_module._parallel_map(_apply, mutations, parallelism, retries=retries)
+    return [dict(group=m.group, action=m.action, args=list(m.args), error=cdp_module._error_message(error))
+            for m, (result, error) in zip(mutations, results) if error is not None]
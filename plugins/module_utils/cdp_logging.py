@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bounded, structured capture of the CDP SDK debug log for the Cloudera CDP Collection
+
+Log records are kept as timestamped records in a ring buffer, limited by count and by total message size, so that
+long-running modules do not accumulate an unbounded log. Every record can also be written, as a line of JSON, to a
+spill file.
+"""
+
+import datetime
+import json
+import logging
+import time
+
+from collections import deque
+from functools import wraps
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# The loggers of the CDP SDK and its HTTP stack; their levels are set to the capture level
+SDK_LOGGERS = ['cdpcli', 'cdpy', 'botocore', 'urllib3']
+
+# The logger for the request and response records of each SDK call
+CALL_LOGGER = 'cloudera.cloud.sdk'
+
+
+class CdpLogBuffer(logging.Handler):
+    """A logging handler that keeps the most recent records, up to max_records and max_bytes of messages."""
+
+    def __init__(self, level=logging.DEBUG, max_records=1000, max_bytes=1024 * 1024, spill_path=None):
+        super(CdpLogBuffer, self).__init__(level)
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._records = deque(maxlen=max_records)
+        self._size = 0
+        self._spill = open(spill_path, 'a') if spill_path else None
+        self._levels = None
+
+    def emit(self, record):
+        try:
+            entry = dict(
+                time=datetime.datetime.utcfromtimestamp(record.created).isoformat() + 'Z',
+                level=record.levelname,
+                logger=record.name,
+                thread=record.threadName,
+                message=record.getMessage()
+            )
+        except Exception:
+            self.handleError(record)
+            return
+
+        self.acquire()
+        try:
+            if self._spill is not None:
+                self._spill.write(json.dumps(entry, default=str) + '\n')
+            if len(self._records) == self._records.maxlen:
+                self._evict()
+            self._records.append(entry)
+            self._size += len(entry['message'])
+            while self._size > self.max_bytes and len(self._records) > 1:
+                self._evict()
+        finally:
+            self.release()
+
+    def _evict(self):
+        evicted = self._records.popleft()
+        self._size -= len(evicted['message'])
+        self.dropped += 1
+
+    def flush(self):
+        if self._spill is not None:
+            self._spill.flush()
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        super(CdpLogBuffer, self).close()
+
+    def records(self):
+        self.acquire()
+        try:
+            return list(self._records)
+        finally:
+            self.release()
+
+    def lines(self):
+        """Returns each buffered record as a formatted line, preceded by a note of any dropped records"""
+        lines = ['%(time)s %(level)s %(logger)s [%(thread)s] %(message)s' % r for r in self.records()]
+        if self.dropped:
+            lines.insert(0, '(%s earlier records dropped)' % self.dropped)
+        return lines
+
+    def install(self):
+        """Attaches the buffer to the root logger and sets the SDK loggers to the capture level"""
+        root = logging.getLogger()
+        # The levels in place before the buffer was installed, restored by uninstall()
+        self._levels = dict((name, logging.getLogger(name).level) for name in [None] + SDK_LOGGERS + [CALL_LOGGER])
+        root.addHandler(self)
+        for name in SDK_LOGGERS + [CALL_LOGGER]:
+            logging.getLogger(name).setLevel(self.level)
+        if root.level > self.level or root.level == logging.NOTSET:
+            root.setLevel(self.level)
+        return self
+
+    def uninstall(self):
+        """
+        Detaches the buffer from the root logger, restores the logger levels set by install() and closes the buffer,
+        for processes that outlive the module
+        """
+        logging.getLogger().removeHandler(self)
+        for name, level in (self._levels or dict()).items():
+            logging.getLogger(name).setLevel(level)
+        self._levels = None
+        self.close()
+
+    def wrap(self, sdk):
+        """Returns a replacement for the SDK call function of the CdpcliWrapper, sdk, that logs each call"""
+        call = sdk.call
+        logger = logging.getLogger(CALL_LOGGER)
+
+        @wraps(call)
+        def _call(svc, func, *args, **kwargs):
+            logger.debug('Request %s.%s %s', svc, func, json.dumps(kwargs, default=str, sort_keys=True))
+            start = time.time()
+            try:
+                result = call(svc, func, *args, **kwargs)
+            except BaseException as e:
+                logger.debug('Response %s.%s raised %s after %.3fs', svc, func, type(e).__name__,
+                             time.time() - start)
+                raise
+            logger.debug('Response %s.%s returned %s after %.3fs', svc, func, type(result).__name__,
+                         time.time() - start)
+            return result
+
+        return _call
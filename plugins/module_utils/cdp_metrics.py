@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+CDP SDK call metrics for the Cloudera CDP Collection
+
+When the CDP_METRICS environment variable is set, modules count and time each SDK call, and the time spent
+sleeping while polling, and return the totals in the 'cdp_metrics' field of their results for the
+cloudera.cloud.cdp_metrics callback plugin to aggregate.
+"""
+
+import os
+import threading
+import time
+
+from functools import wraps
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# The result field that carries the metrics of a module execution
+METRICS_FIELD = 'cdp_metrics'
+
+# Upper bounds (in seconds) of the SDK call latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+
+def metrics_enabled():
+    return os.environ.get('CDP_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+
+class CdpMetrics(object):
+    """Collects SDK call counts, latencies and errors, retries, and polling sleeps; safe for concurrent use."""
+
+    def __init__(self):
+        self.calls = dict()
+        self.retries = 0
+        self.sleeps = 0
+        self.sleep_time = 0.0
+        self._lock = threading.Lock()
+
+    def record_call(self, svc, func, duration, error=False):
+        with self._lock:
+            entry = self.calls.setdefault('%s.%s' % (svc, func), dict(
+                count=0, errors=0, time=0.0, buckets=[0] * (len(LATENCY_BUCKETS) + 1)))
+            entry['count'] += 1
+            entry['errors'] += 1 if error else 0
+            entry['time'] += duration
+            entry['buckets'][next((i for i, b in enumerate(LATENCY_BUCKETS) if duration <= b),
+                                  len(LATENCY_BUCKETS))] += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def sleep(self, seconds):
+        """Sleeps for seconds, recording the time as polling time"""
+        start = time.time()
+        time.sleep(seconds)
+        with self._lock:
+            self.sleeps += 1
+            self.sleep_time += time.time() - start
+
+    def as_dict(self):
+        with self._lock:
+            return dict(calls=dict((k, dict(v, buckets=list(v['buckets']))) for k, v in self.calls.items()),
+                        retries=self.retries, sleeps=self.sleeps, sleep_time=self.sleep_time)
+
+    def wrap(self, sdk):
+        """Returns a replacement for the SDK call function of the CdpcliWrapper, sdk, that records each call"""
+        from cdpy.common import CdpError
+
+        call = sdk.call
+
+        @wraps(call)
+        def _call(svc, func, *args, **kwargs):
+            start = time.time()
+            error = True
+            try:
+                result = call(svc, func, *args, **kwargs)
+                error = isinstance(result, CdpError)
+                return result
+            finally:
+                self.record_call(svc, func, time.time() - start, error=error)
+
+        return _call
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Polling strategies for waiting on CDP resource state changes in the Cloudera CDP Collection
+"""
+
+import random
+import time
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# The interval of the 'fixed' polling profile, in seconds, if the module sets no 'delay'
+DEFAULT_DELAY = 15
+
+# Named polling profiles; 'fixed' polls at the module's 'delay' interval
+POLLING_PROFILES = dict(
+    fixed=None,
+    responsive=dict(min_delay=2, max_delay=15, factor=1.5, jitter=0.2),
+    standard=dict(min_delay=5, max_delay=30, factor=1.5, jitter=0.2),
+    provisioning=dict(min_delay=15, max_delay=60, factor=1.5, jitter=0.2),
+)
+
+
+class PollingStrategy(object):
+    """
+    Computes the interval between polls as an exponential backoff, with jitter, bounded by a minimum and maximum
+    interval. The interval returns to the minimum whenever a state transition is observed.
+    """
+
+    def __init__(self, min_delay, max_delay, factor=1.0, jitter=0.0):
+        self.min_delay = min_delay
+        self.max_delay = max(min_delay, max_delay)
+        self.factor = factor
+        self.jitter = jitter
+        self._current = None
+
+    @classmethod
+    def from_profile(cls, profile, delay=DEFAULT_DELAY):
+        """Returns the strategy for a named profile; the 'fixed' profile uses the given delay"""
+        if profile not in POLLING_PROFILES:
+            raise ValueError("Unknown polling profile '%s'" % profile)
+        settings = POLLING_PROFILES[profile]
+        if settings is None:
+            return cls(delay, delay)
+        return cls(**settings)
+
+    def reset(self):
+        self._current = None
+
+    def next_delay(self, transitioned=False):
+        if transitioned or self._current is None:
+            self._current = self.min_delay
+        else:
+            self._current = min(self._current * self.factor, self.max_delay)
+        if self.jitter:
+            return max(0, self._current * random.uniform(1 - self.jitter, 1 + self.jitter))
+        return self._current
+
+
+def field_value(descriptor, field):
+    """Returns the value of field, a key or a list of nested keys, from descriptor or None if not present"""
+    keys = field if isinstance(field, list) else [field]
+    value = descriptor
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def wait_for_state(sdk, describe_func, params, field='status', state=None, timeout=3600, ignore_failures=False,
+                   strategy=None, failure_field='status', sleep=None):
+    """
+    Polls describe_func(**params) until the value of field is in state, or until the descriptor is absent if field
+    is None. Exits immediately with an error if the resource reports one of the SDK failure states, unless
+    ignore_failures is set. Errors and timeouts are reported through the SDK error handler. The optional sleep
+    function replaces time.sleep between polls.
+
+    Returns the final descriptor.
+    """
+    from cdpy.common import CdpError
+
+    states = state if isinstance(state, list) else [state]
+    strategy = strategy or PollingStrategy(15, 15)
+    sleep = sleep or time.sleep
+    failure_field = field if field is not None else failure_field
+    deadline = time.time() + timeout
+    last_status = None
+    current = None
+
+    while True:
+        current = describe_func(**params)
+
+        if field is None:
+            if current is None:
+                return current
+            status = field_value(current, failure_field)
+        else:
+            status = field_value(current, field) if current is not None else None
+            if status in states:
+                return current
+
+        if not ignore_failures and status is not None and status in sdk.FAILED_STATES:
+            sdk.throw_error(CdpError("Function %s with params [%s] returned failure state '%s'" %
+                                     (describe_func.__name__, params, status)))
+            return current
+
+        interval = strategy.next_delay(transitioned=last_status is not None and status != last_status)
+        last_status = status
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        sleep(min(interval, remaining))
+
+    sdk.throw_error(CdpError("Timeout waiting for function %s with params [%s] to return field %s with state %s" %
+                             (describe_func.__name__, params, field, state)))
+    return current
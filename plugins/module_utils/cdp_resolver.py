@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Memoized resolution of CDP resource names to CRNs and descriptors for the Cloudera CDP Collection
+
+Resolutions are memoized for the life of the resolver. CRNs, which do not change for the life of a resource, are
+also written to the on-disk response cache (see cdp_cache.py) for RESOLVER_TTL seconds, or for the number of seconds
+set by the CDP_RESOLVER_TTL environment variable, 0 disabling it. The cache shares them between the lookups of the
+cloudera.cloud.cdp_lookup lookup plugin, which Ansible runs in a separate process for each task. Descriptors, whose
+fields such as the status change, are never written to it, and names that do not resolve are never cached.
+"""
+
+import os
+import sqlite3
+import threading
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_cache import CdpResponseCache
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# The default TTL, in seconds, of the CRNs in the on-disk cache; 0 disables the on-disk cache
+RESOLVER_TTL = 3600
+
+# The resource kinds that can be resolved
+ENVIRONMENT = 'environment'
+DATALAKE = 'datalake'
+DATAHUB = 'datahub'
+KINDS = [ENVIRONMENT, DATALAKE, DATAHUB]
+
+
+def is_crn(value):
+    return isinstance(value, str) and value.startswith('crn:')
+
+
+def resolver_ttl():
+    """Returns the TTL of the on-disk cache for the current process environment"""
+    return int(os.environ.get('CDP_RESOLVER_TTL', RESOLVER_TTL))
+
+
+class CdpResolver(object):
+    """Resolves CDP resource names to descriptors and CRNs using a CDPy client; safe for concurrent use."""
+
+    def __init__(self, client, ttl=None, cache=None):
+        self.client = client
+        self._memo = dict()
+        self._crns = dict()
+        self._lock = threading.Lock()
+        self.cache = cache
+        ttl = resolver_ttl() if ttl is None else ttl
+        if cache is None and ttl:
+            try:
+                self.cache = CdpResponseCache(ttl=ttl)
+            except (OSError, sqlite3.Error):
+                self.cache = None
+
+    def _resolve(self, kind, name, describe, refresh=False):
+        with self._lock:
+            if not refresh and (kind, name) in self._memo:
+                return self._memo[(kind, name)]
+
+        descriptor = describe(name)
+        if descriptor is not None:
+            with self._lock:
+                self._memo[(kind, name)] = descriptor
+        return descriptor
+
+    def describe(self, kind, name, refresh=False):
+        """
+        Returns the descriptor of the resource of kind, by name or CRN, or None if it does not exist. The memoized
+        descriptor is returned unless refresh is set.
+        """
+        if kind == ENVIRONMENT:
+            return self.environment(name, refresh)
+        if kind == DATALAKE:
+            return self.datalake(name, refresh)
+        if kind == DATAHUB:
+            return self.datahub(name, refresh)
+        raise ValueError("Unknown resource kind '%s'" % kind)
+
+    def environment(self, name, refresh=False):
+        """Returns the descriptor of the Environment"""
+        return self._resolve(ENVIRONMENT, name, self.client.environments.describe_environment, refresh)
+
+    def environment_crn(self, name):
+        """Returns the CRN of the Environment; a CRN is returned unchanged"""
+        return self.crn(ENVIRONMENT, name)
+
+    def datalake(self, environment, refresh=False):
+        """Returns the descriptor of the Datalake of the Environment"""
+        def _describe(name):
+            datalakes = self.client.datalake.list_datalakes(name) or []
+            return self.client.datalake.describe_datalake(datalakes[0]['datalakeName']) if datalakes else None
+
+        return self._resolve(DATALAKE, environment, _describe, refresh)
+
+    def datahub(self, name, refresh=False):
+        """Returns the descriptor of the Datahub"""
+        return self._resolve(DATAHUB, name, self.client.datahub.describe_cluster, refresh)
+
+    def crn(self, kind, name):
+        """Returns the CRN of the resource of kind, through the on-disk cache if enabled; a CRN is returned unchanged"""
+        if name is None or is_crn(name):
+            return name
+        with self._lock:
+            if (kind, name) in self._crns:
+                return self._crns[(kind, name)]
+
+        key = self.cache.key('resolver', kind, 'crn', dict(name=name)) if self.cache is not None else None
+        found, crn = self.cache.get(key) if key is not None else (False, None)
+        if not found:
+            descriptor = self.describe(kind, name)
+            crn = descriptor.get('crn') if descriptor is not None else None
+            if crn is not None and key is not None:
+                self.cache.put(key, crn)
+
+        if crn is not None:
+            with self._lock:
+                self._crns[(kind, name)] = crn
+        return crn
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local store of change-detection fingerprints for the stateful modules of the Cloudera CDP Collection
+
+After a run that leaves a resource in its target state, a module records a fingerprint of the resource's listing entry
+(its CRN, status and last-updated fields), a fingerprint of the module's desired-state parameters, and the resource's
+descriptor. On the next run with the same parameters, a single listing call confirms that the resource is unchanged,
+and the module returns the recorded descriptor without describing and reconciling the resource.
+
+The listings of most resource kinds carry no last-updated field, so that their fingerprint is, in effect, the CRN and
+status: changes made outside of the module that leave the status unchanged are not detected. Entries therefore expire
+after a TTL, STATE_TTL seconds by default, after which the next run describes and reconciles the resource.
+
+Entries are keyed by the CDP identity and endpoint, as for the response cache (see cdp_cache.cache_identity), and the
+kind, name and (if given) Environment of the resource. The store is a SQLite database at STATE_PATH, or at the path set
+by the CDP_STATE_PATH environment variable when the store is opened.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_cache import cache_identity
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+STATE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'cloudera.cloud', 'cdp_state.sqlite')
+
+# The default time-to-live (in seconds) of an entry
+STATE_TTL = 3600
+
+# The listing fields, besides the status, that change with the resource
+RESOURCE_FIELDS = ['crn', 'statusReason', 'lastUpdated', 'updated']
+
+# The module parameters that do not describe the desired state of the resource
+IGNORED_PARAMS = ['verify_tls', 'debug', 'debug_level', 'debug_max_lines', 'debug_file', 'strict', 'broker', 'cache',
+                  'cache_ttl', 'fingerprint', 'fingerprint_ttl', 'wait', 'delay', 'timeout', 'polling_profile',
+                  'parallelism']
+
+
+def state_path():
+    """Returns the path of the store for the current process environment"""
+    return os.environ.get('CDP_STATE_PATH', STATE_PATH)
+
+
+def fingerprint(value):
+    """Returns a digest of the JSON form of value"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def resource_fingerprint(listing, status):
+    """Returns the fingerprint of the listing entry of a resource, given the entry's status"""
+    return fingerprint(dict(status=status, **dict((f, listing.get(f)) for f in RESOURCE_FIELDS)))
+
+
+def params_fingerprint(module_name, params):
+    """Returns the fingerprint of the desired-state parameters of the module"""
+    return fingerprint(dict(module=module_name,
+                            params=dict((k, v) for k, v in params.items() if k not in IGNORED_PARAMS)))
+
+
+class CdpStateStore(object):
+    """Fingerprints of the resources last left in their target states, stored in a local SQLite database."""
+
+    def __init__(self, path=None, ttl=STATE_TTL):
+        self.path = path = path or state_path()
+        self.ttl = ttl
+        self._identity = cache_identity()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        os.chmod(path, 0o600)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS fingerprints (key TEXT PRIMARY KEY, resource TEXT NOT NULL, '
+                             'params TEXT NOT NULL, descriptor TEXT NOT NULL, recorded REAL NOT NULL)')
+
+    def key(self, kind, name, environment=None):
+        return fingerprint(dict(identity=self._identity, kind=kind, name=name, environment=environment))
+
+    def get(self, kind, name, environment=None):
+        """Returns the fingerprints and descriptor recorded for the resource, or None if there are none or expired"""
+        try:
+            with self._lock:
+                row = self._db.execute('SELECT resource, params, descriptor, recorded FROM fingerprints WHERE key = ?',
+                                       (self.key(kind, name, environment),)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or (self.ttl and time.time() - row[3] > self.ttl):
+            return None
+        return dict(resource=row[0], params=row[1], descriptor=json.loads(row[2]), recorded=row[3])
+
+    def put(self, kind, name, resource, params, descriptor, environment=None):
+        """Records the fingerprints and descriptor of the resource; a store that cannot be written is ignored"""
+        try:
+            with self._lock, self._db:
+                self._db.execute('INSERT OR REPLACE INTO fingerprints (key, resource, params, descriptor, recorded) '
+                                 'VALUES (?, ?, ?, ?, ?)', (self.key(kind, name, environment), resource, params,
+                                                            json.dumps(descriptor, default=str), time.time()))
+        except sqlite3.Error:
+            pass
+
+    def forget(self, kind, name, environment=None):
+        """Removes the entry of the resource"""
+        try:
+            with self._lock, self._db:
+                self._db.execute('DELETE FROM fingerprints WHERE key = ?', (self.key(kind, name, environment),))
+        except sqlite3.Error:
+            pass
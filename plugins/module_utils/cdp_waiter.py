@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A multi-resource waiter for the Cloudera CDP Collection
+
+Rather than describing each resource, the waiter polls each resource kind with a single listing call per interval
+and evaluates every waited-upon resource against the result. Listings that the API filters by Environment (Datalakes,
+Datahubs and OpDB) are made per Environment; otherwise, resources are matched to their Environment by the fields of
+their listing entries, so that resources of the same name in different Environments are told apart. Where the entries
+identify their Environment only by CRN (DW Clusters), an Environment given by name is resolved with the listing of
+Environments.
+
+Modules that start a change without waiting for it return a job handle (see job_handle), which records the resource,
+its target state and the start time, so that the cloudera.cloud.cdp_job_status module can check many changes at once.
+"""
+
+import time
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import PollingStrategy, field_value
+
+
+__credits__ = ["cleroy@cloudera.com"]
+__maintainer__ = [
+    "dchaffelson@cloudera.com",
+    "wmudge@cloudera.com"
+]
+
+# The state that signals removal of a resource
+ABSENT = 'absent'
+
+
+def _list_environments(client, environment):
+    return client.environments.list_environments()
+
+
+def _list_datalakes(client, environment):
+    return client.sdk.call('datalake', 'list_datalakes', ret_field='datalakes', environmentName=environment)
+
+
+def _list_datahubs(client, environment):
+    return client.sdk.call('datahub', 'list_clusters', ret_field='clusters', environmentName=environment)
+
+
+def _list_ml_workspaces(client, environment):
+    return client.sdk.call('ml', 'list_workspaces', ret_field='workspaces')
+
+
+def _list_dw_clusters(client, environment):
+    return client.dw.list_clusters()
+
+
+def _list_opdb_databases(client, environment):
+    return client.sdk.call('opdb', 'list_databases', ret_field='databases', environmentName=environment)
+
+
+def _list_df_services(client, environment):
+    return client.sdk.call('df', 'list_services', ret_field='services')
+
+
+# For each kind of resource: the listing function, whether the listing is scoped to an Environment, the descriptor
+# fields that identify the resource, the descriptor fields that identify its Environment in an unscoped listing, the
+# status field, and the default target state
+RESOURCE_KINDS = dict(
+    env=dict(lister=_list_environments, scoped=False, keys=['environmentName', 'crn'], environment=[],
+             status='status', target='AVAILABLE'),
+    datalake=dict(lister=_list_datalakes, scoped=True, keys=['datalakeName', 'crn'], environment=[],
+                  status='status', target='RUNNING'),
+    datahub=dict(lister=_list_datahubs, scoped=True, keys=['clusterName', 'crn'], environment=[],
+                 status='status', target='AVAILABLE'),
+    ml=dict(lister=_list_ml_workspaces, scoped=False, keys=['instanceName', 'crn'],
+            environment=['environmentName', 'environmentCrn'], status='instanceStatus',
+            target='installation:finished'),
+    dw=dict(lister=_list_dw_clusters, scoped=False, keys=['id', 'name', 'crn'], environment=['environmentCrn'],
+            status='status', target='Running'),
+    opdb=dict(lister=_list_opdb_databases, scoped=True, keys=['databaseName', 'crn'], environment=[],
+              status='status', target='AVAILABLE'),
+    df=dict(lister=_list_df_services, scoped=False, keys=['environmentCrn', 'crn', 'name'], environment=[],
+            status=['status', 'state'], target='GOOD_HEALTH'),
+)
+
+
+def _matches(kind, descriptor, name, environment=None):
+    """
+    Returns True if the listing entry is the resource of kind with the name or CRN, in the Environment if given, as
+    a name or CRN or as a set of both
+    """
+    spec = RESOURCE_KINDS[kind]
+    if not any(descriptor.get(k) == name for k in spec['keys']):
+        return False
+    if environment is None or not spec['environment']:
+        return True
+    identifiers = environment if isinstance(environment, set) else set([environment])
+    return any(descriptor.get(f) in identifiers for f in spec['environment'])
+
+
+def _resolves_environment(kind, environment):
+    """Returns True if the Environment, given by name, must be resolved to its CRN to match resources of kind"""
+    fields = RESOURCE_KINDS[kind]['environment']
+    return environment is not None and 'environmentCrn' in fields and 'environmentName' not in fields and \
+        not environment.startswith('crn:')
+
+
+def _environment_identifiers(environment, environments):
+    """Returns the set of the name and CRN of the Environment, by name or CRN, from a listing of Environments"""
+    if environment is None:
+        return None
+    descriptor = next((e for e in environments or [] if _matches('env', e, environment)), None)
+    if descriptor is None:
+        return set([environment])
+    return set([environment, descriptor['environmentName'], descriptor['crn']])
+
+
+def job_handle(kind, name, state=None, environment=None, timeout=None):
+    """Returns a handle for a change of a resource to state, or to the kind's target state, started now"""
+    return dict(kind=kind, name=name, environment=environment, state=state or RESOURCE_KINDS[kind]['target'],
+                started=time.time(), timeout=timeout)
+
+
+def job_status(client, jobs):
+    """
+    Returns the status of each job handle, in order, and the number of listing calls made, with a single listing
+    call per resource kind. A job is 'done' once its resource is ready, reports a failure state, or has exceeded the
+    timeout of the job.
+    """
+    waiter = CdpResourceWaiter(client, [dict(kind=j['kind'], name=j['name'], environment=j.get('environment'),
+                                             state=j.get('state')) for j in jobs])
+    results = waiter.poll()
+    now = time.time()
+    for job, result in zip(jobs, results):
+        elapsed = now - job['started'] if job.get('started') is not None else None
+        timed_out = not result['ready'] and None not in (elapsed, job.get('timeout')) and elapsed > job['timeout']
+        result.update(started=job.get('started'), elapsed=elapsed, timeout=job.get('timeout'), timed_out=timed_out,
+                      done=result['ready'] or result['failed'] or timed_out)
+    return results, waiter.calls
+
+
+def find_resource(client, kind, name, environment=None):
+    """
+    Returns the listing entry of the resource of kind, by name or CRN and in the Environment, by name or CRN, if
+    given, or None if it does not exist
+    """
+    spec = RESOURCE_KINDS[kind]
+    if _resolves_environment(kind, environment):
+        environment = _environment_identifiers(environment, _list_environments(client, None))
+    return next((d for d in spec['lister'](client, environment if spec['scoped'] else None) or []
+                 if _matches(kind, d, name, environment)), None)
+
+
+class CdpResourceWaiter(object):
+    """
+    Waits for a list of CDP resources to reach their target states.
+
+    Each resource is a dict with the keys 'kind' (one of RESOURCE_KINDS), 'name' (name or CRN), and optionally
+    'environment' (required for 'opdb'; tells apart resources of the same name) and 'state' (the target state, or
+    'absent'; defaults to the kind's target). The 'all' condition waits for every resource, the 'any' condition for
+    the first resource. Errors, failure states and timeouts are reported through the SDK error handler of the client.
+    The optional sleep function replaces time.sleep between polls.
+    """
+
+    def __init__(self, client, resources, condition='all', strategy=None, timeout=3600, ignore_failures=False,
+                 sleep=None):
+        self.client = client
+        self.resources = [self._normalize(r) for r in resources]
+        self.condition = condition
+        self.strategy = strategy or PollingStrategy(15, 15)
+        self.timeout = timeout
+        self.ignore_failures = ignore_failures
+        self.sleep = sleep or time.sleep
+        self.calls = 0
+
+    @staticmethod
+    def _normalize(resource):
+        if resource['kind'] not in RESOURCE_KINDS:
+            raise ValueError("Unknown resource kind '%s'" % resource['kind'])
+        normalized = dict(resource)
+        normalized.setdefault('environment', None)
+        if normalized.get('state') is None:
+            normalized['state'] = RESOURCE_KINDS[resource['kind']]['target']
+        return normalized
+
+    def _listings(self):
+        """
+        Issues one listing call per resource kind (and per Environment for scoped kinds), and of Environments if an
+        Environment name must be resolved
+        """
+        scopes = [(r['kind'], r['environment'] if RESOURCE_KINDS[r['kind']]['scoped'] else None)
+                  for r in self.resources]
+        if any(_resolves_environment(r['kind'], r['environment']) for r in self.resources):
+            scopes.append(('env', None))
+        listings = dict()
+        for scope in scopes:
+            if scope not in listings:
+                self.calls += 1
+                listings[scope] = RESOURCE_KINDS[scope[0]]['lister'](self.client, scope[1]) or []
+        return listings
+
+    def poll(self):
+        """Returns the current status of each resource, in order"""
+        listings = self._listings()
+        results = []
+        for resource in self.resources:
+            kind = RESOURCE_KINDS[resource['kind']]
+            scope = (resource['kind'], resource['environment'] if kind['scoped'] else None)
+            environment = resource['environment']
+            if _resolves_environment(resource['kind'], environment):
+                environment = _environment_identifiers(environment, listings[('env', None)])
+            descriptor = next((d for d in listings[scope]
+                               if _matches(resource['kind'], d, resource['name'], environment)), None)
+            status = field_value(descriptor, kind['status']) if descriptor is not None else None
+            if resource['state'] == ABSENT:
+                ready = descriptor is None
+            else:
+                ready = status == resource['state']
+            results.append(dict(kind=resource['kind'], name=resource['name'], environment=resource['environment'],
+                                target=resource['state'], status=status, ready=ready,
+                                failed=status is not None and status in self.client.sdk.FAILED_STATES,
+                                resource=descriptor))
+        return results
+
+    def satisfied(self, results):
+        if self.condition == 'any':
+            return any(r['ready'] for r in results)
+        return all(r['ready'] for r in results)
+
+    def wait(self):
+        """Polls until the condition is satisfied and returns the final status of each resource"""
+        from cdpy.common import CdpError
+
+        deadline = time.time() + self.timeout
+        last = None
+        results = []
+        while True:
+            results = self.poll()
+            if self.satisfied(results):
+                return results
+
+            failed = [r for r in results if r['failed'] and not r['ready']]
+            if failed and not self.ignore_failures and (self.condition == 'all' or len(failed) == len(results)):
+                self.client.sdk.throw_error(CdpError("Resources reported failure states: %s" % ', '.join(
+                    "%s '%s' (%s)" % (r['kind'], r['name'], r['status']) for r in failed)))
+                return results
+
+            current = [r['status'] for r in results]
+            interval = self.strategy.next_delay(transitioned=last is not None and current != last)
+            last = current
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            self.sleep(min(interval, remaining))
+
+        self.client.sdk.throw_error(CdpError("Timeout waiting for resources: %s" % ', '.join(
+            "%s '%s' (%s, expected %s)" % (r['kind'], r['name'], r['status'], r['target'])
+            for r in results if not r['ready'])))
+        return results
@@ -43,9 +43,12 @@ options:
       - debug_cdpsdk
     default: False
     type: bool
+notes:
+  - If I(cache) is enabled, responses are cached for 1 hour unless I(cache_ttl) is set.
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
+  - cloudera.cloud.cdp_cache_options
 '''
 
 EXAMPLES = r'''
@@ -88,6 +91,8 @@ sdk_out_lines:
 
 
 class AccountAuthenticationInfo(CdpModule):
+    CACHE_TTL = 3600
+
     def __init__(self, module):
         super(AccountAuthenticationInfo, self).__init__(module)
 
@@ -104,7 +109,9 @@ class AccountAuthenticationInfo(CdpModule):
 
 def main():
     module = AnsibleModule(
-        argument_spec=CdpModule.argument_spec(),
+        argument_spec=CdpModule.argument_spec(
+            **CdpModule.cache_argument_spec()
+        ),
         supports_check_mode=True
     )
 
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import job_status
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+DOCUMENTATION = r'''
+---
+module: cdp_job_status
+short_description: Check the status of CDP resource changes started without waiting
+description:
+    - Check the job handles returned by the C(env), C(datalake), C(datahub_cluster) and C(ml) modules when they start
+      a change without waiting for it, i.e. with I(wait=no).
+    - Each resource kind is checked with a single listing call, regardless of the number of handles, and the module
+      returns immediately; use C(until) to check the handles again until they are complete.
+author:
+  - "Webster Mudge (@wmudge)"
+  - "Dan Chaffelson (@chaffelson)"
+requirements:
+  - cdpy
+options:
+  jobs:
+    description:
+      - The job handles to check, as returned by the modules in C(job).
+    type: list
+    elements: dict
+    required: True
+    contains:
+      kind:
+        description:
+          - The kind of resource.
+        type: str
+        required: True
+        choices:
+          - env
+          - datalake
+          - datahub
+          - ml
+          - dw
+          - opdb
+          - df
+      name:
+        description:
+          - The name or CRN of the resource.
+          - For C(dw), the cluster identifier. For C(df), the CRN of the Environment.
+        type: str
+        required: True
+      environment:
+        description:
+          - The name of the Environment of the resource.
+          - Required for C(opdb).
+        type: str
+        required: False
+      state:
+        description:
+          - The target state of the resource, or C(absent) if the resource is being removed.
+          - Defaults to the target state of the kind, as for M(cloudera.cloud.cdp_wait).
+        type: str
+        required: False
+      started:
+        description:
+          - The time the change was started, in seconds since the epoch.
+        type: float
+        required: False
+      timeout:
+        description:
+          - The time, in seconds from I(started), after which the change is reported as timed out.
+        type: int
+        required: False
+  ignore_failures:
+    description:
+      - Flag to report, rather than fail upon, jobs whose resources report a failure state or that have timed out.
+    type: bool
+    required: False
+    default: False
+extends_documentation_fragment:
+  - cloudera.cloud.cdp_sdk_options
+  - cloudera.cloud.cdp_auth_options
+'''
+
+EXAMPLES = r'''
+# Note: These examples do not set authentication details.
+
+# Start an Environment for each tenant without waiting, then check them all until they are complete
+- cloudera.cloud.env:
+    name: "{{ item }}-env"
+    cloud: aws
+    credential: "{{ item }}-credential"
+    region: us-east-1
+    log_location: "s3a://{{ item }}-bucket/logs"
+    log_identity: "arn:aws:iam::981304421142:instance-profile/{{ item }}-log-role"
+    public_key_id: example-sshkey
+    network_cidr: 10.10.0.0/16
+    inbound_cidr: 0.0.0.0/0
+    wait: no
+  loop: "{{ tenants }}"
+  register: envs
+
+- cloudera.cloud.cdp_job_status:
+    jobs: "{{ envs.results | selectattr('job', 'defined') | map(attribute='job') | list }}"
+  register: status
+  until: status.complete
+  retries: 120
+  delay: 30
+
+# Check the Environment and Datalake jobs together, reporting rather than failing upon failed jobs
+- cloudera.cloud.cdp_job_status:
+    jobs: "{{ env_jobs + datalake_jobs }}"
+    ignore_failures: yes
+  register: status
+
+- ansible.builtin.debug:
+    msg: "{{ status.jobs | selectattr('failed') | map(attribute='name') | list }}"
+'''
+
+RETURN = r'''
+---
+jobs:
+  description: The status of each of the jobs, in the order requested.
+  type: list
+  returned: always
+  elements: dict
+  contains:
+    kind:
+      description: The kind of resource.
+      returned: always
+      type: str
+      sample: env
+    name:
+      description: The name or CRN of the resource.
+      returned: always
+      type: str
+    environment:
+      description: The Environment of the resource, if known.
+      returned: always
+      type: str
+    target:
+      description: The target state of the resource.
+      returned: always
+      type: str
+      sample: AVAILABLE
+    status:
+      description: The current state of the resource, or null if the resource was not found.
+      returned: always
+      type: str
+      sample: ENVIRONMENT_INITIALIZING
+    ready:
+      description: Flag indicating that the resource achieved its target state.
+      returned: always
+      type: bool
+    failed:
+      description: Flag indicating that the resource reported a failure state.
+      returned: always
+      type: bool
+    timed_out:
+      description: Flag indicating that the job exceeded its timeout before the resource achieved its target state.
+      returned: always
+      type: bool
+    done:
+      description: Flag indicating that the job is ready, failed, or timed out.
+      returned: always
+      type: bool
+    started:
+      description: The time the change was started, in seconds since the epoch.
+      returned: always
+      type: float
+    elapsed:
+      description: The time, in seconds, since the change was started, or null if unknown.
+      returned: always
+      type: float
+    timeout:
+      description: The timeout of the job, in seconds.
+      returned: always
+      type: int
+    resource:
+      description: The listing entry of the resource, or null if the resource was not found.
+      returned: always
+      type: dict
+complete:
+  description: Flag indicating that every job is done.
+  returned: always
+  type: bool
+pending:
+  description: The number of jobs that are not done.
+  returned: always
+  type: int
+calls:
+  description: The number of listing calls made.
+  returned: always
+  type: int
+sdk_out:
+  description: Returns the captured CDP SDK log.
+  returned: when supported
+  type: str
+sdk_out_lines:
+  description: Returns a list of each line of the captured CDP SDK log.
+  returned: when supported
+  type: list
+  elements: str
+'''
+
+
+class CdpJobStatus(CdpModule):
+    def __init__(self, module):
+        super(CdpJobStatus, self).__init__(module)
+
+        # Set variables
+        self.jobs = self._get_param('jobs')
+        self.ignore_failures = self._get_param('ignore_failures')
+
+        # Initialize return values
+        self.results = []
+        self.calls = 0
+
+        # Execute logic process
+        self.process()
+
+    @CdpModule._Decorators.process_debug
+    def process(self):
+        for job in self.jobs:
+            if job['kind'] == 'opdb' and job['environment'] is None:
+                self.module.fail_json(msg="OpDB Database '%s' requires an 'environment'" % job['name'])
+
+        if self.jobs:
+            self.results, self.calls = job_status(self.cdpy, self.jobs)
+
+        failed = [r for r in self.results if not r['ready'] and (r['failed'] or r['timed_out'])]
+        if failed and not self.ignore_failures:
+            self.module.fail_json(msg="Jobs failed or timed out: %s" % ', '.join(
+                "%s '%s' (%s, expected %s)" % (r['kind'], r['name'], r['status'], r['target']) for r in failed),
+                jobs=self.results)
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=CdpModule.argument_spec(
+            jobs=dict(required=True, type='list', elements='dict', options=dict(
+                kind=dict(required=True, type='str',
+                          choices=['env', 'datalake', 'datahub', 'ml', 'dw', 'opdb', 'df']),
+                name=dict(required=True, type='str'),
+                environment=dict(required=False, type='str'),
+                state=dict(required=False, type='str'),
+                started=dict(required=False, type='float'),
+                timeout=dict(required=False, type='int')
+            )),
+            ignore_failures=dict(required=False, type='bool', default=False)
+        ),
+        supports_check_mode=True
+    )
+
+    result = CdpJobStatus(module)
+    pending = len([r for r in result.results if not r['done']])
+    output = dict(changed=False, jobs=result.results, complete=pending == 0, pending=pending, calls=result.calls)
+
+    if result.debug:
+        output.update(sdk_out=result.log_out, sdk_out_lines=result.log_lines)
+
+    module.exit_json(**output)
+
+
+if __name__ == '__main__':
+    main()
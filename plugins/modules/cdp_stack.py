@@ -0,0 +1,507 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_dag import CdpDagNode, CdpDagScheduler, DONE
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import find_resource
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+DOCUMENTATION = r'''
+---
+module: cdp_stack
+short_description: Create a CDP Environment and its services as a single stack
+description:
+  - Create a CDP Credential, Environment, ID Broker mappings, Datalake, Data Hubs, ML Workspaces, OpDB Databases,
+    Data Warehouse cluster and DataFlow service, declared as a single document, in dependency order.
+  - Each resource is created as soon as the resources it depends upon are ready, and independent resources are
+    created and waited upon concurrently. For example, the Data Hubs, ML Workspaces, OpDB Databases, Data Warehouse
+    cluster and DataFlow service are all created once the Datalake is C(RUNNING).
+  - The resources in flight are polled together, with one listing call per resource kind and interval.
+  - Resources that exist are not modified; the module waits for them to reach their target states. The ID Broker
+    mappings are set if they differ.
+  - Services are looked up within the Environment of the stack, so that a service of the same name in another
+    Environment is neither mistaken for it nor waited upon.
+  - If a resource fails, the resources that depend upon it are skipped and the module fails once the other branches
+    of the stack are complete.
+  - The module supports C(check_mode).
+author:
+  - "Webster Mudge (@wmudge)"
+  - "Dan Chaffelson (@chaffelson)"
+requirements:
+  - cdpy
+options:
+  cloud:
+    description:
+      - The cloud platform of the stack, which selects the cloud-specific create requests.
+    type: str
+    required: True
+    choices:
+      - aws
+      - azure
+      - gcp
+  credential:
+    description:
+      - The request to create the Credential of the Environment, e.g. the C(create-aws-credential) request of the CDP
+        CLI, including C(credentialName).
+    type: dict
+    required: False
+  environment:
+    description:
+      - The request to create the Environment, e.g. the C(create-aws-environment) request of the CDP CLI, including
+        C(environmentName).
+    type: dict
+    required: True
+  idbroker:
+    description:
+      - The C(set-id-broker-mappings) request for the Environment, excluding C(environmentName).
+      - The mappings are set before the Datalake is created.
+    type: dict
+    required: False
+  datalake:
+    description:
+      - The request to create the Datalake, e.g. the C(create-aws-datalake) request of the CDP CLI, including
+        C(datalakeName) and excluding C(environmentName).
+    type: dict
+    required: False
+  datahubs:
+    description:
+      - The requests to create the Data Hubs, e.g. the C(create-aws-cluster) requests of the CDP CLI, each including
+        C(clusterName) and excluding C(environmentName).
+    type: list
+    elements: dict
+    required: False
+  ml:
+    description:
+      - The C(create-workspace) requests for the ML Workspaces, each including C(workspaceName) and excluding
+        C(environmentName).
+    type: list
+    elements: dict
+    required: False
+  opdb:
+    description:
+      - The C(create-database) requests for the OpDB Databases, each including C(databaseName) and excluding
+        C(environmentName).
+    type: list
+    elements: dict
+    required: False
+  dw:
+    description:
+      - The C(create-cluster) request for the Data Warehouse cluster of the Environment, excluding
+        C(environmentCrn).
+    type: dict
+    required: False
+  df:
+    description:
+      - The C(enable-service) request for the DataFlow service of the Environment, excluding C(environmentCrn).
+    type: dict
+    required: False
+  parallelism:
+    description:
+      - The maximum number of concurrent create requests.
+    type: int
+    required: False
+    default: 8
+  delay:
+    description:
+      - The internal polling interval (in seconds) while the module waits for the resources to achieve their target
+        states.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
+    type: int
+    required: False
+    aliases:
+      - polling_delay
+  timeout:
+    description:
+      - The internal polling timeout (in seconds) for the entire stack.
+    type: int
+    required: False
+    default: 7200
+    aliases:
+      - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the resources to achieve their target states.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(provisioning).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
+extends_documentation_fragment:
+  - cloudera.cloud.cdp_sdk_options
+  - cloudera.cloud.cdp_auth_options
+'''
+
+EXAMPLES = r'''
+# Note: These examples do not set authentication details.
+
+# Create a tenant: the Environment, its Datalake, then two Data Hubs, an ML Workspace and an OpDB Database together
+- cloudera.cloud.cdp_stack:
+    cloud: aws
+    environment:
+      environmentName: example-env
+      credentialName: example-credential
+      region: us-east-1
+      securityAccess:
+        cidr: 0.0.0.0/0
+      authentication:
+        publicKeyId: example-sshkey
+      logStorage:
+        storageLocationBase: s3a://example-bucket/logs
+        instanceProfile: arn:aws:iam::981304421142:instance-profile/example-log-role
+      networkCidr: 10.10.0.0/16
+    idbroker:
+      dataAccessRole: arn:aws:iam::981304421142:role/example-data-access
+      rangerAuditRole: arn:aws:iam::981304421142:role/example-ranger-audit
+      mappings: []
+      setEmptyMappings: true
+    datalake:
+      datalakeName: example-dl
+      cloudProviderConfiguration:
+        instanceProfile: arn:aws:iam::981304421142:instance-profile/example-idbroker
+        storageBucketLocation: s3a://example-bucket/data
+    datahubs:
+      - clusterName: example-etl
+        clusterDefinitionName: 7.2.12 - Data Engineering for AWS
+      - clusterName: example-mart
+        clusterDefinitionName: 7.2.12 - Data Mart for AWS
+    ml:
+      - workspaceName: example-ml
+        provisionK8sRequest:
+          instanceGroups:
+            - instanceType: m5.2xlarge
+              autoscaling:
+                minInstances: 1
+                maxInstances: 4
+    opdb:
+      - databaseName: example-db
+  register: stack
+
+- ansible.builtin.debug:
+    msg: "{{ stack.resources | map(attribute='id') | zip(stack.resources | map(attribute='elapsed')) | list }}"
+'''
+
+RETURN = r'''
+---
+resources:
+  description: The outcome for each resource of the stack, in dependency order.
+  type: list
+  returned: always
+  elements: dict
+  contains:
+    id:
+      description:
+        - The identifier of the resource in the stack, e.g. C(environment), C(datalake), C(datahub:example-etl).
+      returned: always
+      type: str
+    state:
+      description: The outcome for the resource.
+      returned: always
+      type: str
+      sample: done
+      choices:
+        - done
+        - failed
+        - skipped
+    changed:
+      description: Flag indicating that the resource was created or, for the ID Broker mappings, set.
+      returned: always
+      type: bool
+    status:
+      description: The last observed status of the resource, if waited upon.
+      returned: always
+      type: str
+      sample: RUNNING
+    error:
+      description: The reason the resource failed or was skipped.
+      returned: always
+      type: str
+    depends_on:
+      description: The identifiers of the resources upon which the resource depends.
+      returned: always
+      type: list
+      elements: str
+    elapsed:
+      description: The time, in seconds, from the start of the resource's change to its completion.
+      returned: always
+      type: float
+    resource:
+      description: The listing entry of the resource, if waited upon.
+      returned: always
+      type: dict
+calls:
+  description: The number of listing calls made while waiting.
+  returned: always
+  type: int
+sdk_out:
+  description: Returns the captured CDP SDK log.
+  returned: when supported
+  type: str
+sdk_out_lines:
+  description: Returns a list of each line of the captured CDP SDK log.
+  returned: when supported
+  type: list
+  elements: str
+'''
+
+# The key of the name in the request of each kind of resource
+NAME_KEYS = dict(credential='credentialName', environment='environmentName', datalake='datalakeName',
+                 datahubs='clusterName', ml='workspaceName', opdb='databaseName')
+
+
+def _mappings(mappings):
+    return sorted((m.get('accessorCrn'), m.get('role')) for m in mappings or [])
+
+
+class CdpStack(CdpModule):
+    def __init__(self, module):
+        super(CdpStack, self).__init__(module)
+
+        # Set variables
+        self.cloud = self._get_param('cloud')
+        self.credential = self._get_param('credential')
+        self.environment = self._get_param('environment')
+        self.idbroker = self._get_param('idbroker')
+        self.datalake = self._get_param('datalake')
+        self.datahubs = self._get_param('datahubs') or []
+        self.ml = self._get_param('ml') or []
+        self.opdb = self._get_param('opdb') or []
+        self.dw = self._get_param('dw')
+        self.df = self._get_param('df')
+        self.parallelism = self._get_param('parallelism')
+        self.delay = self._get_param('delay')
+        self.timeout = self._get_param('timeout')
+
+        # Initialize return values
+        self.resources = []
+        self.calls = 0
+
+        # Initialize internal values
+        self.env_name = None
+        self.nodes = dict()
+
+        # Execute logic process
+        self.process()
+
+    @CdpModule._Decorators.process_debug
+    def process(self):
+        self._validate()
+        self.env_name = self.environment['environmentName']
+
+        nodes = self._nodes()
+        self.nodes = dict((n.id, n) for n in nodes)
+        scheduler = CdpDagScheduler(self.cdpy, nodes, self._parallel_map, parallelism=self.parallelism,
+                                    strategy=self._polling_strategy(self.delay), timeout=self.timeout,
+                                    sleep=self._sleep)
+        scheduler.run()
+
+        self.resources = [n.as_dict() for n in nodes]
+        self.calls = scheduler.calls
+        self.changed = any(n.changed for n in nodes)
+
+        incomplete = [n for n in nodes if n.state != DONE]
+        if incomplete:
+            summary = '; '.join('%s %s: %s' % (n.id, n.state, n.error) for n in incomplete)
+            self.module.fail_json(msg="Stack incomplete: %s" % summary,
+                                  changed=self.changed, resources=self.resources, calls=self.calls)
+
+    def _validate(self):
+        for option, key in NAME_KEYS.items():
+            value = self._get_param(option)
+            for request in (value if isinstance(value, list) else [value] if value else []):
+                if not request.get(key):
+                    self.module.fail_json(msg="Each '%s' request requires '%s'" % (option, key))
+
+    def _nodes(self):
+        """Returns the nodes of the stack, with their dependencies"""
+        nodes = []
+        if self.credential:
+            nodes.append(CdpDagNode('credential', self._start_credential))
+        nodes.append(CdpDagNode('environment', self._start_environment,
+                                depends_on=['credential'] if self.credential else []))
+        services = ['environment']
+        if self.idbroker:
+            nodes.append(CdpDagNode('idbroker', self._start_idbroker, depends_on=['environment']))
+            services = ['idbroker']
+        if self.datalake:
+            nodes.append(CdpDagNode('datalake', self._start_datalake, depends_on=services))
+            services = ['datalake']
+
+        for request in self.datahubs:
+            nodes.append(CdpDagNode('datahub:%s' % request['clusterName'], self._start_datahub(request),
+                                    depends_on=services))
+        for request in self.ml:
+            nodes.append(CdpDagNode('ml:%s' % request['workspaceName'], self._start_ml(request), depends_on=services))
+        for request in self.opdb:
+            nodes.append(CdpDagNode('opdb:%s' % request['databaseName'], self._start_opdb(request),
+                                    depends_on=services))
+        if self.dw is not None:
+            nodes.append(CdpDagNode('dw', self._start_dw, depends_on=services))
+        if self.df is not None:
+            nodes.append(CdpDagNode('df', self._start_df, depends_on=services))
+
+        if self.module.check_mode:
+            for node in nodes:
+                node.start = self._check_mode_start(node, node.start)
+        return nodes
+
+    def _check_mode_start(self, node, start):
+        """Returns start for check mode, in which a resource that depends upon one to be created is also created"""
+        def _start(client):
+            if any(self.nodes[d].changed for d in node.depends_on):
+                return True, None
+            return start(client)
+        return _start
+
+    def _environment_crn(self, client):
+        descriptor = self.nodes['environment'].descriptor or find_resource(client, 'env', self.env_name)
+        return descriptor['crn'] if descriptor is not None else None
+
+    def _create(self, existing, create, resource):
+        """Calls create if the resource does not exist; returns the outcome of the node for the resource"""
+        if existing is not None:
+            return False, resource
+        if self.module.check_mode:
+            return True, None
+        create()
+        return True, resource
+
+    # Start functions of the nodes, each called with a worker client
+
+    def _start_credential(self, client):
+        if client.environments.describe_credential(self.credential['credentialName']) is not None:
+            return False, None
+        if not self.module.check_mode:
+            client.sdk.call('environments', 'create_%s_credential' % self.cloud, **self.credential)
+        return True, None
+
+    def _start_environment(self, client):
+        return self._create(
+            find_resource(client, 'env', self.env_name),
+            lambda: client.sdk.call('environments', 'create_%s_environment' % self.cloud, **self.environment),
+            dict(kind='env', name=self.env_name))
+
+    def _start_idbroker(self, client):
+        existing = client.sdk.call('environments', 'get_id_broker_mappings', environmentName=self.env_name) or dict()
+        roles = [k for k in self.idbroker if k not in ('mappings', 'setEmptyMappings')]
+        if all(existing.get(k) == self.idbroker[k] for k in roles) and \
+                _mappings(existing.get('mappings')) == _mappings(self.idbroker.get('mappings')):
+            return False, None
+        if not self.module.check_mode:
+            client.sdk.call('environments', 'set_id_broker_mappings', environmentName=self.env_name, **self.idbroker)
+            # Existing Datalakes only receive changed mappings once synchronized
+            if client.sdk.call('datalake', 'list_datalakes', ret_field='datalakes', environmentName=self.env_name):
+                client.sdk.call('environments', 'sync_id_broker_mappings', environmentName=self.env_name)
+        return True, None
+
+    def _start_datalake(self, client):
+        name = self.datalake['datalakeName']
+        return self._create(
+            find_resource(client, 'datalake', name, self.env_name),
+            lambda: client.sdk.call('datalake', 'create_%s_datalake' % self.cloud, environmentName=self.env_name,
+                                    **self.datalake),
+            dict(kind='datalake', name=name, environment=self.env_name))
+
+    def _start_datahub(self, request):
+        def _start(client):
+            return self._create(
+                find_resource(client, 'datahub', request['clusterName'], self.env_name),
+                lambda: client.sdk.call('datahub', 'create_%s_cluster' % self.cloud, environmentName=self.env_name,
+                                        **request),
+                dict(kind='datahub', name=request['clusterName'], environment=self.env_name))
+        return _start
+
+    def _start_ml(self, request):
+        def _start(client):
+            return self._create(
+                find_resource(client, 'ml', request['workspaceName'], self.env_name),
+                lambda: client.sdk.call('ml', 'create_workspace', environmentName=self.env_name, **request),
+                dict(kind='ml', name=request['workspaceName'], environment=self.env_name))
+        return _start
+
+    def _start_opdb(self, request):
+        def _start(client):
+            return self._create(
+                find_resource(client, 'opdb', request['databaseName'], self.env_name),
+                lambda: client.sdk.call('opdb', 'create_database', environmentName=self.env_name, **request),
+                dict(kind='opdb', name=request['databaseName'], environment=self.env_name))
+        return _start
+
+    def _start_dw(self, client):
+        env_crn = self._environment_crn(client)
+        existing = next((c for c in client.sdk.call('dw', 'list_clusters', ret_field='clusters') or []
+                         if env_crn is not None and c.get('environmentCrn') == env_crn), None)
+        if existing is not None:
+            return False, dict(kind='dw', name=existing['id'])
+        if self.module.check_mode:
+            return True, None
+        cluster_id = client.sdk.call('dw', 'create_cluster', ret_field='clusterId', environmentCrn=env_crn,
+                                     **self.dw)
+        return True, dict(kind='dw', name=cluster_id)
+
+    def _start_df(self, client):
+        env_crn = self._environment_crn(client)
+        return self._create(
+            find_resource(client, 'df', env_crn) if env_crn is not None else None,
+            lambda: client.sdk.call('df', 'enable_service', environmentCrn=env_crn, **self.df),
+            dict(kind='df', name=env_crn))
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=CdpModule.argument_spec(
+            cloud=dict(required=True, type='str', choices=['aws', 'azure', 'gcp']),
+            credential=dict(required=False, type='dict'),
+            environment=dict(required=True, type='dict'),
+            idbroker=dict(required=False, type='dict'),
+            datalake=dict(required=False, type='dict'),
+            datahubs=dict(required=False, type='list', elements='dict'),
+            ml=dict(required=False, type='list', elements='dict'),
+            opdb=dict(required=False, type='list', elements='dict'),
+            dw=dict(required=False, type='dict'),
+            df=dict(required=False, type='dict'),
+            parallelism=dict(required=False, type='int', default=8),
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=7200),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning'])
+        ),
+        supports_check_mode=True
+    )
+
+    result = CdpStack(module)
+    output = dict(changed=result.changed, resources=result.resources, calls=result.calls)
+
+    if result.debug:
+        output.update(sdk_out=result.log_out, sdk_out_lines=result.log_lines)
+
+    module.exit_json(**output)
+
+
+if __name__ == '__main__':
+    main()
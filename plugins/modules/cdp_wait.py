@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import CdpResourceWaiter
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+DOCUMENTATION = r'''
+---
+module: cdp_wait
+short_description: Wait for CDP resources to achieve a declared state
+description:
+    - Wait for one or more CDP resources, of one or more kinds, to achieve their declared states.
+    - Each resource kind is polled with a single listing call per interval, regardless of the number of resources.
+      OpDB Databases are listed once per Environment.
+author:
+  - "Webster Mudge (@wmudge)"
+  - "Dan Chaffelson (@chaffelson)"
+requirements:
+  - cdpy
+options:
+  resources:
+    description:
+      - The resources to wait upon.
+    type: list
+    elements: dict
+    required: True
+    contains:
+      kind:
+        description:
+          - The kind of resource.
+        type: str
+        required: True
+        choices:
+          - env
+          - datalake
+          - datahub
+          - ml
+          - dw
+          - opdb
+          - df
+      name:
+        description:
+          - The name or CRN of the resource.
+          - For C(dw), the cluster identifier. For C(df), the CRN of the Environment.
+        type: str
+        required: True
+      environment:
+        description:
+          - The name or CRN of the Environment of the resource.
+          - Required for C(opdb). For C(datalake), C(datahub), C(ml) and C(dw), distinguishes resources of the same
+            name in different Environments.
+        type: str
+        required: False
+        aliases:
+          - env
+      state:
+        description:
+          - The target state of the resource, or C(absent) to wait for the resource to be removed.
+          - Defaults to C(AVAILABLE) for C(env), C(datahub) and C(opdb), C(RUNNING) for C(datalake),
+            C(installation:finished) for C(ml), C(Running) for C(dw), and C(GOOD_HEALTH) for C(df).
+        type: str
+        required: False
+  condition:
+    description:
+      - Wait for C(all) of the resources, or for C(any) one of the resources, to achieve their declared states.
+    type: str
+    required: False
+    default: all
+    choices:
+      - all
+      - any
+  ignore_failures:
+    description:
+      - Flag to continue waiting if a resource reports a failure state.
+      - If not set, the module fails when a resource reports a failure state, or, if I(condition=any), when all
+        resources report failure states.
+    type: bool
+    required: False
+    default: False
+  delay:
+    description:
+      - The internal polling interval (in seconds) while the module waits for the resources to achieve their declared
+        states.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
+    type: int
+    required: False
+    aliases:
+      - polling_delay
+  timeout:
+    description:
+      - The internal polling timeout (in seconds) while the module waits for the resources to achieve their declared
+        states.
+    type: int
+    required: False
+    default: 3600
+    aliases:
+      - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the resources to achieve their declared states.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(standard).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
+extends_documentation_fragment:
+  - cloudera.cloud.cdp_sdk_options
+  - cloudera.cloud.cdp_auth_options
+'''
+
+EXAMPLES = r'''
+# Note: These examples do not set authentication details.
+
+# Create several Datahubs without waiting, then wait for all of them
+- cloudera.cloud.datahub_cluster:
+    name: "{{ item }}"
+    environment: example-env
+    definition: example-definition
+    wait: no
+  loop:
+    - example-datahub-a
+    - example-datahub-b
+
+- cloudera.cloud.cdp_wait:
+    resources:
+      - kind: datahub
+        name: example-datahub-a
+      - kind: datahub
+        name: example-datahub-b
+
+# Wait for a Datalake and an OpDB Database to be removed
+- cloudera.cloud.cdp_wait:
+    resources:
+      - kind: datalake
+        name: example-datalake
+        state: absent
+      - kind: opdb
+        name: example-database
+        environment: example-env
+        state: absent
+
+# Wait for the first of several ML Workspaces to be ready
+- cloudera.cloud.cdp_wait:
+    resources:
+      - kind: ml
+        name: example-workspace-a
+      - kind: ml
+        name: example-workspace-b
+    condition: any
+'''
+
+RETURN = r'''
+---
+resources:
+  description: The final state of each of the resources, in the order requested.
+  type: list
+  returned: always
+  elements: dict
+  contains:
+    kind:
+      description: The kind of resource.
+      returned: always
+      type: str
+      sample: datahub
+    name:
+      description: The name or CRN of the resource, as requested.
+      returned: always
+      type: str
+    environment:
+      description: The Environment of the resource, if requested.
+      returned: always
+      type: str
+    target:
+      description: The target state of the resource.
+      returned: always
+      type: str
+      sample: AVAILABLE
+    status:
+      description: The last observed state of the resource, or null if the resource was not found.
+      returned: always
+      type: str
+      sample: AVAILABLE
+    ready:
+      description: Flag indicating that the resource achieved its target state.
+      returned: always
+      type: bool
+    failed:
+      description: Flag indicating that the resource reported a failure state.
+      returned: always
+      type: bool
+    resource:
+      description: The listing entry of the resource, or null if the resource was not found.
+      returned: always
+      type: dict
+calls:
+  description: The number of listing calls made while waiting.
+  returned: always
+  type: int
+sdk_out:
+  description: Returns the captured CDP SDK log.
+  returned: when supported
+  type: str
+sdk_out_lines:
+  description: Returns a list of each line of the captured CDP SDK log.
+  returned: when supported
+  type: list
+  elements: str
+'''
+
+
+class CdpWait(CdpModule):
+    POLLING_PROFILE = 'standard'
+
+    def __init__(self, module):
+        super(CdpWait, self).__init__(module)
+
+        # Set variables
+        self.resources = self._get_param('resources')
+        self.condition = self._get_param('condition')
+        self.ignore_failures = self._get_param('ignore_failures')
+        self.delay = self._get_param('delay')
+        self.timeout = self._get_param('timeout')
+
+        # Initialize return values
+        self.results = []
+        self.calls = 0
+
+        # Execute logic process
+        self.process()
+
+    @CdpModule._Decorators.process_debug
+    def process(self):
+        for resource in self.resources:
+            if resource['kind'] == 'opdb' and resource['environment'] is None:
+                self.module.fail_json(msg="OpDB Database '%s' requires an 'environment'" % resource['name'])
+
+        waiter = CdpResourceWaiter(self.cdpy, self.resources, condition=self.condition,
+                                   strategy=self._polling_strategy(self.delay), timeout=self.timeout,
+                                   ignore_failures=self.ignore_failures, sleep=self._sleep)
+        self.results = waiter.wait()
+        self.calls = waiter.calls
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=CdpModule.argument_spec(
+            resources=dict(required=True, type='list', elements='dict', options=dict(
+                kind=dict(required=True, type='str',
+                          choices=['env', 'datalake', 'datahub', 'ml', 'dw', 'opdb', 'df']),
+                name=dict(required=True, type='str'),
+                environment=dict(required=False, type='str', aliases=['env']),
+                state=dict(required=False, type='str')
+            )),
+            condition=dict(required=False, type='str', choices=['all', 'any'], default='all'),
+            ignore_failures=dict(required=False, type='bool', default=False),
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning'])
+        ),
+        supports_check_mode=True
+    )
+
+    result = CdpWait(module)
+    output = dict(changed=False, resources=result.results, calls=result.calls)
+
+    if result.debug:
+        output.update(sdk_out=result.log_out, sdk_out_lines=result.log_lines)
+
+    module.exit_json(**output)
+
+
+if __name__ == '__main__':
+    main()
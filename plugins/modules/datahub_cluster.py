@@ -17,6 +17,7 @@
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import ABSENT
 
 ANSIBLE_METADATA = {'metadata_version': '1.1',
                     'status': ['preview'],
@@ -163,15 +164,18 @@ options:
     description:
       - Flag to enable internal polling to wait for the datahub to achieve the declared state.
       - If set to FALSE, the module will return immediately.
+      - The module then returns a I(job) handle for the change it started; see
+        M(cloudera.cloud.cdp_job_status).
     type: bool
     required: False
     default: True
   delay:
     description:
       - The internal polling interval (in seconds) while the module waits for the datahub to achieve the declared state.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
     type: int
     required: False
-    default: 15
     aliases:
       - polling_delay
   timeout:
@@ -182,9 +186,26 @@ options:
     default: 3600
     aliases:
       - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the datahub to achieve the declared state.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - Polling ends immediately if the datahub reports a failure state.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(provisioning).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
+  - cloudera.cloud.cdp_fingerprint_options
 '''
 
 EXAMPLES = r'''
@@ -358,6 +379,38 @@ datahub:
             open:
               description: tktk
               type: bool
+job:
+  description:
+    - A handle for the change of the Datahub in progress, when the module does not wait for it to complete.
+    - Check the handles of one or more changes with M(cloudera.cloud.cdp_job_status).
+  returned: when I(wait=no) and a change is in progress
+  type: dict
+  contains:
+    kind:
+      description: The kind of resource.
+      returned: always
+      type: str
+      sample: datahub
+    name:
+      description: The name of the resource.
+      returned: always
+      type: str
+    environment:
+      description: The Environment of the resource, if known.
+      returned: always
+      type: str
+    state:
+      description: The target state of the resource, or C(absent) if the resource is being removed.
+      returned: always
+      type: str
+    started:
+      description: The time the change was started, in seconds since the epoch.
+      returned: always
+      type: float
+    timeout:
+      description: The time, in seconds, after which the change is reported as timed out.
+      returned: always
+      type: int
 sdk_out:
   description: Returns the captured CDP SDK log.
   returned: when supported
@@ -371,6 +424,8 @@ sdk_out_lines:
 
 
 class DatahubCluster(CdpModule):
+    POLLING_PROFILE = 'provisioning'
+
     def __init__(self, module):
         super(DatahubCluster, self).__init__(module)
 
@@ -397,12 +452,20 @@ class DatahubCluster(CdpModule):
 
         # Initialize the return values
         self.datahub = dict()
+        self.job = None
 
         # Execute logic process
         self.process()
 
     @CdpModule._Decorators.process_debug
     def process(self):
+        # Return the recorded description of a resource unchanged since the last converged run
+        if self.state in ['present']:
+            converged = self._converged('datahub', self.name, self.environment)
+            if converged is not None:
+                self.datahub = converged
+                return
+
         existing = self.cdpy.datahub.describe_cluster(self.name)
         if self.state in ['present']:
             # If the datahub exists
@@ -424,13 +487,15 @@ class DatahubCluster(CdpModule):
                             self.module.fail_json(msg='Datahub exists and differs from expected:\n' + msg,
                                                   violations=mismatch)
                 if self.wait and not self.module.check_mode:
-                    self.datahub = self.cdpy.sdk.wait_for_state(
+                    self.datahub = self._wait_for_state(
                         describe_func=self.cdpy.datahub.describe_cluster,
                         params=dict(name=self.name),
                         state='AVAILABLE',
                         delay=self.delay,
                         timeout=self.timeout
                     )
+                elif existing.get('status') in self.cdpy.sdk.CREATION_STATES:
+                    self.job = self._job_handle('datahub', self.name, environment=self.environment)
             # Else not exists already, therefore create the datahub
             else:
                 self.host_env = self.cdpy.environments.describe_environment(self.environment)
@@ -455,16 +520,21 @@ class DatahubCluster(CdpModule):
                         self.cdpy.datahub.delete_cluster(self.name)
                         self.changed = True
                     if self.wait:
-                        self.datahub = self.cdpy.sdk.wait_for_state(
+                        self.datahub = self._wait_for_state(
                             describe_func=self.cdpy.datahub.describe_cluster,
                             params=dict(name=self.name),
                             field=None,
                             delay=self.delay,
                             timeout=self.timeout
                         )
+                    else:
+                        self.job = self._job_handle('datahub', self.name, state=ABSENT,
+                                                    environment=self.environment)
         else:
             self.module.fail_json(msg='Invalid state: %s' % self.state)
 
+        self._record_state('datahub', self.name, self.datahub, self.environment)
+
     def create_cluster(self):
         self._validate_datahub_name()
 
@@ -483,13 +553,15 @@ class DatahubCluster(CdpModule):
         self.changed = True
 
         if self.wait and not self.module.check_mode:
-            self.datahub = self.cdpy.sdk.wait_for_state(
+            self.datahub = self._wait_for_state(
                 describe_func=self.cdpy.datahub.describe_cluster,
                 params=dict(name=self.name),
                 state='AVAILABLE',
                 delay=self.delay,
                 timeout=self.timeout
             )
+        elif not self.module.check_mode:
+            self.job = self._job_handle('datahub', self.name, environment=self.environment)
 
     def _configure_payload(self):
         payload = dict(
@@ -559,8 +631,11 @@ def main():
 
             force=dict(required=False, type='bool', default=False),
             wait=dict(required=False, type='bool', default=True),
-            delay=dict(required=False, type='int', aliases=['polling_delay'], default=15),
-            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600)
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning']),
+            **CdpModule.fingerprint_argument_spec()
         ),
         supports_check_mode=True
         #Punting on additional checks here. There are a variety of supporting datahub invocations that can make this more complex
@@ -572,6 +647,9 @@ def main():
     result = DatahubCluster(module)
     output = dict(changed=result.changed, datahub=result.datahub)
 
+    if result.job is not None:
+        output.update(job=result.job)
+
     if result.debug:
         output.update(sdk_out=result.log_out, sdk_out_lines=result.log_lines)
 
@@ -51,9 +51,29 @@ options:
     default: False
     aliases:
      - definition_content
+  parallelism:
+    description:
+      - The maximum number of concurrent requests used to retrieve the content of the Definitions.
+      - If set to C(1), the content is retrieved serially.
+      - Only applicable when I(content=True) and no I(name) is provided.
+    type: int
+    required: False
+    default: 1
+  retries:
+    description:
+      - The number of times a request for the content of a Definition that fails with a transient error, i.e.
+        throttling, a server error or a connection failure, is retried, with an exponential backoff, before the
+        module fails.
+      - Only applicable when I(content=True) and no I(name) is provided.
+    type: int
+    required: False
+    default: 0
+notes:
+  - If I(cache) is enabled, responses are cached for 1 day unless I(cache_ttl) is set.
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
+  - cloudera.cloud.cdp_cache_options
 '''
 
 EXAMPLES = r'''
@@ -65,6 +85,12 @@ EXAMPLES = r'''
 # Gather detailed information about a named Datahub
 - cloudera.cloud.datahub_definition_info:
     name: example-definition
+
+# Gather the contents of all Datahub Definitions, eight at a time
+- cloudera.cloud.datahub_definition_info:
+    content: yes
+    parallelism: 8
+    retries: 2
 '''
 
 RETURN = r'''
@@ -127,12 +153,16 @@ sdk_out_lines:
 
 
 class DatahubDefinitionInfo(CdpModule):
+    CACHE_TTL = 86400
+
     def __init__(self, module):
         super(DatahubDefinitionInfo, self).__init__(module)
 
         # Set variables
         self.name = self._get_param('name')
         self.content = self._get_param('content')
+        self.parallelism = self._get_param('parallelism', 1)
+        self.retries = self._get_param('retries', 0)
 
         # Initialize internal values
         self.all_definitions = []
@@ -158,8 +188,7 @@ class DatahubDefinitionInfo(CdpModule):
                 self.module.warn("Definition not found, '%s'" % self.name)    
         else:
             if self.content:
-                for short_desc in self.all_definitions:
-                    self.definitions.append(self._describe_definition(short_desc))
+                self.definitions = self._describe_definitions(self.all_definitions)
             else:
                 self.definitions = self.all_definitions
 
@@ -172,11 +201,26 @@ class DatahubDefinitionInfo(CdpModule):
         self.module.fail_json(msg="Failed to retrieve Cluster Definition content, '%s'" % 
                               short_desc['clusterDefinitionName'])
 
+    def _describe_definitions(self, short_descs):
+        if self.parallelism <= 1 and self.retries <= 0:
+            return [self._describe_definition(short_desc) for short_desc in short_descs]
+
+        definitions = self._describe_all(
+            lambda client, short_desc: client.datahub.describe_cluster_definition(short_desc['crn']),
+            short_descs, 'clusterDefinitionName', 'Cluster Definition', self.parallelism, self.retries)
+        for short_desc, full_desc in zip(short_descs, definitions):
+            full_desc.update(productVersion=short_desc['productVersion'], nodeCount=short_desc['nodeCount'])
+        return definitions
+
+
 def main():
     module = AnsibleModule(
         argument_spec=CdpModule.argument_spec(
             name=dict(required=False, type='str', aliases=['definition', 'crn']),
-            content=dict(required=False, type='bool', default=False, aliases=['definition_content'])
+            content=dict(required=False, type='bool', default=False, aliases=['definition_content']),
+            parallelism=dict(required=False, type='int', default=1),
+            retries=dict(required=False, type='int', default=0),
+            **CdpModule.cache_argument_spec()
         ),
         supports_check_mode=True
     )
@@ -50,9 +50,29 @@ options:
     aliases:
      - template_content
      - content
+  parallelism:
+    description:
+      - The maximum number of concurrent requests used to retrieve the content of the Templates.
+      - If set to C(1), the content is retrieved serially.
+      - Only applicable when I(return_content=True) and no I(name) is provided.
+    type: int
+    required: False
+    default: 1
+  retries:
+    description:
+      - The number of times a request for the content of a Template that fails with a transient error, i.e.
+        throttling, a server error or a connection failure, is retried, with an exponential backoff, before the
+        module fails.
+      - Only applicable when I(return_content=True) and no I(name) is provided.
+    type: int
+    required: False
+    default: 0
+notes:
+  - If I(cache) is enabled, responses are cached for 1 day unless I(cache_ttl) is set.
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
+  - cloudera.cloud.cdp_cache_options
 '''
 
 EXAMPLES = r'''
@@ -69,6 +89,12 @@ EXAMPLES = r'''
 - cloudera.cloud.datahub_template_info:
     name: example-template
     return_content: yes
+
+# Gather the contents of all Datahub Templates, eight at a time
+- cloudera.cloud.datahub_template_info:
+    return_content: yes
+    parallelism: 8
+    retries: 2
 '''
 
 RETURN = r'''
@@ -136,12 +162,16 @@ sdk_out_lines:
 
 
 class DatahubTemplateInfo(CdpModule):
+    CACHE_TTL = 86400
+
     def __init__(self, module):
         super(DatahubTemplateInfo, self).__init__(module)
 
         # Set variables
         self.name = self._get_param('name')
         self.content = self._get_param('return_content')
+        self.parallelism = self._get_param('parallelism', 1)
+        self.retries = self._get_param('retries', 0)
 
         # Initialize return values
         self.templates = []
@@ -168,8 +198,7 @@ class DatahubTemplateInfo(CdpModule):
               self.module.warn("Template not found, '%s'" % self.name)
         else:
             if self.content:
-              for short_desc in self.all_templates:
-                self.templates.append(self._describe_template(short_desc))
+              self.templates = self._describe_templates(self.all_templates)
             else:
               self.templates = self.all_templates
 
@@ -181,13 +210,27 @@ class DatahubTemplateInfo(CdpModule):
       else:
         self.module.fail_json(msg="Failed to retrieve Cluster Template content, '%s'" %
                               short_desc['clusterTemplateName'])
-        
+
+    def _describe_templates(self, short_descs):
+        if self.parallelism <= 1 and self.retries <= 0:
+            return [self._describe_template(short_desc) for short_desc in short_descs]
+
+        templates = self._describe_all(
+            lambda client, short_desc: client.datahub.describe_cluster_template(short_desc['crn']),
+            short_descs, 'clusterTemplateName', 'Cluster Template', self.parallelism, self.retries)
+        for short_desc, full_desc in zip(short_descs, templates):
+            full_desc.update(productVersion=short_desc['productVersion'])
+        return templates
+
 
 def main():
     module = AnsibleModule(
         argument_spec=CdpModule.argument_spec(
             name=dict(required=False, type='str', aliases=['template', 'crn']),
-            return_content=dict(required=False, type='bool', default=False, aliases=['template_content', 'content'])
+            return_content=dict(required=False, type='bool', default=False, aliases=['template_content', 'content']),
+            parallelism=dict(required=False, type='int', default=1),
+            retries=dict(required=False, type='int', default=0),
+            **CdpModule.cache_argument_spec()
         ),
         supports_check_mode=True
     )
@@ -17,6 +17,7 @@
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import ABSENT
 
 ANSIBLE_METADATA = {'metadata_version': '1.1',
                     'status': ['preview'],
@@ -114,15 +115,18 @@ options:
     description:
       - Flag to enable internal polling to wait for the datalake to achieve the declared state.
       - If set to FALSE, the module will return immediately.
+      - The module then returns a I(job) handle for the change it started; see
+        M(cloudera.cloud.cdp_job_status).
     type: bool
     required: False
     default: True
   delay:
     description:
       - The internal polling interval (in seconds) while the module waits for the datalake to reach the declared state.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
     type: int
     required: False
-    default: 15
     aliases:
       - polling_delay
   timeout:
@@ -133,9 +137,26 @@ options:
     default: 3600
     aliases:
       - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the datalake to achieve the declared state.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - Polling ends immediately if the datalake reports a failure state.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(provisioning).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
+  - cloudera.cloud.cdp_fingerprint_options
 '''
 
 EXAMPLES = r'''
@@ -359,6 +380,38 @@ datalake:
       returned: when supported
       type: str
       sample: Datalake is running
+job:
+  description:
+    - A handle for the change of the Datalake in progress, when the module does not wait for it to complete.
+    - Check the handles of one or more changes with M(cloudera.cloud.cdp_job_status).
+  returned: when I(wait=no) and a change is in progress
+  type: dict
+  contains:
+    kind:
+      description: The kind of resource.
+      returned: always
+      type: str
+      sample: datalake
+    name:
+      description: The name of the resource.
+      returned: always
+      type: str
+    environment:
+      description: The Environment of the resource, if known.
+      returned: always
+      type: str
+    state:
+      description: The target state of the resource, or C(absent) if the resource is being removed.
+      returned: always
+      type: str
+    started:
+      description: The time the change was started, in seconds since the epoch.
+      returned: always
+      type: float
+    timeout:
+      description: The time, in seconds, after which the change is reported as timed out.
+      returned: always
+      type: int
 sdk_out:
   description: Returns the captured CDP SDK log.
   returned: when supported
@@ -372,6 +425,8 @@ sdk_out_lines:
 
 
 class Datalake(CdpModule):
+    POLLING_PROFILE = 'provisioning'
+
     def __init__(self, module):
         super(Datalake, self).__init__(module)
 
@@ -397,12 +452,20 @@ class Datalake(CdpModule):
 
         # Initialize the return values
         self.datalake = dict()
+        self.job = None
 
         # Execute logic process
         self.process()
 
     @CdpModule._Decorators.process_debug
     def process(self):
+        # Return the recorded description of a resource unchanged since the last converged run
+        if self.state in ['present']:
+            converged = self._converged('datalake', self.name, self.environment)
+            if converged is not None:
+                self.datalake = converged
+                return
+
         existing = self.cdpy.datalake.describe_datalake(self.name)
 
         if self.state in ['present']:
@@ -436,10 +499,11 @@ class Datalake(CdpModule):
                         else:
                             if not self.wait:
                                 self.module.warn('Attempting to modify a datalake during its creation cycle')
+                                self.job = self._job_handle('datalake', self.name, environment=self.environment)
 
                             else:
                                 # Wait for creation to complete if previously requested and still running
-                                self.datalake = self.cdpy.sdk.wait_for_state(
+                                self.datalake = self._wait_for_state(
                                     describe_func=self.cdpy.datalake.describe_datalake,
                                     params=dict(name=self.name),
                                     field='status',
@@ -466,6 +530,7 @@ class Datalake(CdpModule):
                 if not self.wait and existing['status'] in self.cdpy.sdk.TERMINATION_STATES:
                     self.module.warn('Attempting to delete an datalake during the termination cycle')
                     self.datalake = existing
+                    self.job = self._job_handle('datalake', self.name, state=ABSENT, environment=self.environment)
 
                 # Otherwise, delete the datalake
                 else:
@@ -473,6 +538,8 @@ class Datalake(CdpModule):
         else:
             self.module.fail_json(msg='Invalid state: %s' % self.state)
 
+        self._record_state('datalake', self.name, self.datalake, self.environment)
+
     def create_datalake(self, environment):
         self._validate_datalake_name()
 
@@ -505,7 +572,7 @@ class Datalake(CdpModule):
         self.changed = True
 
         if self.wait and not self.module.check_mode:
-            self.datalake = self.cdpy.sdk.wait_for_state(
+            self.datalake = self._wait_for_state(
                 describe_func=self.cdpy.datalake.describe_datalake,
                 params=dict(name=self.name),
                 field='status',
@@ -513,6 +580,8 @@ class Datalake(CdpModule):
                 delay=self.delay,
                 timeout=self.timeout
             )
+        elif not self.module.check_mode:
+            self.job = self._job_handle('datalake', self.name, environment=self.environment)
 
     def delete_datalake(self):
         if not self.module.check_mode:
@@ -520,13 +589,15 @@ class Datalake(CdpModule):
         self.changed = True
 
         if self.wait and not self.module.check_mode:
-            self.datalake = self.cdpy.sdk.wait_for_state(
+            self.datalake = self._wait_for_state(
                 describe_func=self.cdpy.datalake.describe_datalake,
                 params=dict(name=self.name),
                 field=None,
                 delay=self.delay,
                 timeout=self.timeout
             )
+        elif not self.module.check_mode:
+            self.job = self._job_handle('datalake', self.name, state=ABSENT, environment=self.environment)
 
     def _configure_payload(self):
         payload = dict(
@@ -605,8 +676,11 @@ def main():
 
             force=dict(required=False, type='bool', default=False),
             wait=dict(required=False, type='bool', default=True),
-            delay=dict(required=False, type='int', aliases=['polling_delay'], default=15),
-            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600)
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning']),
+            **CdpModule.fingerprint_argument_spec()
         ),
         supports_check_mode=True
     )
@@ -614,6 +688,9 @@ def main():
     result = Datalake(module)
     output = dict(changed=result.changed, datalake=result.datalake)
 
+    if result.job is not None:
+        output.update(job=result.job)
+
     if result.debug:
         output.update(sdk_out=result.log_out, sdk_out_lines=result.log_lines)
 
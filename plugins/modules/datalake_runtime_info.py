@@ -40,9 +40,12 @@ options:
     type: bool
     required: False
     default: False
+notes:
+  - If I(cache) is enabled, responses are cached for 1 day unless I(cache_ttl) is set.
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
+  - cloudera.cloud.cdp_cache_options
 '''
 
 EXAMPLES = r'''
@@ -87,6 +90,8 @@ sdk_out_lines:
 
 
 class DatalakeRuntimeInfo(CdpModule):
+    CACHE_TTL = 86400
+
     def __init__(self, module):
         super(DatalakeRuntimeInfo, self).__init__(module)
 
@@ -114,6 +119,7 @@ def main():
     module = AnsibleModule(
         argument_spec=CdpModule.argument_spec(
             default=dict(required=False, type='bool', default=False),
+            **CdpModule.cache_argument_spec()
         ),
         supports_check_mode=True
     )
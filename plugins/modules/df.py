@@ -94,9 +94,10 @@ options:
     description:
       - The internal polling interval (in seconds) while the module waits for the Dataflow Service to achieve the 
         declared state.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
     type: int
     required: False
-    default: 15
     aliases:
       - polling_delay
   timeout:
@@ -108,6 +109,22 @@ options:
     default: 3600
     aliases:
       - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the Dataflow Service to achieve the declared state.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - Polling ends immediately if the Dataflow Service reports a failure state.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(standard).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
 notes:
   - This feature this module is for is in Technical Preview
 extends_documentation_fragment:
@@ -230,6 +247,8 @@ sdk_out_lines:
 
 
 class DFService(CdpModule):
+    POLLING_PROFILE = 'standard'
+
     def __init__(self, module):
         super(DFService, self).__init__(module)
 
@@ -306,14 +325,14 @@ class DFService(CdpModule):
                     msg="State %s is not valid for this module" % self.state)
 
     def _wait_for_enabled(self):
-        return self.cdpy.sdk.wait_for_state(
+        return self._wait_for_state(
             describe_func=self.cdpy.df.describe_environment, params=dict(env_crn=self.name),
             field=['status', 'state'], state=self.cdpy.sdk.STARTED_STATES,
             delay=self.delay, timeout=self.timeout
         )
 
     def _wait_for_disabled(self):
-        return self.cdpy.sdk.wait_for_state(
+        return self._wait_for_state(
             describe_func=self.cdpy.df.describe_environment, params=dict(env_crn=self.name), state=None,
             delay=self.delay, timeout=self.timeout
         )
@@ -332,8 +351,10 @@ def main():
             state=dict(required=False, type='str', choices=['present', 'absent'],
                        default='present'),
             wait=dict(required=False, type='bool', default=True),
-            delay=dict(required=False, type='int', aliases=['polling_delay'], default=15),
-            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600)
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning'])
         ),
         supports_check_mode=True,
     )
@@ -82,9 +82,10 @@ options:
     description:
       - The internal polling interval (in seconds) while the module waits for the Data Warehouse Cluster to achieve the declared
         state.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
     type: int
     required: False
-    default: 15
     aliases:
       - polling_delay
   timeout:
@@ -96,6 +97,22 @@ options:
     default: 3600
     aliases:
       - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the Data Warehouse Cluster to achieve the declared state.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - Polling ends immediately if the Data Warehouse Cluster reports a failure state.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(standard).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -187,6 +204,8 @@ sdk_out_lines:
 
 
 class DwCluster(CdpModule):
+    POLLING_PROFILE = 'standard'
+
     def __init__(self, module):
         super(DwCluster, self).__init__(module)
 
@@ -244,7 +263,7 @@ class DwCluster(CdpModule):
                     else:
                         _ = self.cdpy.dw.delete_cluster(cluster_id=self.name, force=self.force)
                     if self.wait:
-                        self.cdpy.sdk.wait_for_state(
+                        self._wait_for_state(
                             describe_func=self.cdpy.dw.describe_cluster,
                             params=dict(cluster_id=self.name),
                             field=None, delay=self.delay, timeout=self.timeout
@@ -258,7 +277,7 @@ class DwCluster(CdpModule):
                 # Being Config check
                 self.module.warn("DW Cluster already present and config validation is not implemented")
                 if self.wait:
-                    self.target = self.cdpy.sdk.wait_for_state(
+                    self.target = self._wait_for_state(
                         describe_func=self.cdpy.dw.describe_cluster,
                         params=dict(cluster_id=self.name),
                         state='Running', delay=self.delay, timeout=self.timeout
@@ -286,7 +305,7 @@ class DwCluster(CdpModule):
                             az_enable_az=self.az_enable_az
                         )
                         if self.wait:
-                            self.target = self.cdpy.sdk.wait_for_state(
+                            self.target = self._wait_for_state(
                                 describe_func=self.cdpy.dw.describe_cluster,
                                 params=dict(cluster_id=self.name),
                                 state='Running', delay=self.delay, timeout=self.timeout
@@ -311,8 +330,10 @@ def main():
             state=dict(required=False, type='str', choices=['present', 'absent'], default='present'),
             force=dict(required=False, type='bool', default=False),
             wait=dict(required=False, type='bool', default=True),
-            delay=dict(required=False, type='int', aliases=['polling_delay'], default=15),
-            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600)
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning'])
         ),
         required_together=[
             ['az_subnet', 'az_enable_az'],
@@ -16,7 +16,11 @@
 # limitations under the License.
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_env
 from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_dag import CdpDagNode, CdpDagScheduler, DONE
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import field_value
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import ABSENT, RESOURCE_KINDS
 
 
 ANSIBLE_METADATA = {'metadata_version': '1.1',
@@ -30,6 +34,10 @@ short_description: Manage CDP Environments
 description:
     - Create, update, and delete CDP Environments
     - Note that changing states, in particular, creating a new environment, can take several minutes.
+    - If the environment exists and I(cloud) is set, its credential, security groups, SSH key, proxy, and workload
+      analytics setting are updated to match the parameters, with a single call for each kind of update. Differences
+      in other parameters, which are fixed when the environment is created, fail the module, except for differences in
+      the tags, which are reported as warnings.
 author:
   - "Webster Mudge (@wmudge)"
   - "Dan Chaffelson (@chaffelson)"
@@ -169,6 +177,8 @@ options:
   tags:
     description:
       - Tags associated with the environment and its resources.
+      - The tags of an existing environment cannot be updated. Only the tags that are set are compared, and a
+        difference is reported as a warning.
     type: dict
     required: False
     aliases:
@@ -177,9 +187,10 @@ options:
     description:
       - Flag to enable diagnostic information about job and query execution to be sent to Workload Manager for Data Hub
         clusters created within the environment.
+      - If not set, a new environment is created with the flag enabled, and the flag of an existing environment is
+        not changed.
     type: bool
     required: False
-    default: True
   description:
     description:
       - A description for the environment.
@@ -190,9 +201,9 @@ options:
   tunnel:
     description:
       - Flag to enable SSH tunnelling for the environment.
+      - If not set, a new environment is created without SSH tunnelling, and an existing environment is not checked.
     type: bool
     required: False
-    default: False
     aliases:
       - enable_tunnel
       - ssh_tunnel
@@ -210,15 +221,46 @@ options:
   proxy:
     description:
       - The name of the proxy config to use for the environment.
+      - Set to an empty string to remove the proxy config of an existing environment.
     type: str
     required: False
     aliases:
       - proxy_config
       - proxy_config_name
+  cascade:
+    description:
+      - Flag to delete the services of the environment, and then its Datalake, before deleting the environment.
+      - The Data Hubs, Machine Learning workspaces, Data Warehouse clusters, Operational Databases, and DataFlow
+        services of the environment are deleted concurrently, after which the Datalake and then the environment are
+        deleted. A single poller waits for all of these deletions.
+      - The module always waits for the services and the Datalake to be deleted; I(wait) applies to the environment.
+      - Only applies when I(state=absent).
+    type: bool
+    required: False
+    default: False
+    aliases:
+      - cascading
+  force:
+    description:
+      - Flag to force the deletion of the environment and, if I(cascade=yes), of its services and Datalake, even if
+        the deletion of their cloud resources fails.
+      - Only applies when I(state=absent).
+    type: bool
+    required: False
+    default: False
+  parallelism:
+    description:
+      - The maximum number of concurrent calls made while deleting the services of the environment.
+      - Only applies when I(cascade=yes).
+    type: int
+    required: False
+    default: 8
   wait:
     description:
       - Flag to enable internal polling to wait for the environment to achieve the declared state.
       - If set to FALSE, the module will return immediately.
+      - The module then returns a I(job) handle for the change it started; see
+        M(cloudera.cloud.cdp_job_status).
     type: bool
     required: False
     default: True
@@ -226,9 +268,10 @@ options:
     description:
       - The internal polling interval (in seconds) while the module waits for the environment to achieve the declared
         state.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
     type: int
     required: False
-    default: 15
     aliases:
       - polling_delay
   timeout:
@@ -240,6 +283,22 @@ options:
     default: 3600
     aliases:
       - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the environment to achieve the declared state.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - Polling ends immediately if the environment reports a failure state.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(provisioning).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
   s3_guard_name:
     description:
       - (AWS) AWS Dynamo table name for S3 Guard.
@@ -251,6 +310,7 @@ options:
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
+  - cloudera.cloud.cdp_fingerprint_options
 '''
 
 EXAMPLES = r'''
@@ -306,8 +366,19 @@ EXAMPLES = r'''
   cloudera.cloud.env:
     name: example-module
     state: absent
+
+# Delete the environment along with its Datalake, Data Hubs and data services
+- cloudera.cloud.env:
+    name: example-module
+    state: absent
+    cascade: yes
 '''
 
+# For each kind of service deleted with the environment, the listing fields of the name and of the identifier used
+# by the delete call
+DESCENDANT_SERVICES = dict(datahub=('clusterName', 'clusterName'), ml=('instanceName', 'crn'), dw=('id', 'id'),
+                           opdb=('databaseName', 'databaseName'), df=('name', 'crn'))
+
 RETURN = r'''
 ---
 environment:
@@ -605,6 +676,112 @@ environment:
       description: Description for the status code of the Environment.
       returned: when supported
       type: str
+job:
+  description:
+    - A handle for the change of the Environment in progress, when the module does not wait for it to complete.
+    - Check the handles of one or more changes with M(cloudera.cloud.cdp_job_status).
+  returned: when I(wait=no) and a change is in progress
+  type: dict
+  contains:
+    kind:
+      description: The kind of resource.
+      returned: always
+      type: str
+      sample: env
+    name:
+      description: The name of the resource.
+      returned: always
+      type: str
+    environment:
+      description: The Environment of the resource, if known.
+      returned: always
+      type: str
+    state:
+      description: The target state of the resource, or C(absent) if the resource is being removed.
+      returned: always
+      type: str
+    started:
+      description: The time the change was started, in seconds since the epoch.
+      returned: always
+      type: float
+    timeout:
+      description: The time, in seconds, after which the change is reported as timed out.
+      returned: always
+      type: int
+teardown:
+  description: The outcome of the deletion of each service, the Datalake, and the environment, in deletion order.
+  returned: when I(state=absent) and I(cascade=yes)
+  type: list
+  elements: dict
+  contains:
+    id:
+      description: The identifier of the resource, e.g. C(environment), C(datalake), C(datahub:example-etl).
+      returned: always
+      type: str
+    state:
+      description: The outcome for the resource.
+      returned: always
+      type: str
+      sample: done
+      choices:
+        - done
+        - failed
+        - skipped
+    changed:
+      description: Flag indicating that the deletion of the resource was requested.
+      returned: always
+      type: bool
+    status:
+      description: The last observed status of the resource, if waited upon.
+      returned: always
+      type: str
+    error:
+      description: The reason the deletion failed or was skipped.
+      returned: always
+      type: str
+    depends_on:
+      description: The identifiers of the resources whose deletion precedes that of the resource.
+      returned: always
+      type: list
+      elements: str
+    elapsed:
+      description: The time, in seconds, from the request to delete the resource to its removal.
+      returned: always
+      type: float
+    resource:
+      description: The last listing entry of the resource, if waited upon.
+      returned: always
+      type: dict
+updates:
+  description: The update calls made, or in check mode to be made, to the existing environment.
+  returned: when the environment is updated
+  type: list
+  elements: dict
+  contains:
+    update:
+      description: The kind of update.
+      returned: always
+      type: str
+      sample: security_access
+    svc:
+      description: The CDP service of the update call.
+      returned: always
+      type: str
+      sample: environments
+    func:
+      description: The CDP function of the update call.
+      returned: always
+      type: str
+      sample: update_security_access
+    request:
+      description: The request of the update call.
+      returned: always
+      type: dict
+    params:
+      description: The parameters of the module resolved by the update.
+      returned: always
+      type: list
+      elements: str
 sdk_out:
   description: Returns the captured CDP SDK log.
   returned: when supported
@@ -618,6 +795,8 @@ sdk_out_lines:
 
 
 class Environment(CdpModule):
+    POLLING_PROFILE = 'provisioning'
+
     def __init__(self, module):
         super(Environment, self).__init__(module)
 
@@ -653,16 +832,27 @@ class Environment(CdpModule):
         self.timeout = self._get_param('timeout')
         self.force = self._get_param('force', False)
         self.cascade = self._get_param('cascade', False)
+        self.parallelism = self._get_param('parallelism', 8)
         self.wait = self._get_param('wait', False)
 
         # Initialize the return values
         self.environment = dict()
+        self.job = None
+        self.teardown = None
+        self.updates = None
 
         # Execute logic process
         self.process()
 
     @CdpModule._Decorators.process_debug
     def process(self):
+        # Return the recorded description of a resource unchanged since the last converged run
+        if self.state in ['present', 'started']:
+            converged = self._converged('env', self.name)
+            if converged is not None:
+                self.environment = converged
+                return
+
         existing = self.cdpy.environments.describe_environment(self.name)
 
         # TODO SetTelemetryFeaturesRequest
@@ -681,14 +871,27 @@ class Environment(CdpModule):
                         self.module.fail_json(msg="Environment exists in a different cloud platform. "
                                                   "Platform: '%s'" % existing['cloudPlatform'])
 
-                    # Check for changes (except for credentials and cloud platform)
-                    mismatch = self._reconcile_existing_state(existing)
+                    # Check for changes, failing on those to fields fixed at creation
+                    differences = cdp_env.diff(self.cloud, self.module.params, existing)
+                    mismatch = cdp_env.violations(differences)
                     if mismatch:
                         msg = ''
                         for m in mismatch:
                             msg += "Parameter '%s' found to be '%s'\n" % (m[0], m[1])
                         self.module.fail_json(msg='Environment exists and differs from expected:\n' + msg,
                                               violations=mismatch)
+                    for m in cdp_env.unresolved(differences):
+                        self.module.warn("Environment parameter '%s' found to be '%s'. Currently, it cannot be "
+                                         "reconciled. To update it, explicitly delete and recreate the environment."
+                                         % (m[0], m[1]))
+
+                    # Otherwise, update the environment with the fewest calls
+                    self.updates = cdp_env.plan(self.name, self.module.params, differences, existing)
+                    if self.updates:
+                        if not self.module.check_mode:
+                            cdp_env.apply(self.cdpy.sdk, self.updates)
+                            self.environment = self.cdpy.environments.describe_environment(self.name)
+                        self.changed = True
 
                 # Else, only update the credential
                 elif self.credential is not None and existing['credentialName'] != self.credential:
@@ -701,16 +904,21 @@ class Environment(CdpModule):
                 # Warn if attempting to start an environment amidst the creation cycle
                 elif existing['status'] in self.cdpy.sdk.CREATION_STATES:
                     self.module.warn('Skipping attempt to start an environment during its creation cycle')
+                    if not self.wait:
+                        self.job = self._job_handle('env', self.name)
 
                 # Otherwise attempt to start the environment
                 elif existing['status'] not in self.cdpy.sdk.STARTED_STATES:
                     if not self.module.check_mode:
                         self.environment = self.cdpy.environments.start_environment(self.name)
+                        if not self.wait:
+                            self.job = self._job_handle('env', self.name)
                 else:
                     self.module.warn('Environment state %s is unexpected' % existing['status'])
 
-                if self.wait:
-                    self.environment = self.cdpy.sdk.wait_for_state(
+                # Wait unless the environment is known to be available
+                if self.wait and self.environment.get('status') != 'AVAILABLE':
+                    self.environment = self._wait_for_state(
                         describe_func=self.cdpy.environments.describe_environment,
                         params=dict(name=self.name),
                         state='AVAILABLE',
@@ -739,13 +947,15 @@ class Environment(CdpModule):
                         self.environment = self.cdpy.environments.create_azure_environment(**payload)
                     self.changed = True
                     if self.wait:
-                        self.environment = self.cdpy.sdk.wait_for_state(
+                        self.environment = self._wait_for_state(
                             describe_func=self.cdpy.environments.describe_environment,
                             params=dict(name=self.name),
                             state='AVAILABLE',
                             delay=self.delay,
                             timeout=self.timeout
                         )
+                    else:
+                        self.job = self._job_handle('env', self.name)
 
         elif self.state == 'stopped':
             # If the environment exists
@@ -770,13 +980,15 @@ class Environment(CdpModule):
                     if not self.module.check_mode:
                         self.environment = self.cdpy.environments.stop_environment(self.name)
                         if self.wait:
-                            self.environment = self.cdpy.sdk.wait_for_state(
+                            self.environment = self._wait_for_state(
                                 describe_func=self.cdpy.environments.describe_environment,
                                 params=dict(name=self.name),
                                 state='ENV_STOPPED',
                                 delay=self.delay,
                                 timeout=self.timeout
                             )
+                        else:
+                            self.job = self._job_handle('env', self.name, state='ENV_STOPPED')
 
             else:
                 self.module.fail_json(msg='Environment does not exist.')
@@ -788,25 +1000,119 @@ class Environment(CdpModule):
                 if not self.wait and existing['status'] in self.cdpy.sdk.TERMINATION_STATES:
                     self.module.warn('Attempting to delete an environment during the termination cycle')
                     self.environment = existing
+                    self.job = self._job_handle('env', self.name, state=ABSENT)
+                # Delete the services and Datalake of the environment, and then the environment
+                elif self.cascade:
+                    self._delete_cascade(existing)
                 # Otherwise, delete the environment
-                # TODO: Check that no CML or DWX etc. are attached to environment
                 else:
                     if not self.module.check_mode:
-                        self.cdpy.environments.delete_environment(self.name)
+                        self.cdpy.environments.delete_environment(self.name, force=self.force)
                         self.changed = True
 
                         if self.wait:
-                            self.environment = self.cdpy.sdk.wait_for_state(
+                            self.environment = self._wait_for_state(
                                 describe_func=self.cdpy.environments.describe_environment,
                                 params=dict(name=self.name),
                                 field=None,
                                 delay=self.delay,
                                 timeout=self.timeout
                             )
+                        else:
+                            self.job = self._job_handle('env', self.name, state=ABSENT)
 
         else:
             self.module.fail_json(msg='Invalid state: %s' % self.state)
 
+        self._record_state('env', self.name, self.environment)
+
+    def _delete_cascade(self, existing):
+        """Deletes the services of the environment concurrently, then its Datalake, and then the environment"""
+        services = list(DESCENDANT_SERVICES)
+        listings = self._parallel_map(self._list_descendants(existing['crn']), services + ['datalake'],
+                                      self.parallelism)
+        failures = [(kind, error) for kind, (result, error) in zip(services + ['datalake'], listings)
+                    if error is not None]
+        if failures:
+            self.module.fail_json(msg='Failed to gather Environment descendants:\n' + ''.join(
+                "Service '%s': %s\n" % (kind, self._error_message(error)) for kind, error in failures))
+
+        nodes = []
+        for kind, (descendants, error) in zip(services, listings):
+            label, key = DESCENDANT_SERVICES[kind]
+            for descriptor in descendants:
+                nodes.append(CdpDagNode('%s:%s' % (kind, descriptor.get(label)),
+                                        self._start_delete(kind, descriptor[key], descriptor,
+                                                           self._delete_service(kind))))
+        upstream = [n.id for n in nodes]
+
+        datalake = next(iter(listings[-1][0]), None)
+        if datalake is not None:
+            nodes.append(CdpDagNode('datalake', self._start_delete('datalake', datalake['datalakeName'], datalake,
+                                                                   self._delete_datalake), depends_on=upstream))
+            upstream = ['datalake']
+        nodes.append(CdpDagNode('environment', self._start_delete('env', self.name, existing,
+                                                                  self._delete_environment), depends_on=upstream))
+
+        scheduler = CdpDagScheduler(self.cdpy, nodes, self._parallel_map, parallelism=self.parallelism,
+                                    strategy=self._polling_strategy(self.delay), timeout=self.timeout,
+                                    sleep=self._sleep)
+        scheduler.run()
+
+        self.teardown = [n.as_dict() for n in nodes]
+        self.changed = any(n.changed for n in nodes)
+
+        incomplete = [n for n in nodes if n.state != DONE]
+        if incomplete:
+            self.module.fail_json(msg="Environment teardown incomplete: %s" % '; '.join(
+                '%s %s: %s' % (n.id, n.state, n.error) for n in incomplete),
+                changed=self.changed, teardown=self.teardown)
+
+        if not self.wait and not self.module.check_mode:
+            self.environment = self.cdpy.environments.describe_environment(self.name)
+            self.job = self._job_handle('env', self.name, state=ABSENT)
+
+    def _list_descendants(self, env_crn):
+        def _list(client, kind):
+            return [d for d in RESOURCE_KINDS[kind]['lister'](client, self.name) or []
+                    if d.get('environmentCrn') == env_crn]
+        return _list
+
+    def _start_delete(self, kind, name, descriptor, delete):
+        """Returns the start function of the node that deletes the resource"""
+        resource = dict(kind=kind, name=name, environment=self.name, state=ABSENT)
+
+        def _start(client):
+            if self.module.check_mode:
+                return True, None
+            # A resource already in its termination cycle is only waited upon
+            if field_value(descriptor, RESOURCE_KINDS[kind]['status']) in self.cdpy.sdk.TERMINATION_STATES:
+                return False, resource
+            delete(client, name)
+            # The environment is waited upon only if requested
+            return True, resource if kind != 'env' or self.wait else None
+        return _start
+
+    def _delete_service(self, kind):
+        def _delete(client, name):
+            if kind == 'datahub':
+                client.sdk.call('datahub', 'delete_cluster', clusterName=name, force=self.force)
+            elif kind == 'ml':
+                client.sdk.call('ml', 'delete_workspace', workspaceCrn=name, force=self.force)
+            elif kind == 'dw':
+                client.sdk.call('dw', 'delete_cluster', clusterId=name, force=self.force)
+            elif kind == 'opdb':
+                client.sdk.call('opdb', 'drop_database', environmentName=self.name, databaseName=name)
+            else:
+                client.sdk.call('df', 'disable_service', serviceCrn=name, persist=False, terminate=self.force)
+        return _delete
+
+    def _delete_datalake(self, client, name):
+        client.sdk.call('datalake', 'delete_datalake', datalakeName=name, force=self.force)
+
+    def _delete_environment(self, client, name):
+        client.environments.delete_environment(name, cascade=True, force=self.force)
+
     def update_credential(self):
         if not self.module.check_mode:
             self.cdpy.sdk.call('environments', 'change_environment_credential',
@@ -822,7 +1128,7 @@ class Environment(CdpModule):
 
     def _configure_payload(self):
         payload = dict(environmentName=self.name, credentialName=self.credential, region=self.region,
-                       enableTunnel=self.tunnel, workloadAnalytics=self.workload_analytics)
+                       enableTunnel=bool(self.tunnel), workloadAnalytics=self.workload_analytics is not False)
 
         if self.tags is not None:
             payload['tags'] = list()
@@ -850,7 +1156,7 @@ class Environment(CdpModule):
             else:
                 payload['networkCidr'] = self.network_cidr
 
-            if self.proxy is not None:
+            if self.proxy:
                 payload['proxyConfigName'] = self.proxy
 
             if self.s3_guard_name is not None:
@@ -884,86 +1190,6 @@ class Environment(CdpModule):
 
         return payload
 
-    def _reconcile_existing_state(self, existing):
-        mismatch = list()
-
-        if self.region is not None and existing['region'] != self.region:
-            mismatch.append(['region', existing['region']])
-
-        if self.tunnel is not None:
-            self.module.warn('Environment SSH tunneling specified. Currently, the SSH tunnel setting cannot be '
-                             'reconciled. To update the tunneling setting, explicitly delete and recreate the '
-                             'environment.')
-
-        if self.workload_analytics is not None:
-            self.module.warn('Environment workload analytics specified. Currently, the environment\'s workload '
-                             'analytics setting cannot be reconciled. To update the workload analytics setting for the'
-                             'environment, explicitly delete and recreate the environment.')
-
-        if self.tags is not None:
-            self.module.warn('Environment tags specified. Currently, tags cannot be reconciled. To update tags, '
-                             'explicitly delete and recreate the environment.')
-
-        if self.cloud == 'aws':
-            if self.log_identity is not None and \
-                    existing['logStorage']['awsDetails']['instanceProfile'] != self.log_identity:
-                mismatch.append(['log_identity', existing['logStorage']['awsDetails']['instanceProfile']])
-
-            if self.log_location is not None and \
-                    existing['logStorage']['awsDetails']['storageLocationBase'] != self.log_location:
-                mismatch.append(['log_location', existing['logStorage']['awsDetails']['storageLocationBase']])
-
-            if self.public_key_id is not None or self.public_key_text is not None:
-                auth = existing['authentication']
-                if self.public_key_id is not None and auth.get('publicKeyId') != self.public_key_id:
-                    mismatch.append(['public_key_id', auth.get('publicKeyId')])
-                elif auth.get('publicKey') != self.public_key_text:
-                    mismatch.append(['public_key_text', auth.get('publicKey')])
-
-            if self.description is not None and existing['description'] != self.description:
-                mismatch.append(['description', existing['description']])
-
-            if self.freeipa is not None and len(existing['freeipa']['serverIP']) != self.freeipa:
-                mismatch.append(['freeipa', len(existing['freeipa']['serverIP'])])
-
-            if self.vpc_id is not None and existing['network']['aws']['vpcId'] != self.vpc_id:
-                mismatch.append(['vpc_id', existing['network']['aws']['vpcId']])
-
-            if self.subnet_ids is not None and set(existing['network']['subnetIds']) != set(self.subnet_ids):
-                mismatch.append(['subnetIds', existing['network']['subnetIds']])
-
-            if self.network_cidr is not None and existing['network']['networkCidr'] != self.network_cidr:
-                mismatch.append(['network_cidr', existing['network']['networkCidr']])
-
-            if self.s3_guard_name is not None and existing['awsDetails']['s3GuardTableName'] != self.s3_guard_name:
-                mismatch.append(['s3_guard_name', existing['awsDetails']['s3GuardTableName']])
-
-            if self.inbound_cidr is not None and existing['securityAccess']['cidr'] != self.inbound_cidr:
-                mismatch.append(['inbound_cidr', existing['securityAccess']['cidr']])
-
-            if self.default_sg is not None or self.knox_sg is not None:
-                access = existing['securityAccess']
-                if self.default_sg is not None and access.get('defaultSecurityGroupId') != self.default_sg:
-                    mismatch.append(['default_sg', access.get('defaultSecurityGroupId')])
-                if self.knox_sg is not None and access.get('securityGroupIdForKnox') != self.knox_sg:
-                    mismatch.append(['knox_sg', access.get('securityGroupIdForKnox')])
-
-            if self.proxy is not None:
-                if 'proxyConfig' in existing:
-                    if existing['proxyConfig']['proxyConfigName'] != self.proxy:
-                        mismatch.append(['proxy', existing['proxyConfig']['proxyConfigName']])
-                else:
-                    mismatch.append(['proxy', 'n/a'])
-            elif 'proxyConfig' in existing:
-                mismatch.append(['proxy', existing['proxyConfig']['proxyConfigName']])
-        elif self.cloud == 'gcp':
-            self.module.warn("Environment configuration reconciliation not implemented on GCP")
-        else:
-            # For Azure
-            self.module.warn("Environment configuration reconciliation not implemented on Azure")
-
-        return mismatch
-
 
 def main():
     module = AnsibleModule(
@@ -971,35 +1197,16 @@ def main():
             name=dict(required=True, type='str', aliases=['environment']),
             state=dict(required=False, type='str', choices=['present', 'started', 'stopped', 'absent'],
                        default='present'),
-            cloud=dict(required=False, type='str', choices=['aws', 'azure', 'gcp']),
-            region=dict(required=False, type='str'),
-            credential=dict(required=False, type='str'),
-            inbound_cidr=dict(required=False, type='str', aliases=['security_cidr']),
-            default_sg=dict(required=False, type='str', aliases=['default', 'default_security_group']),
-            knox_sg=dict(required=False, type='str', aliases=['knox', 'knox_security_group']),
-            public_key_text=dict(required=False, type='str', aliases=['ssh_key_text']),
-            public_key_id=dict(required=False, type='str', aliases=['public_key', 'ssh_key', 'ssh_key_id']),
-            log_location=dict(required=False, type='str', aliases=['storage_location_base']),
-            log_identity=dict(required=False, type='str', aliases=['instance_profile']),
-            network_cidr=dict(required=False, type='str'),
-            vpc_id=dict(required=False, type='str', aliases=['vpc', 'network']),  # TODO: Update Docs
-            subnet_ids=dict(required=False, type='list', elements='str', aliases=['subnets']),
-            public_ip=dict(required=False, type='bool'),  # TODO: add to docs
-            s3_guard_name=dict(required=False, type='str', aliases=['s3_guard', 's3_guard_table_name']),
-            resource_gp=dict(required=False, type='str', aliases=['resource_group_name']),
-            tags=dict(required=False, type='dict', aliases=['environment_tags']),
-            workload_analytics=dict(required=False, type='bool', default=True),
-            description=dict(required=False, type='str', aliases=['desc']),
-            tunnel=dict(required=False, type='bool', aliases=['enable_tunnel', 'ssh_tunnel'], default=False),
-            freeipa=dict(required=False, type='dict', options=dict(instanceCountByGroup=dict(required=False,
-                                                                                             type='int'))),
-            project=dict(required=False, type='str'),
-            proxy=dict(required=False, type='str', aliases=['[proxy_config', 'proxy_config_name']),
-            cascade=dict(required=False, type='bool', default=False),
+            cloud=dict(required=False, type='str', choices=cdp_env.CLOUDS),
+            cascade=dict(required=False, type='bool', default=False, aliases=['cascading']),
             force=dict(required=False, type='bool', default=False),
+            parallelism=dict(required=False, type='int', default=8),
             wait=dict(required=False, type='bool', default=True),
-            delay=dict(required=False, type='int', aliases=['polling_delay'], default=15),
-            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600)
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning']),
+            **dict(cdp_env.ARGUMENT_SPEC, **CdpModule.fingerprint_argument_spec())
         ),
         # TODO: Update for Azure
         required_if=[
@@ -1028,6 +1235,15 @@ def main():
     result = Environment(module)
     output = dict(changed=result.changed, environment=result.environment)
 
+    if result.job is not None:
+        output.update(job=result.job)
+
+    if result.teardown is not None:
+        output.update(teardown=result.teardown)
+
+    if result.updates:
+        output.update(updates=result.updates)
+
     if result.debug:
         output.update(sdk_out=result.log_out, sdk_out_lines=result.log_lines)
 
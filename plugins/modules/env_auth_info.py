@@ -15,6 +15,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
+import os
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
 
@@ -72,6 +75,22 @@ options:
     required: False
     aliases:
       - users
+  keytab_dir:
+    description:
+      - A directory in which to write the keytabs, decoded, rather than returning their contents.
+      - Each keytab is written to C(<keytab_dir>/<workload username>/<environment name>.keytab) as it is retrieved.
+      - The directory is on the host executing the module, usually the Ansible controller.
+    type: path
+    required: False
+    aliases:
+      - keytab_path
+  parallelism:
+    description:
+      - The maximum number of concurrent requests used to retrieve the root certificates and keytabs.
+      - If set to C(1), the root certificates and keytabs are retrieved serially.
+    type: int
+    required: False
+    default: 1
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -112,6 +131,16 @@ EXAMPLES = r'''
       - UserB
     keytab: yes
     root_certificate: no
+
+# Write the keytabs for the specified users for all environments to files, eight requests at a time
+- cloudera.cloud.env_auth_info:
+    user:
+      - UserA
+      - UserB
+    keytab: yes
+    keytab_dir: /tmp/keytabs
+    root_certificate: no
+    parallelism: 8
 '''
 
 RETURN = r'''
@@ -140,7 +169,9 @@ authentication:
                 type: dict
                 contains:
                   _environment name_:
-                    description: The keytab for the environment. The keytab is encoded in base64.
+                    description:
+                      - The keytab for the environment. The keytab is encoded in base64.
+                      - If C(keytab_dir) is set, the path of the keytab file.
                     returned: always
                     type: str
 sdk_out:
@@ -164,21 +195,28 @@ class EnvironmentAuthentication(CdpModule):
         self.user = self._get_param('user')
         self.root_cert = self._get_param('root_certificate')
         self.keytab = self._get_param('keytab')
+        self.keytab_dir = self._get_param('keytab_dir')
+        self.parallelism = self._get_param('parallelism', 1)
 
         # Initialize the return values
         self.auth = dict()
 
+        # Initialize internal values
+        self.all_envs = None
+
         # Execute logic process
         self.process()
 
     @CdpModule._Decorators.process_debug
     def process(self):
+        requests = []
+
         if self.root_cert:
-            certs = self.get_certificates()
-            self.auth.update(certificates=certs)
+            self.auth.update(certificates=dict())
+            for env in self._targets(discover=True):
+                requests.append(('certificate', None, env))
 
         if self.keytab:
-            keytabs = dict()
             actors = list()
 
             if self.user is None:
@@ -190,40 +228,62 @@ class EnvironmentAuthentication(CdpModule):
                         self.module.fail_json(msg='Invalid user: %s' % user)
                     actors.append(actor)
 
+            self.auth.update(keytabs=dict((actor['workloadUsername'], dict()) for actor in actors))
             for actor in actors:
-                user_keytabs = self.get_keytabs_for_user(actor['crn'])
-                keytabs[actor['workloadUsername']] = user_keytabs
+                for env in self._targets():
+                    requests.append(('keytab', actor, env))
 
-            self.auth.update(keytabs=keytabs)
-
-    def get_certificates(self):
-        certs = dict()
-
-        if self.name is None:
-            env_list = self._list_all_crns()
+        if self.parallelism > 1:
+            results = self._parallel_map(self._retrieve, requests, self.parallelism)
         else:
-            env_list = self._discover_crns()
-
-        for env in env_list:
-            result = self.cdpy.environments.get_root_cert(env['crn'])
-            certs[env['name']] = result
-
-        return certs
-
-    def get_keytabs_for_user(self, workload_user_crn):
-        keytabs = dict()
-
+            results = [self._retrieve_serially(request) for request in requests]
+
+        failures = []
+        for (kind, actor, env), (result, error) in zip(requests, results):
+            if error is not None:
+                failures.append(dict(type=kind, environment=env['name'],
+                                     user=actor['workloadUsername'] if actor is not None else None,
+                                     error=self._error_message(error)))
+            elif kind == 'certificate':
+                self.auth['certificates'][env['name']] = result
+            else:
+                self.auth['keytabs'][actor['workloadUsername']][env['name']] = result
+
+        if failures:
+            self.module.fail_json(msg="Failed to retrieve %s of %s certificates and keytabs" %
+                                  (len(failures), len(requests)), failures=failures)
+
+    def _retrieve_serially(self, request):
+        try:
+            return self._retrieve(self.cdpy, request), None
+        except (IOError, OSError) as e:
+            return None, e
+
+    def _retrieve(self, client, request):
+        kind, actor, env = request
+        if kind == 'certificate':
+            return client.environments.get_root_cert(env['crn'])
+        result = client.environments.get_keytab(actor['crn'], env['crn'])
+        if self.keytab_dir and result is not None:
+            return self._write_keytab(actor['workloadUsername'], env['name'], result)
+        return result
+
+    def _write_keytab(self, workload_user, env_name, contents):
+        directory = os.path.join(self.keytab_dir, workload_user)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        path = os.path.join(directory, '%s.keytab' % env_name)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as keytab_file:
+            keytab_file.write(base64.b64decode(contents))
+        return path
+
+    def _targets(self, discover=False):
+        """Returns the target environments; the listing of all environments is only requested once"""
         if self.name:
-            for name in self.name:
-                result = self.cdpy.environments.get_keytab(workload_user_crn, name)
-                keytabs[name] = result
-        else:
-            all_envs = self.cdpy.environments.list_environments()
-            for env in all_envs:
-                result = self.cdpy.environments.get_keytab(workload_user_crn, env['crn'])
-                keytabs[env['environmentName']] = result
-
-        return keytabs
+            return self._discover_crns() if discover else [dict(name=name, crn=name) for name in self.name]
+        if self.all_envs is None:
+            self.all_envs = self._list_all_crns()
+        return self.all_envs
 
     def _discover_crns(self):
         converted = []
@@ -249,7 +309,9 @@ def main():
             name=dict(required=False, type='list', elements='str', aliases=['environment']),
             user=dict(required=False, type='list', elements='str', aliases=['users']),
             root_certificate=dict(required=False, type='bool', aliases=['root_ca', 'cert'], default=True),
-            keytab=dict(required=False, type='bool', aliases=['keytabs', 'user_keytabs'], default=True)
+            keytab=dict(required=False, type='bool', aliases=['keytabs', 'user_keytabs'], default=True),
+            keytab_dir=dict(required=False, type='path', aliases=['keytab_path']),
+            parallelism=dict(required=False, type='int', default=1)
         ),
         supports_check_mode=True
     )
@@ -16,7 +16,6 @@
 # limitations under the License.
 
 from ansible.module_utils.basic import AnsibleModule
-from cdpy.common import CdpError
 from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
 
 ANSIBLE_METADATA = {'metadata_version': '1.1',
@@ -255,6 +254,7 @@ class EnvironmentCredential(CdpModule):
                 self.changed = True
                 return resp
             else:
+                from cdpy.common import CdpError
                 self.cdpy.sdk.throw_error(CdpError("Invalid Cloud option"))
 
 
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_env
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+DOCUMENTATION = r'''
+---
+module: env_drift_info
+short_description: Report the drift of CDP Environments from their desired configuration
+description:
+    - Compare many CDP Environments with their desired configurations and report each difference.
+    - All Environments are described at once, and each is compared with the same rules as M(cloudera.cloud.env) uses
+      to reconcile an existing Environment.
+author:
+  - "Webster Mudge (@wmudge)"
+  - "Dan Chaffelson (@chaffelson)"
+requirements:
+  - cdpy
+options:
+  environments:
+    description:
+      - The desired configuration of each Environment.
+      - Each configuration requires C(name) and C(cloud), and may set any of the reconciled parameters of
+        M(cloudera.cloud.env), named, typed and aliased as for that module.
+      - Parameters that are not set are not compared.
+    type: list
+    elements: dict
+    required: True
+    suboptions:
+      name:
+        description: The name of the Environment.
+        type: str
+        required: True
+      cloud:
+        description: The cloud platform of the Environment.
+        type: str
+        required: True
+        choices:
+          - aws
+          - azure
+          - gcp
+      region:
+        description: The region of the Environment.
+        type: str
+      credential:
+        description: The name of the credential of the Environment.
+        type: str
+      inbound_cidr:
+        description: (AWS) The CIDR range allowed inbound access.
+        type: str
+        aliases:
+          - security_cidr
+      default_sg:
+        description: The security group where all other hosts are placed.
+        type: str
+        aliases:
+          - default
+          - default_security_group
+      knox_sg:
+        description: The security group where Knox-enabled hosts are placed.
+        type: str
+        aliases:
+          - knox
+          - knox_security_group
+      public_key_text:
+        description: The content of a public SSH key.
+        type: str
+        aliases:
+          - ssh_key_text
+      public_key_id:
+        description: (AWS) The public SSH key ID registered in the cloud provider.
+        type: str
+        aliases:
+          - public_key
+          - ssh_key
+          - ssh_key_id
+      log_location:
+        description: The base location to store logs.
+        type: str
+        aliases:
+          - storage_location_base
+      log_identity:
+        description: The instance profile, managed identity or service account that accesses I(log_location).
+        type: str
+        aliases:
+          - instance_profile
+      network_cidr:
+        description: (AWS) The network CIDR.
+        type: str
+      vpc_id:
+        description: The VPC ID, virtual network ID or network name.
+        type: str
+        aliases:
+          - vpc
+          - network
+      subnet_ids:
+        description: The subnet identifiers, in any order.
+        type: list
+        elements: str
+        aliases:
+          - subnets
+      public_ip:
+        description: (Azure, GCP) Whether public IP addresses are used.
+        type: bool
+      s3_guard_name:
+        description: (AWS) The name of the S3Guard table.
+        type: str
+        aliases:
+          - s3_guard
+          - s3_guard_table_name
+      resource_gp:
+        description: (Azure) The name of the resource group.
+        type: str
+        aliases:
+          - resource_group_name
+      tags:
+        description:
+          - The tags of the Environment.
+          - Only the tags that are set are compared.
+        type: dict
+        aliases:
+          - environment_tags
+      workload_analytics:
+        description: Whether workload analytics are enabled.
+        type: bool
+      description:
+        description: The description of the Environment.
+        type: str
+        aliases:
+          - desc
+      tunnel:
+        description: Whether SSH tunnelling is enabled.
+        type: bool
+        aliases:
+          - enable_tunnel
+          - ssh_tunnel
+      freeipa:
+        description: The FreeIPA service of the Environment.
+        type: dict
+        suboptions:
+          instanceCountByGroup:
+            description: The number of FreeIPA instances.
+            type: int
+      project:
+        description: (GCP) The shared project of the network.
+        type: str
+      proxy:
+        description:
+          - The name of the proxy config of the Environment.
+          - An empty string expects no proxy config.
+        type: str
+        aliases:
+          - "[proxy_config"
+          - proxy_config_name
+extends_documentation_fragment:
+  - cloudera.cloud.cdp_sdk_options
+  - cloudera.cloud.cdp_auth_options
+'''
+
+EXAMPLES = r'''
+# Note: These examples do not set authentication details.
+
+# Report the drift of two Environments
+- cloudera.cloud.env_drift_info:
+    environments:
+      - name: example-env
+        cloud: aws
+        credential: example-credential
+        region: us-east-1
+        default_sg: sg-0123456789abcdef0
+        knox_sg: sg-0123456789abcdef1
+      - name: example-env-2
+        cloud: azure
+        credential: example-azure-credential
+        proxy: example-proxy
+  register: report
+
+# Fail if any Environment differs in a parameter that only recreation can change
+- ansible.builtin.assert:
+    that: report.drift | selectattr('update', 'none') | selectattr('strict') | list | length == 0
+'''
+
+RETURN = r'''
+---
+drift:
+  description: The differences between the Environments and their desired configurations, one per parameter.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    environment:
+      description: The name of the Environment.
+      returned: always
+      type: str
+    param:
+      description: The parameter, as named for M(cloudera.cloud.env).
+      returned: always
+      type: str
+      sample: credential
+    field:
+      description: The field of the Environment descriptor, as dot-separated nested keys.
+      returned: always
+      type: str
+      sample: credentialName
+    expected:
+      description: The desired value.
+      returned: always
+      type: raw
+    actual:
+      description: The value of the Environment.
+      returned: always
+      type: raw
+    update:
+      description:
+        - The kind of update with which M(cloudera.cloud.env) resolves the difference.
+        - C(None) if the parameter is fixed when the Environment is created.
+      returned: always
+      type: str
+      sample: credential
+    strict:
+      description:
+        - Whether M(cloudera.cloud.env) fails on the difference if no update resolves it.
+        - C(False) for the tags, whose differences it only reports.
+      returned: always
+      type: bool
+missing:
+  description: The names of the Environments that do not exist.
+  returned: always
+  type: list
+  elements: str
+compliant:
+  description: The names of the Environments that match their desired configurations.
+  returned: always
+  type: list
+  elements: str
+sdk_out:
+  description: Returns the captured CDP SDK log.
+  returned: when supported
+  type: str
+sdk_out_lines:
+  description: Returns a list of each line of the captured CDP SDK log.
+  returned: when supported
+  type: list
+  elements: str
+'''
+
+
+class EnvironmentDriftInfo(CdpModule):
+    def __init__(self, module):
+        super(EnvironmentDriftInfo, self).__init__(module)
+
+        # Set variables
+        self.specs = self._get_param('environments')
+
+        # Initialize return values
+        self.drift = []
+        self.missing = []
+        self.compliant = []
+
+        # Execute logic process
+        self.process()
+
+    @CdpModule._Decorators.process_debug
+    def process(self):
+        existing = dict((e['environmentName'], e) for e in self.cdpy.environments.describe_all_environments() or []
+                        if e is not None)
+
+        for spec in self.specs:
+            descriptor = existing.get(spec['name'])
+            if descriptor is None:
+                self.missing.append(spec['name'])
+                continue
+            rows = self._compare(spec, descriptor)
+            if rows:
+                self.drift.extend(rows)
+            else:
+                self.compliant.append(spec['name'])
+
+    @staticmethod
+    def _compare(spec, descriptor):
+        platform = (descriptor.get('cloudPlatform') or '').lower()
+        if platform != spec['cloud']:
+            return [dict(environment=spec['name'], param='cloud', field='cloudPlatform', expected=spec['cloud'],
+                         actual=platform, update=None, strict=True)]
+        return [dict(environment=spec['name'], **d) for d in cdp_env.diff(spec['cloud'], spec, descriptor)]
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=CdpModule.argument_spec(
+            environments=dict(required=True, type='list', elements='dict', options=dict(
+                name=dict(required=True, type='str'),
+                cloud=dict(required=True, type='str', choices=cdp_env.CLOUDS),
+                **cdp_env.ARGUMENT_SPEC
+            ))
+        ),
+        supports_check_mode=True
+    )
+
+    result = EnvironmentDriftInfo(module)
+    output = dict(changed=False, drift=result.drift, missing=result.missing, compliant=result.compliant)
+
+    if result.debug:
+        output.update(sdk_out=result.log_out, sdk_out_lines=result.log_lines)
+
+    module.exit_json(**output)
+
+
+if __name__ == '__main__':
+    main()
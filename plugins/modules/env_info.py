@@ -46,6 +46,15 @@ options:
     type: bool
     required: False
     default: False
+  parallelism:
+    description:
+      - The maximum number of concurrent requests used to gather the descendants of the Environments.
+      - The descendant services of every Environment are queried at the same time, bounded by this value.
+      - If set to C(1), the Environments and their descendants are queried serially.
+      - Only applicable when I(descendants=True).
+    type: int
+    required: False
+    default: 1
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -61,6 +70,11 @@ EXAMPLES = r'''
 - cloudera.cloud.env_info:
     name: example-environment
     descendants: True
+
+# Gather descendant information about all Environments using up to 8 concurrent requests
+- cloudera.cloud.env_info:
+    descendants: True
+    parallelism: 8
 '''
 
 RETURN = r'''
@@ -409,6 +423,9 @@ sdk_out_lines:
 '''
 
 
+DESCENDANT_SERVICES = ['datahub', 'dw', 'ml', 'opdb']
+
+
 class EnvironmentInfo(CdpModule):
     def __init__(self, module):
         super(EnvironmentInfo, self).__init__(module)
@@ -416,6 +433,7 @@ class EnvironmentInfo(CdpModule):
         # Set variables
         self.name = self._get_param('name')
         self.descendants = self._get_param('descendants')
+        self.parallelism = self._get_param('parallelism', 1)
 
         # Initialize return values
         self.environments = []
@@ -432,23 +450,64 @@ class EnvironmentInfo(CdpModule):
         else:
             self.environments = self.cdpy.environments.describe_all_environments()
         if self.descendants and self.environments:
-            updated_envs = []
-            for this_env in self.environments:
-                this_env['descendants'] = {
-                    'datahub': self.cdpy.datahub.describe_all_clusters(this_env['environmentName']),
-                    'dw': self.cdpy.dw.gather_clusters(this_env['crn']),
-                    'ml': self.cdpy.ml.describe_all_workspaces(this_env['environmentName']),
-                    'opdb': self.cdpy.opdb.describe_all_databases(this_env['environmentName'])
-                }
-                updated_envs.append(this_env)
-            self.environments = updated_envs
+            if self.parallelism > 1:
+                self._gather_descendants()
+            else:
+                updated_envs = []
+                for this_env in self.environments:
+                    this_env['descendants'] = {
+                        'datahub': self.cdpy.datahub.describe_all_clusters(this_env['environmentName']),
+                        'dw': self.cdpy.dw.gather_clusters(this_env['crn']),
+                        'ml': self.cdpy.ml.describe_all_workspaces(this_env['environmentName']),
+                        'opdb': self.cdpy.opdb.describe_all_databases(this_env['environmentName'])
+                    }
+                    updated_envs.append(this_env)
+                self.environments = updated_envs
+
+    def _gather_descendants(self):
+        lookups = []
+        for index, this_env in enumerate(self.environments):
+            for service in DESCENDANT_SERVICES:
+                lookups.append((index, service))
+
+        results = self._parallel_map(self._describe_descendants, lookups, self.parallelism)
+
+        failures = []
+        for this_env in self.environments:
+            this_env['descendants'] = dict()
+        for (index, service), (result, error) in zip(lookups, results):
+            this_env = self.environments[index]
+            if error is not None:
+                failures.append(dict(environment=this_env['environmentName'], service=service,
+                                     error=self._error_message(error)))
+            else:
+                this_env['descendants'][service] = result
+
+        if failures:
+            msg = ''
+            for f in failures:
+                msg += "Environment '%s', service '%s': %s\n" % (f['environment'], f['service'], f['error'])
+            self.module.fail_json(msg='Failed to gather Environment descendants:\n' + msg, failures=failures)
+
+    def _describe_descendants(self, client, lookup):
+        this_env = self.environments[lookup[0]]
+        service = lookup[1]
+        if service == 'datahub':
+            return client.datahub.describe_all_clusters(this_env['environmentName'])
+        elif service == 'dw':
+            return client.dw.gather_clusters(this_env['crn'])
+        elif service == 'ml':
+            return client.ml.describe_all_workspaces(this_env['environmentName'])
+        else:
+            return client.opdb.describe_all_databases(this_env['environmentName'])
 
 
 def main():
     module = AnsibleModule(
         argument_spec=CdpModule.argument_spec(
             name=dict(required=False, type='str', aliases=['environment']),
-            descendants=dict(required=False, type='bool', default=False)
+            descendants=dict(required=False, type='bool', default=False),
+            parallelism=dict(required=False, type='int', default=1)
         ),
         supports_check_mode=True
     )
@@ -58,9 +58,10 @@ options:
     description:
       - The internal polling interval (in seconds) while the module waits for the datalake to achieve the declared 
             state.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
     type: int
     required: False
-    default: 15
     aliases:
       - polling_delay
   timeout:
@@ -71,6 +72,22 @@ options:
     default: 3600
     aliases:
       - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the synchronization to achieve the declared state.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - Polling ends immediately if the synchronization reports a failure state.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(responsive).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -177,6 +194,8 @@ sdk_out_lines:
 
 
 class EnvironmentUserSync(CdpModule):
+    POLLING_PROFILE = 'responsive'
+
     def __init__(self, module):
         super(EnvironmentUserSync, self).__init__(module)
 
@@ -202,7 +221,7 @@ class EnvironmentUserSync(CdpModule):
                 resp = self.cdpy.environments.sync_users(self.name)
             self.changed = True
             if self.wait:
-                self.sync = self.cdpy.sdk.wait_for_state(
+                self.sync = self._wait_for_state(
                     describe_func=self.cdpy.environments.get_sync_status,
                     params=dict(operation=resp['operationId']),
                     state='COMPLETED',
@@ -219,8 +238,10 @@ def main():
             name=dict(required=False, type='list', aliases=['environment']),
             current_user=dict(required=False, type='bool', aliases=['user']),
             wait=dict(required=False, type='bool', default=True),
-            delay=dict(required=False, type='int', aliases=['polling_delay'], default=15),
-            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600)
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning'])
         ),
         mutually_exclusive=(
             ['name', 'current_user']
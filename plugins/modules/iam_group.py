@@ -17,6 +17,8 @@
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_iam import apply_group_mutations, \
+    plan_group_mutations
 
 ANSIBLE_METADATA = {'metadata_version': '1.1',
                     'status': ['preview'],
@@ -110,6 +112,18 @@ options:
     type: list
     elements: str
     required: False
+  parallelism:
+    description:
+      - The maximum number of concurrent requests used to change the users, roles, and resource roles of the group.
+    type: int
+    required: False
+    default: 1
+  rate_limit:
+    description:
+      - The maximum number of requests per second used to change the users, roles, and resource roles of the group.
+      - If not set, the requests are not rate limited.
+    type: float
+    required: False
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -154,6 +168,14 @@ EXAMPLES = r'''
       - role-c
       - role-d
     purge: yes
+
+# Replace the users of a group, eight changes at a time and no more than 20 per second
+- cloudera.cloud.iam_group:
+    name: group-example
+    users: "{{ idp_export_users }}"
+    purge: yes
+    parallelism: 8
+    rate_limit: 20
 '''
 
 RETURN = r'''
@@ -205,6 +227,29 @@ group:
         group membership.
       returned: when supported
       type: bool
+failures:
+  description: The changes to the group that failed.
+  returned: when changes fail
+  type: list
+  elements: dict
+  contains:
+    group:
+      description: The group name.
+      returned: always
+      type: str
+    action:
+      description: The CDP IAM function of the change, for example C(add_group_user).
+      returned: always
+      type: str
+    args:
+      description: The arguments of the change, for example the user CRN.
+      returned: always
+      type: list
+      elements: str
+    error:
+      description: The error message of the change.
+      returned: always
+      type: str
 sdk_out:
   description: Returns the captured CDP SDK log.
   returned: when supported
@@ -229,6 +274,8 @@ class IAMGroup(CdpModule):
         self.roles = self._get_param('roles')
         self.resource_roles = self._get_param('resource_roles')
         self.purge = self._get_param('purge')
+        self.parallelism = self._get_param('parallelism', 1)
+        self.rate_limit = self._get_param('rate_limit')
 
         # Initialize the return values
         self.info = dict()
@@ -242,57 +289,18 @@ class IAMGroup(CdpModule):
         if existing is None:
             if self.state == 'present':
                 self.changed = True
-                self.cdpy.iam.create_group(self.name, self.sync)
-                if self.users:
-                    for user in self.users:
-                        self.cdpy.iam.add_group_user(self.name, user)
-                if self.roles:
-                    for role in self.roles:
-                        self.cdpy.iam.assign_group_role(self.name, role)
-                if self.resource_roles:
-                    for assignment in self.resource_roles:
-                        self.cdpy.iam.assign_group_resource_role(self.name, assignment['resource'], assignment['role'])
+                if not self.module.check_mode:
+                    self.cdpy.iam.create_group(self.name, self.sync)
+                self._reconcile(None)
                 self.info = self._retrieve_group()
         else:
             if self.state == 'present':
                 if self.sync is not None and existing['syncMembershipOnUserLogin'] != self.sync:
                     self.changed = True
-                    self.cdpy.iam.update_group(self.name, self.sync)
-
-                if self.users is not None:
-                    # If an empty user list, don't normalize
-                    normalized_users = self.cdpy.iam.gather_users(self.users) if self.users else list()
-                    new_users = [user for user in normalized_users if user not in existing['users']]
-                    for user in new_users:
-                        self.changed = True
-                        self.cdpy.iam.add_group_user(self.name, user)
-                    if self.purge:
-                        stale_users = [user for user in existing['users'] if user not in normalized_users]
-                        for user in stale_users:
-                            self.changed = True
-                            self.cdpy.iam.remove_group_user(self.name, user)
-
-                if self.roles is not None:
-                    new_roles = [role for role in self.roles if role not in existing['roles']]
-                    for role in new_roles:
-                        self.changed = True
-                        self.cdpy.iam.assign_group_role(self.name, role)
-                    if self.purge:
-                        stale_roles = [role for role in existing['roles'] if role not in self.roles]
-                        for role in stale_roles:
-                            self.changed = True
-                            self.cdpy.iam.unassign_group_role(self.name, role)
-
-                if self.resource_roles is not None:
-                    new_assignments = self._new_assignments(existing['resource_roles'])
-                    for assignment in new_assignments:
-                        self.changed = True
-                        self.cdpy.iam.assign_group_resource_role(self.name, assignment['resource'], assignment['role'])
-                    if self.purge:
-                        stale_assignments = self._stale_assignments(existing['resource_roles'])
-                        for assignment in stale_assignments:
-                            self.changed = True
-                            self.cdpy.iam.unassign_group_resource_role(self.name, assignment['resource'], assignment['role'])
+                    if not self.module.check_mode:
+                        self.cdpy.iam.update_group(self.name, self.sync)
+
+                self._reconcile(existing)
 
                 if self.changed:
                     self.info = self._retrieve_group()
@@ -301,7 +309,26 @@ class IAMGroup(CdpModule):
 
             elif self.state == 'absent':
                 self.changed = True
-                self.cdpy.iam.delete_group(self.name)
+                if not self.module.check_mode:
+                    self.cdpy.iam.delete_group(self.name)
+
+    def _reconcile(self, existing):
+        # If an empty user list, don't normalize
+        normalized_users = self.cdpy.iam.gather_users(self.users) if self.users else self.users
+        mutations = plan_group_mutations(self.name, existing, users=normalized_users, roles=self.roles,
+                                         resource_roles=self.resource_roles, purge=self.purge)
+        if not mutations:
+            return
+
+        self.changed = True
+        if self.module.check_mode:
+            return
+
+        failures = apply_group_mutations(self, mutations, parallelism=self.parallelism, rate=self.rate_limit)
+        if failures:
+            self.module.fail_json(msg="Failed to apply %s of %s changes to group '%s'" %
+                                  (len(failures), len(mutations), self.name),
+                                  failures=failures, group=self._retrieve_group())
 
     def _retrieve_group(self):
         # TODO: What does gather_groups need?
@@ -311,34 +338,6 @@ class IAMGroup(CdpModule):
         else:
             return None
 
-    def _new_assignments(self, existing_assignments):
-        new_assignments = []
-        resource_dict = dict()
-        for existing in existing_assignments:
-            if existing['resourceCrn'] in resource_dict:
-                resource_dict[existing['resourceCrn']].add(existing['resourceRoleCrn'])
-            else:
-                resource_dict[existing['resourceCrn']] = {existing['resourceRoleCrn']}
-        for assignment in self.resource_roles:
-            if assignment['resource'] not in resource_dict or assignment['role'] not in \
-                    resource_dict[assignment['resource']]:
-                new_assignments.append(assignment)
-        return new_assignments
-
-    def _stale_assignments(self, existing_assignments):
-        stale_assignments = []
-        resource_dict = dict()
-        for assignment in self.resource_roles:
-            if assignment['resource'] in resource_dict:
-                resource_dict[assignment['resource']].add(assignment['role'])
-            else:
-                resource_dict[assignment['resource']] = {assignment['role']}
-        for existing in existing_assignments:
-            if existing['resourceCrn'] not in resource_dict or existing['resourceRoleCrn'] not in \
-                    resource_dict[existing['resourceCrn']]:
-                stale_assignments.append(existing)
-        return stale_assignments
-
 
 def main():
     module = AnsibleModule(
@@ -352,7 +351,9 @@ def main():
                 resource=dict(required=True, type='str', aliases=['resourceCrn']),
                 role=dict(required=True, type='str', aliases=['resourceRoleCrn'])
             ), aliases=['assignments']),
-            purge=dict(required=False, type='bool', default=False, aliases=['replace'])
+            purge=dict(required=False, type='bool', default=False, aliases=['replace']),
+            parallelism=dict(required=False, type='int', default=1),
+            rate_limit=dict(required=False, type='float')
         ),
         supports_check_mode=True
     )
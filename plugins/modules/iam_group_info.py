@@ -17,6 +17,9 @@
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_filter import STREAM_PAGE_SIZE, iterate_pages, project, \
+    write_ndjson
+from itertools import islice
 
 ANSIBLE_METADATA = {'metadata_version': '1.1',
                     'status': ['preview'],
@@ -42,6 +45,36 @@ options:
     required: False
     aliases:
       - group_name
+  fields:
+    description:
+      - The group fields to return, for example C(groupName) and C(users).
+      - If not set, all fields are returned.
+      - The members and role assignments of the groups are only requested if C(users), C(roles) or
+        C(resource_roles) are returned.
+    type: list
+    elements: str
+    required: False
+  limit:
+    description:
+      - The maximum number of groups to return.
+      - Once reached, no further pages of groups are requested.
+    type: int
+    required: False
+  page_size:
+    description:
+      - The number of groups requested per page when listing all groups.
+      - If not set, 100 groups are requested per page when I(output_file) or I(limit) is set, so that each page is
+        requested as the groups are consumed; otherwise, every page is requested at once.
+    type: int
+    required: False
+  output_file:
+    description:
+      - Write the groups, one JSON document per line (NDJSON), to this path rather than returning them.
+      - The groups are written as each page is received, so the memory used by the module does not grow with the
+        number of groups.
+      - The path is on the host executing the module, usually the Ansible controller.
+    type: path
+    required: False
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -63,11 +96,20 @@ EXAMPLES = r'''
       - example-01
       - example-02
       - example-03
+
+# Write the name and members of every Group to a file rather than returning them
+- cloudera.cloud.iam_group_info:
+    fields:
+      - groupName
+      - users
+    output_file: /tmp/groups.ndjson
 '''
 
 RETURN = r'''
 groups:
-  description: The information about the named Group or Groups
+  description:
+    - The information about the named Group or Groups
+    - Empty if C(output_file) is set.
   type: list
   returned: always
   elements: dict
@@ -115,6 +157,14 @@ groups:
         membership.
       returned: when supported
       type: bool
+count:
+  description: The number of groups returned or written to C(output_file).
+  returned: always
+  type: int
+output_file:
+  description: The path of the file to which the groups were written.
+  returned: when C(output_file) is set
+  type: str
 sdk_out:
   description: Returns the captured CDP SDK log.
   returned: when supported
@@ -128,27 +178,63 @@ sdk_out_lines:
 
 
 class IAMGroupInfo(CdpModule):
+    # Group fields that require additional requests per group
+    DETAIL_FIELDS = ['users', 'roles', 'resource_roles']
+
     def __init__(self, module):
         super(IAMGroupInfo, self).__init__(module)
 
         # Set variables
         self.name = self._get_param('name')
+        self.fields = self._get_param('fields')
+        self.limit = self._get_param('limit')
+        self.page_size = self._get_param('page_size')
+        self.output_file = self._get_param('output_file')
 
         # Initialize the return values
         self.info = []
+        self.count = 0
 
         # Execute logic process
         self.process()
 
     @CdpModule._Decorators.process_debug
     def process(self):
-        self.info = self.cdpy.iam.gather_groups(self.name)
+        if self.name:
+            groups = self.cdpy.iam.gather_groups(self.name) or []
+        else:
+            groups = self._stream_groups()
+
+        selected = islice((project(g, self.fields) for g in groups), self.limit)
+
+        if self.output_file:
+            try:
+                self.count = write_ndjson(self.output_file, selected)
+            except (IOError, OSError) as e:
+                self.module.fail_json(msg="Unable to write groups to '%s': %s" % (self.output_file, e))
+        else:
+            self.info = list(selected)
+            self.count = len(self.info)
+
+    def _stream_groups(self):
+        details = not self.fields or any(f in self.DETAIL_FIELDS for f in self.fields)
+        streamed = self.output_file or self.limit
+        page_size = self.page_size or (STREAM_PAGE_SIZE if streamed else None)
+        for page in iterate_pages(self.cdpy.sdk, 'iam', 'list_groups', 'groups', page_size=page_size):
+            if details and page:
+                page = self.cdpy.iam.gather_groups([g['groupName'] for g in page]) or []
+            for group in page:
+                yield group
 
 
 def main():
     module = AnsibleModule(
         argument_spec=CdpModule.argument_spec(
-            name=dict(required=False, type='list', elements='str', aliases=['group_name'])
+            name=dict(required=False, type='list', elements='str', aliases=['group_name']),
+            fields=dict(required=False, type='list', elements='str'),
+            limit=dict(required=False, type='int'),
+            page_size=dict(required=False, type='int'),
+            output_file=dict(required=False, type='path'),
         ),
         supports_check_mode=True
     )
@@ -158,8 +244,12 @@ def main():
     output = dict(
         changed=False,
         groups=result.info,
+        count=result.count,
     )
 
+    if result.output_file:
+        output.update(output_file=result.output_file)
+
     if result.debug:
         output.update(
             sdk_out=result.log_out,
@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_filter import STREAM_PAGE_SIZE, iterate_records
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_iam import GroupMutation, apply_group_mutations, \
+    index_users, plan_group_mutations
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+DOCUMENTATION = r'''
+---
+module: iam_groups
+short_description: Create, update, or destroy many CDP IAM Groups
+description:
+    - Create, update, and destroy many CDP IAM Groups in a single task.
+    - The current groups, their memberships, and the users of the account are retrieved once, the changes for all
+      groups are planned together, and the planned changes are applied concurrently.
+    - Each group is reconciled as by the M(cloudera.cloud.iam_group) module.
+author:
+  - "Webster Mudge (@wmudge)"
+  - "Dan Chaffelson (@chaffelson)"
+requirements:
+  - cdpy
+options:
+  groups:
+    description:
+      - The desired state of each group.
+    type: list
+    elements: dict
+    required: True
+    contains:
+      name:
+        description:
+          - The name of the group.
+          - Names are are not case-sensitive.
+        type: str
+        required: True
+        aliases:
+          - group_name
+      state:
+        description:
+          - The state of the group.
+        type: str
+        required: False
+        default: present
+        choices:
+          - present
+          - absent
+      sync:
+        description:
+          - Whether group membership is synced when a user logs in.
+          - If not set, new groups sync membership and the setting of existing groups is unchanged.
+        type: bool
+        required: False
+        aliases:
+          - sync_membership
+          - sync_on_login
+      users:
+        description:
+          - The users assigned to the group.
+          - The user can be the name, email, workload username, or CRN of a user or machine user.
+        type: list
+        elements: str
+        required: False
+      roles:
+        description:
+          - The roles assigned to the group, identified by their full CRN.
+        type: list
+        elements: str
+        required: False
+      resource_roles:
+        description:
+          - A list of resource role assignments.
+        type: list
+        elements: dict
+        required: False
+        aliases:
+          - assignments
+        contains:
+          resource:
+            description:
+              - The resource CRN for the rights assignment.
+            type: str
+            required: True
+            aliases:
+              - resourceCrn
+          role:
+            description:
+              - The resource role CRN to be assigned.
+            type: str
+            required: True
+            aliases:
+              - resourceRoleCrn
+      purge:
+        description:
+          - Flag to replace C(roles), C(users), and C(resource_roles) with their specified values.
+          - If not set, the value of the module's I(purge) option is used.
+        type: bool
+        required: False
+        aliases:
+          - replace
+  purge:
+    description:
+      - Flag to replace C(roles), C(users), and C(resource_roles) with their specified values for every group that
+        does not set its own C(purge).
+    type: bool
+    required: False
+    default: False
+    aliases:
+      - replace
+  parallelism:
+    description:
+      - The maximum number of concurrent requests used to change the groups.
+    type: int
+    required: False
+    default: 4
+  rate_limit:
+    description:
+      - The maximum number of requests per second used to change the groups.
+      - If not set, the requests are not rate limited.
+    type: float
+    required: False
+extends_documentation_fragment:
+  - cloudera.cloud.cdp_sdk_options
+  - cloudera.cloud.cdp_auth_options
+'''
+
+EXAMPLES = r'''
+# Note: These examples do not set authentication details.
+
+# Synchronize several groups and their members from an IdP export
+- cloudera.cloud.iam_groups:
+    groups:
+      - name: group-example-a
+        users:
+          - user-a
+          - user-b
+        roles:
+          - crn:altus:iam:us-west-1:altus:role:ClassicClustersCreator
+      - name: group-example-b
+        sync: no
+        users:
+          - user-c
+    purge: yes
+    parallelism: 8
+    rate_limit: 20
+
+# Delete several groups
+- cloudera.cloud.iam_groups:
+    groups:
+      - name: group-example-a
+        state: absent
+      - name: group-example-b
+        state: absent
+'''
+
+RETURN = r'''
+groups:
+  description: The information about the present Groups, in the order requested.
+  type: list
+  returned: always
+  elements: dict
+  contains:
+    creationDate:
+      description: The date when this group record was created.
+      returned: on success
+      type: str
+      sample: 2020-07-06T12:24:05.531000+00:00
+    crn:
+      description: The CRN of the group.
+      returned: on success
+      type: str
+    groupName:
+      description: The group name.
+      returned: on success
+      type: str
+      sample: example-01
+    users:
+      description: List of User CRNs which are members of the group.
+      returned: on success
+      type: list
+      elements: str
+    roles:
+      description: List of Role CRNs assigned to the group.
+      returned: on success
+      type: list
+      elements: str
+    resource_roles:
+      description: List of Resource-to-Role assignments, by CRN, that are associated with the group.
+      returned: on success
+      type: list
+      elements: dict
+      contains:
+        resourceCrn:
+          description: The CRN of the resource granted the rights of the role.
+          returned: on success
+          type: str
+        resourceRoleCrn:
+          description: The CRN of the CDP Role.
+          returned: on success
+          type: str
+    syncMembershipOnUserLogin:
+      description: Flag indicating whether group membership is synced when a user logs in.
+      returned: when supported
+      type: bool
+changes:
+  description: The planned changes to the groups, in the order applied.
+  type: list
+  returned: always
+  elements: dict
+  contains:
+    group:
+      description: The group name.
+      returned: always
+      type: str
+    action:
+      description: The CDP IAM function of the change, for example C(create_group) or C(add_group_user).
+      returned: always
+      type: str
+    args:
+      description: The arguments of the change, for example the user CRN.
+      returned: always
+      type: list
+failures:
+  description: The changes to the groups that failed.
+  returned: when changes fail
+  type: list
+  elements: dict
+  contains:
+    group:
+      description: The group name.
+      returned: always
+      type: str
+    action:
+      description: The CDP IAM function of the change.
+      returned: always
+      type: str
+    args:
+      description: The arguments of the change.
+      returned: always
+      type: list
+    error:
+      description: The error message of the change.
+      returned: always
+      type: str
+sdk_out:
+  description: Returns the captured CDP SDK log.
+  returned: when supported
+  type: str
+sdk_out_lines:
+  description: Returns a list of each line of the captured CDP SDK log.
+  returned: when supported
+  type: list
+  elements: str
+'''
+
+
+class IAMGroups(CdpModule):
+    def __init__(self, module):
+        super(IAMGroups, self).__init__(module)
+
+        # Set Variables
+        self.groups = self._get_param('groups')
+        self.purge = self._get_param('purge')
+        self.parallelism = self._get_param('parallelism', 4)
+        self.rate_limit = self._get_param('rate_limit')
+
+        # Initialize the return values
+        self.info = []
+        self.changes = []
+        self.failures = []
+
+        # Execute logic process
+        self.process()
+
+    @CdpModule._Decorators.process_debug
+    def process(self):
+        existing = self._gather_groups(g['name'] for g in self.groups)
+        users = index_users(self.cdpy) if any(g['users'] for g in self.groups) else dict()
+
+        # Group lifecycle changes are applied before the membership changes that depend upon them
+        lifecycle = []
+        memberships = []
+        for group in self.groups:
+            current = existing.get(group['name'].lower())
+            if group['state'] == 'absent':
+                if current is not None:
+                    lifecycle.append(GroupMutation(current['groupName'], 'delete_group', ()))
+                continue
+
+            if current is None:
+                lifecycle.append(GroupMutation(group['name'], 'create_group',
+                                               (True if group['sync'] is None else group['sync'],)))
+            elif group['sync'] is not None and current['syncMembershipOnUserLogin'] != group['sync']:
+                lifecycle.append(GroupMutation(current['groupName'], 'update_group', (group['sync'],)))
+
+            memberships.extend(plan_group_mutations(
+                current['groupName'] if current is not None else group['name'], current,
+                users=self._resolve_users(group, users), roles=group['roles'],
+                resource_roles=group['resource_roles'],
+                purge=self.purge if group['purge'] is None else group['purge']))
+
+        self.changes = [dict(group=m.group, action=m.action, args=list(m.args)) for m in lifecycle + memberships]
+        if self.failures:
+            self.module.fail_json(msg="Unable to resolve the users of %s groups" % len(self.failures),
+                                  failures=self.failures, changes=self.changes)
+
+        if self.changes:
+            self.changed = True
+            if not self.module.check_mode:
+                self._apply(lifecycle, memberships)
+
+        present = [g['name'].lower() for g in self.groups if g['state'] == 'present']
+        current = existing
+        if self.changed and not self.module.check_mode:
+            # Only the groups that were changed are read again
+            changed = set(m.group.lower() for m in lifecycle + memberships)
+            current = dict((name, g) for name, g in existing.items() if name not in changed)
+            current.update(self._gather_groups(changed))
+        self.info = [current[name] for name in present if name in current]
+
+        if self.failures:
+            self.module.fail_json(msg="Failed to apply %s of %s changes to the groups" %
+                                  (len(self.failures), len(self.changes)),
+                                  failures=self.failures, changes=self.changes, groups=self.info)
+
+    def _gather_groups(self, names):
+        """Returns the existing groups of names, with their members and role assignments, by lower-case name"""
+        # Listing an unknown group fails the request, so the groups are found in the group listing first and only
+        # they are requested, with their details
+        wanted = set(name.lower() for name in names)
+        found = [g['groupName'] for g in iterate_records(self.cdpy.sdk, 'iam', 'list_groups', 'groups',
+                                                         page_size=STREAM_PAGE_SIZE)
+                 if g['groupName'].lower() in wanted]
+        if not found:
+            return dict()
+        return dict((g['groupName'].lower(), g) for g in self.cdpy.iam.gather_groups(found) or [])
+
+    def _resolve_users(self, group, users):
+        if group['users'] is None:
+            return None
+        resolved = []
+        for user in group['users']:
+            if user in users:
+                resolved.append(users[user])
+            else:
+                self.failures.append(dict(group=group['name'], action='add_group_user', args=[user],
+                                          error="User not found, '%s'" % user))
+        return resolved
+
+    def _apply(self, lifecycle, memberships):
+        self.failures.extend(apply_group_mutations(self, lifecycle, parallelism=self.parallelism,
+                                                   rate=self.rate_limit))
+
+        # Skip the membership changes of groups whose creation failed
+        failed = set(f['group'] for f in self.failures if f['action'] == 'create_group')
+        memberships = [m for m in memberships if m.group not in failed]
+        self.failures.extend(apply_group_mutations(self, memberships, parallelism=self.parallelism,
+                                                   rate=self.rate_limit))
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=CdpModule.argument_spec(
+            groups=dict(required=True, type='list', elements='dict', options=dict(
+                name=dict(required=True, type='str', aliases=['group_name']),
+                state=dict(required=False, type='str', choices=['present', 'absent'], default='present'),
+                sync=dict(required=False, type='bool', aliases=['sync_membership', 'sync_on_login']),
+                users=dict(required=False, type='list', elements='str'),
+                roles=dict(required=False, type='list', elements='str'),
+                resource_roles=dict(required=False, type='list', elements='dict', options=dict(
+                    resource=dict(required=True, type='str', aliases=['resourceCrn']),
+                    role=dict(required=True, type='str', aliases=['resourceRoleCrn'])
+                ), aliases=['assignments']),
+                purge=dict(required=False, type='bool', aliases=['replace'])
+            )),
+            purge=dict(required=False, type='bool', default=False, aliases=['replace']),
+            parallelism=dict(required=False, type='int', default=4),
+            rate_limit=dict(required=False, type='float')
+        ),
+        supports_check_mode=True
+    )
+
+    result = IAMGroups(module)
+
+    output = dict(
+        changed=result.changed,
+        groups=result.info,
+        changes=result.changes,
+    )
+
+    if result.debug:
+        output.update(
+            sdk_out=result.log_out,
+            sdk_out_lines=result.log_lines
+        )
+
+    module.exit_json(**output)
+
+
+if __name__ == '__main__':
+    main()
@@ -41,9 +41,12 @@ options:
     required: False
     aliases:
       - crn
+notes:
+  - If I(cache) is enabled, responses are cached for 7 days unless I(cache_ttl) is set.
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
+  - cloudera.cloud.cdp_cache_options
 '''
 
 EXAMPLES = r'''
@@ -94,6 +97,8 @@ PAGE_SIZE = 50
 
 
 class IAMResourceRoleInfo(CdpModule):
+    CACHE_TTL = 604800
+
     def __init__(self, module):
         super(IAMResourceRoleInfo, self).__init__(module)
 
@@ -114,7 +119,8 @@ class IAMResourceRoleInfo(CdpModule):
 def main():
     module = AnsibleModule(
         argument_spec=CdpModule.argument_spec(
-            name=dict(required=False, type='list', elements='str', aliases=['crn'])
+            name=dict(required=False, type='list', elements='str', aliases=['crn']),
+            **CdpModule.cache_argument_spec()
         ),
         supports_check_mode=True
     )
@@ -17,6 +17,9 @@
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_filter import STREAM_PAGE_SIZE, RecordFilter, \
+    iterate_records, write_ndjson
+from itertools import islice
 import re
 
 ANSIBLE_METADATA = {'metadata_version': '1.1',
@@ -56,6 +59,51 @@ options:
       - Mutually exclusive with current user and name
     type: dict
     required: False
+  match:
+    description:
+      - Key value pair where the key is the field to compare and the value is a value, or list of values, that the
+        field must equal exactly, for example C(email) or C(workloadUsername).
+      - Exact matches are evaluated before the regex statements of C(filter).
+      - Mutually exclusive with current user and name
+    type: dict
+    required: False
+  filter_mode:
+    description:
+      - Return users that match C(all) of the C(filter) and C(match) criteria, or C(any) one of them.
+    type: str
+    required: False
+    default: all
+    choices:
+      - all
+      - any
+  fields:
+    description:
+      - The user fields to return, for example C(crn) and C(workloadUsername).
+      - If not set, all fields are returned.
+    type: list
+    elements: str
+    required: False
+  limit:
+    description:
+      - The maximum number of users to return.
+      - Once reached, no further pages of users are requested.
+    type: int
+    required: False
+  page_size:
+    description:
+      - The number of users requested per page when listing all users.
+      - If not set, 100 users are requested per page when I(output_file), I(filter), I(match) or I(limit) is set,
+        so that each page is requested as the users are consumed; otherwise, every page is requested at once.
+    type: int
+    required: False
+  output_file:
+    description:
+      - Write the users, one JSON document per line (NDJSON), to this path rather than returning them.
+      - The users are written as each page is received, so the memory used by the module does not grow with the
+        number of users.
+      - The path is on the host executing the module, usually the Ansible controller.
+    type: path
+    required: False
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -76,14 +124,34 @@ EXAMPLES = r'''
     filter: 
         workloadUsername: my[0-9]{2}_admin.*?'
 
+# Gather the workload usernames of Users with any of several email addresses
+- cloudera.cloud.iam_user_info:
+    match:
+      email:
+        - jane@example.com
+        - john@example.com
+    fields:
+      - email
+      - workloadUsername
+
 # Gather detailed information about the current user
 - cloudera.cloud.iam_info:
     current_user: yes
+
+# Write the name and CRN of every User to a file rather than returning them
+- cloudera.cloud.iam_user_info:
+    fields:
+      - workloadUsername
+      - crn
+    page_size: 100
+    output_file: /tmp/users.ndjson
 '''
 
 RETURN = r'''
 users:
-  description: The information about the current or named User or Users
+  description:
+    - The information about the current or named User or Users
+    - Empty if C(output_file) is set.
   type: list
   returned: always
   elements: dict
@@ -132,6 +200,14 @@ users:
       returned: when supported
       type: str
       sample: u_023
+count:
+  description: The number of users returned or written to C(output_file).
+  returned: always
+  type: int
+output_file:
+  description: The path of the file to which the users were written.
+  returned: when C(output_file) is set
+  type: str
 sdk_out:
   description: Returns the captured CDP SDK log.
   returned: when supported
@@ -152,55 +228,47 @@ class IAMUserInfo(CdpModule):
         self.name = self._get_param('name')
         self.current = self._get_param('current_user', False)
         self.filter = self._get_param('filter')
+        self.match = self._get_param('match')
+        self.filter_mode = self._get_param('filter_mode', 'all')
+        self.fields = self._get_param('fields')
+        self.limit = self._get_param('limit')
+        self.page_size = self._get_param('page_size')
+        self.output_file = self._get_param('output_file')
 
         # Initialize filter if set
-        self.compiled_filter = self.compile_filters()
+        try:
+            self.compiled_filter = RecordFilter(patterns=self.filter, exact=self.match, mode=self.filter_mode)
+        except re.error as e:
+            self.module.fail_json(msg="Invalid filter regex: %s" % e)
 
         # Initialize the return values
         self.info = []
+        self.count = 0
 
         # Execute logic process
         self.process()
 
-    def compile_filters(self):
-        compiled_filters = {}
-
-        # Check if filter set
-        if self.filter is None:
-            return None
-
-        # Compile all regex
-        for key in self.filter.keys():
-            compiled_filters[key] = re.compile(self.filter[key])
-
-        return compiled_filters
-
+    @CdpModule._Decorators.process_debug
     def process(self):
         if self.current:
-            self.info = [self.cdpy.iam.get_user()]
-        elif self.filter is not None:
-            filtered_users = []
-
-            # Iterate users
-            for userData in self.cdpy.iam.list_users(): #self.name
-                # Iterate Filters. Must match all
-                for filter_key in self.compiled_filter:
-                    key_val = filter_key
-                    regx_expr = self.compiled_filter[filter_key]
-
-                    key_val = userData[filter_key] if filter_key in userData else None
-                    if key_val is not None:
-                        regx_result = re.search(regx_expr, key_val)
-                        if regx_result is not None:
-                            filtered_users.append(userData)
-                        else:
-                            break  # go to next user
-                    else:
-                        break  # go to next user
-
-            self.info = filtered_users
+            users = [self.cdpy.iam.get_user()]
+        elif self.name:
+            users = self.cdpy.iam.list_users(self.name)
         else:
-            self.info = self.cdpy.iam.list_users(self.name)
+            streamed = self.output_file or self.compiled_filter or self.limit
+            users = iterate_records(self.cdpy.sdk, 'iam', 'list_users', 'users',
+                                    page_size=self.page_size or (STREAM_PAGE_SIZE if streamed else None))
+
+        selected = islice(self.compiled_filter.apply(users, key='crn', fields=self.fields), self.limit)
+
+        if self.output_file:
+            try:
+                self.count = write_ndjson(self.output_file, selected)
+            except (IOError, OSError) as e:
+                self.module.fail_json(msg="Unable to write users to '%s': %s" % (self.output_file, e))
+        else:
+            self.info = list(selected)
+            self.count = len(self.info)
 
 
 def main():
@@ -209,11 +277,19 @@ def main():
             name=dict(required=False, type='list', elements='str', aliases=['user_name']),
             current_user=dict(required=False, type='bool'),
             filter=dict(required=False, type='dict'),
+            match=dict(required=False, type='dict'),
+            filter_mode=dict(required=False, type='str', choices=['all', 'any'], default='all'),
+            fields=dict(required=False, type='list', elements='str'),
+            limit=dict(required=False, type='int'),
+            page_size=dict(required=False, type='int'),
+            output_file=dict(required=False, type='path'),
         ),
         mutually_exclusive=[
             ['name', 'current_user'],
             ['filter', 'current_user'],
-            ['filter', 'name']
+            ['filter', 'name'],
+            ['match', 'current_user'],
+            ['match', 'name']
         ],
         supports_check_mode=True
     )
@@ -223,8 +299,12 @@ def main():
     output = dict(
         changed=False,
         users=result.info,
+        count=result.count,
     )
 
+    if result.output_file:
+        output.update(output_file=result.output_file)
+
     if result.debug:
         output.update(
             sdk_out=result.log_out,
@@ -17,6 +17,7 @@
 
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.cdp_common import CdpModule
+from ..module_utils.cdp_waiter import ABSENT
 
 
 ANSIBLE_METADATA = {'metadata_version': '1.1',
@@ -298,6 +299,8 @@ options:
     description:
       - Flag to enable internal polling to wait for the ML Workspace to achieve the declared state.
       - If set to FALSE, the module will return immediately.
+      - The module then returns a I(job) handle for the change it started; see
+        M(cloudera.cloud.cdp_job_status).
     type: bool
     required: False
     default: True
@@ -305,9 +308,10 @@ options:
     description:
       - The internal polling interval (in seconds) while the module waits for the ML Workspace to achieve the declared
         state.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
     type: int
     required: False
-    default: 15
     aliases:
       - polling_delay
   timeout:
@@ -319,6 +323,22 @@ options:
     default: 3600
     aliases:
       - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the ML Workspace to achieve the declared state.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - Polling ends immediately if the ML Workspace reports a failure state.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(standard).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -559,6 +579,38 @@ workspace:
       description: The version of Cloudera Machine Learning that was installed on the workspace.
       returned: always
       type: str
+job:
+  description:
+    - A handle for the change of the ML Workspace in progress, when the module does not wait for it to complete.
+    - Check the handles of one or more changes with M(cloudera.cloud.cdp_job_status).
+  returned: when I(wait=no) and a change is in progress
+  type: dict
+  contains:
+    kind:
+      description: The kind of resource.
+      returned: always
+      type: str
+      sample: ml
+    name:
+      description: The name of the resource.
+      returned: always
+      type: str
+    environment:
+      description: The Environment of the resource, if known.
+      returned: always
+      type: str
+    state:
+      description: The target state of the resource, or C(absent) if the resource is being removed.
+      returned: always
+      type: str
+    started:
+      description: The time the change was started, in seconds since the epoch.
+      returned: always
+      type: float
+    timeout:
+      description: The time, in seconds, after which the change is reported as timed out.
+      returned: always
+      type: int
 sdk_out:
   description: Returns the captured CDP SDK log.
   returned: when supported
@@ -585,6 +637,8 @@ TERMINATING_STATES = [
 
 
 class MLWorkspace(CdpModule):
+    POLLING_PROFILE = 'standard'
+
     def __init__(self, module):
         super(MLWorkspace, self).__init__(module)
 
@@ -595,7 +649,7 @@ class MLWorkspace(CdpModule):
         self.tls = self._get_param('tls')
         self.monitoring = self._get_param('monitoring')
         self.governance = self._get_param('governance')
-        self.metrics = self._get_param('metrics')
+        self.model_metrics = self._get_param('metrics')
         self.database = self._get_param('database')
         self.nfs = self._get_param('nfs')
         self.nfs_version = self._get_param('nfs_version')
@@ -613,6 +667,7 @@ class MLWorkspace(CdpModule):
 
         # Initialize return values
         self.workspace = {}
+        self.job = None
 
         # Initialize internal values
         self.target = None
@@ -650,6 +705,7 @@ class MLWorkspace(CdpModule):
                         self._wait_delete_state()
                     else:
                         self.workspace = self.target
+                        self.job = self._job_handle('ml', self.name, state=ABSENT, environment=self.env)
             elif self.state == 'present':
                 # Check the existing configuration
                 self.module.warn("ML Workspace already present and configuration validation and reconciliation is not supported;" +
@@ -674,7 +730,7 @@ class MLWorkspace(CdpModule):
                         disableTLS=not self.tls,
                         enableMonitoring=self.monitoring,
                         enableGovernance=self.governance,
-                        enableModelMetrics=self.metrics,
+                        enableModelMetrics=self.model_metrics,
                         existingDatabaseConfig=self.database,
                         existingNFS=self.nfs,
                         nfsVersion=self.nfs_version,
@@ -694,6 +750,8 @@ class MLWorkspace(CdpModule):
                         'ml', 'create_workspace', **normalized_payload)
                     if self.wait:
                         self.workspace = self._wait_ready_state()
+                    else:
+                        self.job = self._job_handle('ml', self.name, environment=self.env)
             else:
                 self.module.fail_json(
                     msg="State %s is not valid for this module" % self.state)
@@ -707,14 +765,14 @@ class MLWorkspace(CdpModule):
         self.cdpy.sdk.call('ml', 'delete_workspace', **payload)
 
     def _wait_ready_state(self):
-        return self.cdpy.sdk.wait_for_state(
+        return self._wait_for_state(
             describe_func=self.cdpy.ml.describe_workspace,
             params=dict(name=self.name, env=self.env), field='instanceStatus',
             state='installation:finished', delay=self.delay, timeout=self.timeout
         )
 
     def _wait_delete_state(self):
-        return self.cdpy.sdk.wait_for_state(
+        return self._wait_for_state(
             describe_func=self.cdpy.ml.describe_workspace,
             params=dict(name=self.name, env=self.env),
             field=None, delay=self.delay, timeout=self.timeout
@@ -797,10 +855,11 @@ def main():
             state=dict(required=False, type='str', choices=[
                        'present', 'absent'], default='present'),
             wait=dict(required=False, type='bool', default=True),
-            delay=dict(required=False, type='int', aliases=[
-                       'polling_delay'], default=15),
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
             timeout=dict(required=False, type='int', aliases=[
-                         'polling_timeout'], default=3600)
+                         'polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning'])
         ),
         supports_check_mode=True
     )
@@ -808,6 +867,9 @@ def main():
     result = MLWorkspace(module)
     output = dict(changed=False, workspace=result.workspace)
 
+    if result.job is not None:
+        output.update(job=result.job)
+
     if result.debug:
         output.update(sdk_out=result.log_out, sdk_out_lines=result.log_lines)
 
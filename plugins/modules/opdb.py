@@ -69,9 +69,10 @@ options:
     description:
       - The internal polling interval (in seconds) while the module waits for the OpDB Database to achieve the declared
         state.
+      - If set without I(polling_profile), the module polls with the C(fixed) profile at this interval.
+      - If not set, the C(fixed) profile polls every 15 seconds.
     type: int
     required: False
-    default: 15
     aliases:
       - polling_delay
   timeout:
@@ -83,6 +84,22 @@ options:
     default: 3600
     aliases:
       - polling_timeout
+  polling_profile:
+    description:
+      - The strategy used to poll while the module waits for the OpDB Database to achieve the declared state.
+      - C(fixed) polls every I(delay) seconds.
+      - C(responsive), C(standard), and C(provisioning) poll with an exponential backoff, with jitter, bounded to
+        2-15, 5-30, and 15-60 seconds respectively. The interval returns to its minimum after each observed state
+        transition.
+      - Polling ends immediately if the OpDB Database reports a failure state.
+      - If not set, C(fixed) when I(delay) is set, otherwise C(standard).
+    type: str
+    required: False
+    choices:
+      - fixed
+      - responsive
+      - standard
+      - provisioning
 extends_documentation_fragment:
   - cloudera.cloud.cdp_sdk_options
   - cloudera.cloud.cdp_auth_options
@@ -168,6 +185,8 @@ sdk_out_lines:
 
 
 class OpdbDatabase(CdpModule):
+    POLLING_PROFILE = 'standard'
+
     def __init__(self, module):
         super(OpdbDatabase, self).__init__(module)
 
@@ -206,7 +225,7 @@ class OpdbDatabase(CdpModule):
                         drop_status = self.cdpy.opdb.drop_database(name=self.name, env=self.env)
                         self.target['status'] = drop_status  # Drop command only returns status, not full object
                     if self.wait:
-                        self.cdpy.sdk.wait_for_state(
+                        self._wait_for_state(
                             describe_func=self.cdpy.opdb.describe_database,
                             params=dict(name=self.name, env=self.env),
                             field=None, delay=self.delay, timeout=self.timeout
@@ -218,7 +237,7 @@ class OpdbDatabase(CdpModule):
                 # Being Config check
                 self.module.warn("OpDB Database already present and config validation is not implemented")
                 if self.wait:
-                    self.target = self.cdpy.sdk.wait_for_state(
+                    self.target = self._wait_for_state(
                         describe_func=self.cdpy.opdb.describe_database,
                         params=dict(name=self.name, env=self.env),
                         state='AVAILABLE', delay=self.delay, timeout=self.timeout
@@ -239,7 +258,7 @@ class OpdbDatabase(CdpModule):
                     # Being handle Database Creation
                     create_status = self.cdpy.opdb.create_database(name=self.name, env=self.env)
                     if self.wait:
-                        self.target = self.cdpy.sdk.wait_for_state(
+                        self.target = self._wait_for_state(
                             describe_func=self.cdpy.opdb.describe_database,
                             params=dict(name=self.name, env=self.env),
                             state='AVAILABLE', delay=self.delay, timeout=self.timeout
@@ -258,8 +277,10 @@ def main():
             environment=dict(required=True, type='str', aliases=['env']),
             state=dict(required=False, type='str', choices=['present', 'absent'], default='present'),
             wait=dict(required=False, type='bool', default=True),
-            delay=dict(required=False, type='int', aliases=['polling_delay'], default=15),
-            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600)
+            delay=dict(required=False, type='int', aliases=['polling_delay']),
+            timeout=dict(required=False, type='int', aliases=['polling_timeout'], default=3600),
+            polling_profile=dict(required=False, type='str',
+                                 choices=['fixed', 'responsive', 'standard', 'provisioning'])
         ),
         supports_check_mode=True
     )
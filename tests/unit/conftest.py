@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import json
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import fake_backend, module_args
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_fake import CdpFakeBackend
+
+# The factor applied to the passage of time in the fake backend, so that lifecycles complete within milliseconds
+SPEED = 100000
+
+
+class CdpClientError(Exception):
+    """Raised by the SDK error handler of the test client, with the message of the CDPy error"""
+
+    def __init__(self, error):
+        message = getattr(error, 'message', None) or str(getattr(error, 'base_error', error))
+        super(CdpClientError, self).__init__(message)
+        self.error = error
+
+
+def _raise(error):
+    raise CdpClientError(error)
+
+
+def _ignore(warning):
+    pass
+
+
+@pytest.fixture
+def backend():
+    """A fake CDP control plane with two available Environments, each with a running Datalake"""
+    return CdpFakeBackend(environments=2, speed=SPEED, seed=0)
+
+
+@pytest.fixture
+def client(backend):
+    """A CDPy client that answers from the fake backend and raises errors rather than failing a module"""
+    cdpy = pytest.importorskip('cdpy.cdpy')
+    client = cdpy.Cdpy(error_handler=_raise, warning_handler=_ignore)
+    client.sdk.call = backend.wrap(client.sdk)
+    return client
+
+
+@pytest.fixture
+def no_sleep():
+    """A replacement for time.sleep that records the requested intervals"""
+    intervals = []
+
+    def _sleep(seconds):
+        intervals.append(seconds)
+
+    _sleep.intervals = intervals
+    return _sleep
+
+
+@pytest.fixture
+def module_backend(monkeypatch, tmp_path):
+    """The fake CDP control plane of the modules executed by run_module, with two Environments as for backend"""
+    monkeypatch.setenv('CDP_FAKE_BACKEND', str(tmp_path / 'cdp_fake.json'))
+    monkeypatch.setenv('CDP_FAKE_SPEED', str(SPEED))
+    monkeypatch.setenv('CDP_FAKE_ENVIRONMENTS', '2')
+    monkeypatch.setenv('CDP_FAKE_SEED', '0')
+    monkeypatch.setenv('CDP_STATE_PATH', str(tmp_path / 'cdp_state.sqlite'))
+    for variable in ['CDP_BROKER', 'CDP_CACHE', 'CDP_FINGERPRINT', 'CDP_FINGERPRINT_TTL', 'CDP_METRICS']:
+        monkeypatch.delenv(variable, raising=False)
+    return fake_backend()
+
+
+@pytest.fixture
+def run_module(module_backend, monkeypatch):
+    """Returns a function that executes a module in-process with the arguments and returns its result"""
+    pytest.importorskip('cdpy.cdpy')
+
+    # Once controller code, e.g. a lookup plugin, is imported, newer Ansible versions display the warnings of modules
+    # rather than returning them with the result
+    try:
+        from ansible.module_utils import _internal
+    except ImportError:
+        pass
+    else:
+        monkeypatch.setattr(_internal, 'is_controller', False, raising=False)
+
+    def _run(module, **args):
+        stdout = io.StringIO()
+        with module_args(args), contextlib.redirect_stdout(stdout):
+            with pytest.raises(SystemExit):
+                module.main()
+        return json.loads(stdout.getvalue())
+
+    return _run
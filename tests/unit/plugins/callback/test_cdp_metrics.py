@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.callback import cdp_metrics
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_metrics import LATENCY_BUCKETS, METRICS_FIELD
+
+
+class _Task(object):
+    action = 'cloudera.cloud.env_info'
+
+    def __init__(self, name, uuid):
+        self.name = name
+        self._uuid = uuid
+
+    def get_name(self):
+        return self.name
+
+
+class _Result(object):
+    def __init__(self, task, calls=1):
+        self._task = task
+        buckets = [calls] + [0] * len(LATENCY_BUCKETS)
+        self._result = {METRICS_FIELD: dict(calls={'environments.describe_environment': dict(
+            count=calls, errors=0, time=0.5 * calls, buckets=buckets)})}
+
+
+@pytest.fixture
+def callback(monkeypatch):
+    # The callback enables the metrics of modules executed on the controller
+    monkeypatch.setenv('CDP_METRICS', '1')
+    clock = [1000.0]
+    monkeypatch.setattr(cdp_metrics.time, 'time', lambda: clock[0])
+    plugin = cdp_metrics.CallbackModule()
+    plugin.clock = clock
+    return plugin
+
+
+def test_elapsed_time_is_recorded_once_per_task(callback):
+    task = _Task('Describe', 'uuid-1')
+    callback.v2_playbook_on_task_start(task, False)
+    for elapsed in [2.0, 5.0, 4.0]:
+        callback.clock[0] = 1000.0 + elapsed
+        callback.v2_runner_on_ok(_Result(task))
+
+    recorded = callback.tasks['Describe']
+    assert recorded['elapsed'] == 5.0
+    assert recorded['runs'] == 3 and recorded['calls'] == 3
+    assert callback.calls['environments.describe_environment']['count'] == 3
+
+
+def test_elapsed_time_of_tasks_with_the_same_name(callback):
+    for uuid, elapsed in [('uuid-1', 2.0), ('uuid-2', 3.0)]:
+        task = _Task('Describe', uuid)
+        callback.clock[0] = 1000.0
+        callback.v2_playbook_on_task_start(task, False)
+        callback.clock[0] = 1000.0 + elapsed
+        callback.v2_runner_on_failed(_Result(task))
+
+    assert callback.tasks['Describe']['elapsed'] == 5.0
+
+
+def test_results_without_metrics_are_ignored(callback):
+    result = _Result(_Task('Debug', 'uuid-1'))
+    result._result = dict(msg='example')
+    callback.v2_runner_on_ok(result)
+    assert callback.tasks == dict()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+
+import pytest
+import yaml
+
+from ansible import constants as C
+from ansible_collections.cloudera.cloud.plugins.lookup import cdp_lookup
+from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_resolver
+
+
+@pytest.fixture
+def lookup(module_backend, monkeypatch, tmp_path):
+    """Returns a function that runs the lookup, as in a new task, with the on-disk cache in tmp_path"""
+    pytest.importorskip('cdpy.cdpy')
+    monkeypatch.setattr(cdp_resolver, 'CdpResponseCache',
+                        functools.partial(cdp_resolver.CdpResponseCache, path=str(tmp_path / 'cache.sqlite')))
+
+    # The options of the lookup, as the plugin loader registers them
+    C.config.initialize_plugin_configuration_definitions('lookup', cdp_lookup.__name__,
+                                                         yaml.safe_load(cdp_lookup.DOCUMENTATION)['options'])
+
+    def _lookup(*terms, **options):
+        # Ansible runs the lookups of each task in a new process
+        monkeypatch.setattr(cdp_lookup, '_resolvers', dict())
+        plugin = cdp_lookup.LookupModule()
+        plugin._load_name = cdp_lookup.__name__
+        return plugin.run(list(terms), variables=dict(), **options)
+
+    return _lookup
+
+
+def test_crns_are_cached_across_tasks(lookup, module_backend):
+    crn = lookup('env0000')[0]
+    assert crn.startswith('crn:')
+    calls = module_backend.calls
+    assert lookup('env0000') == [crn]
+    assert module_backend.calls == calls
+
+
+def test_crns_are_resolved_on_each_task_without_cache(lookup, module_backend):
+    crn = lookup('env0000', ttl=0)[0]
+    calls = module_backend.calls
+    assert lookup('env0000', ttl=0) == [crn]
+    assert module_backend.calls > calls
+
+
+def test_fields_are_current(lookup):
+    assert lookup('env0000', 'env0001', resource='datalake', field='status') == ['RUNNING', 'RUNNING']
+
+
+def test_errors(lookup):
+    assert lookup('missing', errors='ignore') == [None]
+    with pytest.raises(Exception, match="Unable to resolve environment 'missing'"):
+        lookup('missing')
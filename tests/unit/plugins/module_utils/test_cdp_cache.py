@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_cache import CdpResponseCache, cache_identity
+
+
+def _cache(tmp_path, **kwargs):
+    return CdpResponseCache(path=str(tmp_path / 'cache' / 'cdp_cache.sqlite'), **kwargs)
+
+
+def test_private_database(tmp_path):
+    cache = _cache(tmp_path)
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(cache.path)).st_mode) == 0o700
+
+
+def test_get_and_put(tmp_path):
+    cache = _cache(tmp_path)
+    key = cache.key('environments', 'list_environments', 'environments', dict())
+    assert cache.get(key) == (False, None)
+    cache.put(key, [dict(environmentName='example-env')])
+    assert cache.get(key) == (True, [dict(environmentName='example-env')])
+
+
+def test_keys_differ_by_call(tmp_path):
+    cache = _cache(tmp_path)
+    keys = set([cache.key('datahub', 'list_clusters', 'clusters', dict(environmentName='env0000')),
+                cache.key('datahub', 'list_clusters', 'clusters', dict(environmentName='env0001')),
+                cache.key('datahub', 'list_clusters', None, dict(environmentName='env0000')),
+                cache.key('datalake', 'list_datalakes', 'clusters', dict(environmentName='env0000'))])
+    assert len(keys) == 4
+
+
+def test_keys_differ_by_profile(tmp_path, monkeypatch):
+    key = _cache(tmp_path).key('iam', 'list_users', 'users', dict())
+    monkeypatch.setenv('CDP_PROFILE', 'other')
+    assert _cache(tmp_path).key('iam', 'list_users', 'users', dict()) != key
+
+
+def test_keys_differ_by_credentials_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('CDP_PROFILE', 'default')
+    monkeypatch.setenv('CDP_CREDENTIALS_FILE', '/accounts/a/credentials')
+    key = _cache(tmp_path).key('iam', 'list_users', 'users', dict())
+    monkeypatch.setenv('CDP_CREDENTIALS_FILE', '/accounts/b/credentials')
+    assert _cache(tmp_path).key('iam', 'list_users', 'users', dict()) != key
+
+
+def test_identity_is_hashed(monkeypatch):
+    monkeypatch.setenv('CDP_PRIVATE_KEY', 'example-private-key')
+    identity = cache_identity()
+    assert 'example-private-key' not in identity
+    monkeypatch.setenv('CDP_PRIVATE_KEY', 'other-private-key')
+    assert cache_identity() != identity
+
+
+def test_expiry(tmp_path):
+    cache = _cache(tmp_path, ttl=-1)
+    cache.put('key', 'value')
+    assert cache.get('key') == (False, None)
+
+
+def test_refresh(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put('key', 'value')
+    assert _cache(tmp_path, refresh=True).get('key') == (False, None)
+
+
+def test_least_recently_used_eviction(tmp_path):
+    cache = _cache(tmp_path, max_bytes=250)
+    for key in ['a', 'b', 'c']:
+        cache.put(key, 'x' * 100)
+        if key == 'b':
+            cache.get('a')
+    assert [cache.get(k)[0] for k in ['a', 'b', 'c']] == [True, False, True]
+
+
+def test_wrap(tmp_path, client, backend):
+    cache = _cache(tmp_path)
+    client.sdk.call = cache.wrap(client.sdk)
+    for _ in range(3):
+        environments = client.sdk.call('environments', 'list_environments', ret_field='environments')
+    assert [e['environmentName'] for e in environments] == ['env0000', 'env0001']
+    assert (cache.hits, cache.misses, backend.calls) == (2, 1, 1)
+
+
+def test_wrap_does_not_store_errors(tmp_path, client, backend):
+    cache = _cache(tmp_path)
+    client.sdk.call = cache.wrap(client.sdk)
+    for _ in range(2):
+        assert client.sdk.call('datahub', 'describe_cluster', ret_field='cluster', clusterName='missing',
+                               ret_error=True) is not None
+    assert (cache.hits, backend.calls) == (0, 2)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import CdpModule
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_fake import FakeCallError
+
+
+@pytest.mark.parametrize('status_code, transient', [
+    ('429', True), ('500', True), (503, True), (None, True), ('400', False), ('403', False), ('404', False),
+])
+def test_transient_error(status_code, transient):
+    error = FakeCallError(status_code, 'ERROR', 'Example error')
+    assert CdpModule._transient_error(error) is transient
+
+
+def test_import_is_lightweight():
+    # The broker, cache, fingerprint store, waiter and fake backend are imported only by the code paths that use them
+    deferred = ['sqlite3', 'socketserver', 'cdpy']
+    deferred += ['ansible_collections.cloudera.cloud.plugins.module_utils.' + m
+                 for m in ['cdp_broker', 'cdp_cache', 'cdp_fake', 'cdp_state', 'cdp_waiter']]
+    script = ("import sys; import ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common; "
+              "print(' '.join(m for m in %r if m in sys.modules))" % deferred)
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    output = subprocess.check_output([sys.executable, '-c', script], env=environment)
+    assert output.decode().strip() == ''
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_dag import CdpDagNode, CdpDagScheduler, DONE, \
+    FAILED, SKIPPED
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import PollingStrategy
+
+
+def _serial_map(client):
+    """Returns a parallel_map function, as CdpModule._parallel_map, that calls func for each item in turn"""
+    def _map(func, items, parallelism):
+        results = []
+        for item in items:
+            try:
+                results.append((func(client, item), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+    return _map
+
+
+def _create_datahub(name, environment, started):
+    def start(client):
+        started.append(name)
+        client.sdk.call('datahub', 'create_aws_cluster', clusterName=name, environmentName=environment,
+                        clusterTemplateName='7.2.12 - Data Engineering')
+        return True, dict(kind='datahub', name=name, environment=environment)
+    return start
+
+
+def _noop(name, started):
+    def start(client):
+        started.append(name)
+        return False, None
+    return start
+
+
+def _raise(message):
+    def start(client):
+        raise ValueError(message)
+    return start
+
+
+def _scheduler(client, nodes, sleep):
+    return CdpDagScheduler(client, nodes, _serial_map(client), strategy=PollingStrategy(1, 1), sleep=sleep)
+
+
+def test_unknown_dependency(client):
+    with pytest.raises(ValueError, match='unknown nodes: missing'):
+        _scheduler(client, [CdpDagNode('a', _noop('a', []), depends_on=['missing'])], None)
+
+
+def test_cycle(client):
+    nodes = [CdpDagNode('a', _noop('a', []), depends_on=['c']), CdpDagNode('b', _noop('b', []), depends_on=['a']),
+             CdpDagNode('c', _noop('c', []), depends_on=['b']), CdpDagNode('d', _noop('d', []))]
+    with pytest.raises(ValueError, match='Dependency cycle: a -> c -> b -> a'):
+        _scheduler(client, nodes, None)
+
+
+def test_self_dependency(client):
+    with pytest.raises(ValueError, match='Dependency cycle: a -> a'):
+        _scheduler(client, [CdpDagNode('a', _noop('a', []), depends_on=['a'])], None)
+
+
+def test_dependency_order(client, no_sleep):
+    started = []
+    nodes = [CdpDagNode('hub-b', _create_datahub('example-hub-b', 'env0000', started), depends_on=['hub-a']),
+             CdpDagNode('hub-a', _create_datahub('example-hub-a', 'env0000', started)),
+             CdpDagNode('other', _create_datahub('example-hub', 'env0001', started)),
+             CdpDagNode('done', _noop('done', started), depends_on=['hub-b', 'other'])]
+    scheduler = _scheduler(client, nodes, no_sleep)
+    scheduler.run()
+
+    # The independent nodes are started together, and each dependent once its dependencies are done
+    assert started == ['example-hub-a', 'example-hub', 'example-hub-b', 'done']
+    assert [n.state for n in nodes] == [DONE, DONE, DONE, DONE]
+    assert [n.changed for n in nodes] == [True, True, True, False]
+    assert nodes[0].started >= nodes[1].finished
+    assert nodes[3].started >= max(nodes[0].finished, nodes[2].finished)
+    assert nodes[2].descriptor['environmentName'] == 'env0001'
+    assert scheduler.calls > 0
+
+
+def test_skip_on_failure(client, no_sleep):
+    started = []
+    nodes = [CdpDagNode('a', _raise('Unable to start')),
+             CdpDagNode('b', _noop('b', started), depends_on=['a']),
+             CdpDagNode('c', _noop('c', started), depends_on=['b']),
+             CdpDagNode('d', _noop('d', started))]
+    _scheduler(client, nodes, no_sleep).run()
+
+    assert started == ['d']
+    assert [n.state for n in nodes] == [FAILED, SKIPPED, SKIPPED, DONE]
+    assert nodes[0].error == 'Unable to start'
+    assert nodes[1].as_dict()['error'] == 'Skipped, as a dependency did not complete'
+
+
+def test_skip_on_failure_state(client, backend, no_sleep):
+    started = []
+
+    def start(client):
+        client.sdk.call('datahub', 'create_aws_cluster', clusterName='example-hub', environmentName='env0000')
+        with backend._state(write=True) as state:
+            for hub in state['datahubs']:
+                hub.pop('_lifecycle', None)
+                hub['status'] = 'CREATE_FAILED'
+        return True, dict(kind='datahub', name='example-hub', environment='env0000')
+
+    nodes = [CdpDagNode('hub', start), CdpDagNode('after', _noop('after', started), depends_on=['hub'])]
+    _scheduler(client, nodes, no_sleep).run()
+
+    assert started == []
+    assert [n.state for n in nodes] == [FAILED, SKIPPED]
+    assert nodes[0].error == "datahub 'example-hub' reported a failure state, CREATE_FAILED"
+
+
+def test_timeout(client, no_sleep):
+    def start(client):
+        return False, dict(kind='env', name='env0000', state='ENV_STOPPED')
+
+    nodes = [CdpDagNode('env', start), CdpDagNode('after', _noop('after', []), depends_on=['env'])]
+    scheduler = _scheduler(client, nodes, no_sleep)
+    scheduler.timeout = 0
+    scheduler.run()
+
+    assert [n.state for n in nodes] == [FAILED, SKIPPED]
+    assert nodes[0].error == "Timeout waiting for env 'env0000' (AVAILABLE, expected ENV_STOPPED)"
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_env
+
+
+DESCRIPTOR = dict(
+    environmentName='example-env', credentialName='example-cred', region='us-east-1', tunnelEnabled=True,
+    workloadAnalytics=False, tags=dict(userDefined=dict(project='example', cost='10')),
+    freeipa=dict(serverIP=['10.0.0.10', '10.0.0.11']),
+    network=dict(networkCidr='10.10.0.0/16', subnetIds=['subnet-b', 'subnet-a'], aws=dict(vpcId='vpc-1')),
+    securityAccess=dict(cidr=None, defaultSecurityGroupId='sg-default', securityGroupIdForKnox='sg-knox'),
+    authentication=dict(publicKeyId='example-key', publicKey=None),
+)
+
+
+def _params(**params):
+    """Returns module parameters, as M(cloudera.cloud.env) sets them, with every other parameter unset"""
+    unset = dict((f['param'], None) for f in cdp_env.FIELDS)
+    unset.update(params)
+    return unset
+
+
+def test_unset_parameters_are_not_compared():
+    assert cdp_env.diff('aws', _params(), DESCRIPTOR) == []
+
+
+def test_matching_parameters():
+    params = _params(credential='example-cred', tunnel=True, workload_analytics=False,
+                     tags=dict(cost=10), freeipa=dict(instanceCountByGroup=2),
+                     subnet_ids=['subnet-a', 'subnet-b'], vpc_id='vpc-1', default_sg='sg-default',
+                     knox_sg='sg-knox', public_key_id='example-key')
+    assert cdp_env.diff('aws', params, DESCRIPTOR) == []
+
+
+def test_parameters_of_other_clouds_are_not_compared():
+    assert cdp_env.diff('aws', _params(resource_gp='example-rg', project='example-project'), DESCRIPTOR) == []
+
+
+@pytest.mark.parametrize('param, value, field, actual, update', [
+    ('credential', 'other-cred', 'credentialName', 'example-cred', 'credential'),
+    ('workload_analytics', True, 'workloadAnalytics', False, 'telemetry'),
+    ('tunnel', False, 'tunnelEnabled', True, None),
+    ('tags', dict(project='other'), 'tags.userDefined', dict(project='example'), None),
+    ('tags', dict(owner='example'), 'tags.userDefined', dict(owner=None), None),
+    ('proxy', 'example-proxy', 'proxyConfig.proxyConfigName', '', 'proxy'),
+    ('freeipa', dict(instanceCountByGroup=3), 'freeipa.serverIP', 2, None),
+    ('subnet_ids', ['subnet-a'], 'network.subnetIds', ['subnet-a', 'subnet-b'], None),
+    ('knox_sg', 'sg-other', 'securityAccess.securityGroupIdForKnox', 'sg-knox', 'security_access'),
+])
+def test_difference(param, value, field, actual, update):
+    differences = cdp_env.diff('aws', _params(**{param: value}), DESCRIPTOR)
+    assert [(d['param'], d['field'], d['actual'], d['update']) for d in differences] == [(param, field, actual,
+                                                                                         update)]
+
+
+def test_violations():
+    differences = cdp_env.diff('aws', _params(credential='other-cred', region='us-west-2', tunnel=False,
+                                              tags=dict(project='other')), DESCRIPTOR)
+    assert cdp_env.violations(differences) == [['region', 'us-east-1'], ['tunnel', True]]
+    # Tags cannot be updated, but a difference is only reported
+    assert cdp_env.unresolved(differences) == [['tags', dict(project='example')]]
+
+
+def test_unset_proxy_is_not_removed():
+    assert cdp_env.diff('aws', _params(proxy=''), DESCRIPTOR) == []
+
+
+def test_plan_groups_updates():
+    params = _params(workload_analytics=True, credential='other-cred', default_sg='sg-1', knox_sg='sg-2')
+    updates = cdp_env.plan('example-env', params, cdp_env.diff('aws', params, DESCRIPTOR), DESCRIPTOR)
+
+    # A single security access update for both security groups, in the order of UPDATES
+    assert [u['func'] for u in updates] == ['change_environment_credential', 'update_security_access',
+                                            'set_telemetry_features']
+    assert updates[1]['params'] == ['default_sg', 'knox_sg']
+    assert updates[1]['request'] == dict(environment='example-env', defaultSecurityGroupId='sg-1',
+                                         gatewayNodeSecurityGroupId='sg-2')
+
+
+def test_plan_keeps_unset_security_group():
+    params = _params(knox_sg='sg-2')
+    updates = cdp_env.plan('example-env', params, cdp_env.diff('aws', params, DESCRIPTOR), DESCRIPTOR)
+    assert updates[0]['request'] == dict(environment='example-env', defaultSecurityGroupId='sg-default',
+                                         gatewayNodeSecurityGroupId='sg-2')
+
+
+def test_plan_ssh_key():
+    params = _params(public_key_text='ssh-rsa AAAA')
+    updates = cdp_env.plan('example-env', params, cdp_env.diff('aws', params, DESCRIPTOR), DESCRIPTOR)
+    assert updates[0]['request'] == dict(environment='example-env', newPublicKey='ssh-rsa AAAA')
+
+
+def test_no_plan_for_violations():
+    params = _params(region='us-west-2')
+    assert cdp_env.plan('example-env', params, cdp_env.diff('aws', params, DESCRIPTOR), DESCRIPTOR) == []
+
+
+def test_apply(client):
+    client.sdk.call('environments', 'create_aws_environment', environmentName='example-env',
+                    credentialName='example-cred', region='us-east-1', workloadAnalytics=True,
+                    securityAccess=dict(defaultSecurityGroupId='sg-default', securityGroupIdForKnox='sg-knox'))
+    params = _params(credential='other-cred', knox_sg='sg-2', workload_analytics=False, proxy='example-proxy')
+    descriptor = client.environments.describe_environment('example-env')
+    updates = cdp_env.plan('example-env', params, cdp_env.diff('aws', params, descriptor), descriptor)
+    assert len(updates) == 4
+
+    cdp_env.apply(client.sdk, updates)
+    descriptor = client.environments.describe_environment('example-env')
+    assert cdp_env.diff('aws', params, descriptor) == []
+    assert descriptor['securityAccess']['defaultSecurityGroupId'] == 'sg-default'
+
+
+def test_apply_removes_proxy(client):
+    client.sdk.call('environments', 'create_aws_environment', environmentName='example-env',
+                    credentialName='example-cred', region='us-east-1', proxyConfigName='example-proxy')
+    params = _params(proxy='')
+    descriptor = client.environments.describe_environment('example-env')
+    updates = cdp_env.plan('example-env', params, cdp_env.diff('aws', params, descriptor), descriptor)
+    assert [u['request'] for u in updates] == [dict(environment='example-env', removeProxy=True)]
+
+    cdp_env.apply(client.sdk, updates)
+    assert 'proxyConfig' not in client.environments.describe_environment('example-env')
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_filter import RecordFilter, iterate_pages, \
+    iterate_records, project, write_ndjson
+
+
+USERS = [
+    dict(crn='crn:1', email='alice@example.com', workloadUsername='alice', accountAdmin=True),
+    dict(crn='crn:2', email='bob@example.org', workloadUsername='bob', accountAdmin=False),
+    dict(crn='crn:3', email='carol@example.com', accountAdmin=False),
+    dict(crn='crn:1', email='alice@example.com', workloadUsername='alice', accountAdmin=True),
+]
+
+
+def _crns(records):
+    return [r['crn'] for r in records]
+
+
+def test_empty_filter_matches_every_record():
+    record_filter = RecordFilter()
+    assert not record_filter
+    assert _crns(record_filter.apply(USERS)) == ['crn:1', 'crn:2', 'crn:3']
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        RecordFilter(mode='none')
+
+
+def test_all_criteria():
+    record_filter = RecordFilter(patterns=dict(email='@example\\.com$'), exact=dict(accountAdmin=False))
+    assert _crns(record_filter.apply(USERS)) == ['crn:3']
+
+
+def test_any_criterion():
+    record_filter = RecordFilter(patterns=dict(email='\\.org$'), exact=dict(accountAdmin=True), mode='any')
+    assert _crns(record_filter.apply(USERS)) == ['crn:1', 'crn:2']
+
+
+def test_exact_values():
+    assert _crns(RecordFilter(exact=dict(workloadUsername=['bob', 'carol'])).apply(USERS)) == ['crn:2']
+    assert _crns(RecordFilter(exact=dict(workloadUsername='alice')).apply(USERS)) == ['crn:1']
+
+
+def test_missing_field_does_not_match():
+    assert _crns(RecordFilter(patterns=dict(workloadUsername='.*')).apply(USERS)) == ['crn:1', 'crn:2']
+
+
+def test_projection():
+    assert project(USERS[2], ['crn', 'workloadUsername']) == dict(crn='crn:3')
+    assert project(USERS[2], None) == USERS[2]
+    assert list(RecordFilter().apply(USERS[:1], fields=['email'])) == [dict(email='alice@example.com')]
+
+
+def test_iterate_pages(client, backend):
+    pages = list(iterate_pages(client.sdk, 'iam', 'list_users', 'users', page_size=4))
+    assert [len(p) for p in pages] == [4, 4, 2]
+    assert backend.calls == 3
+
+
+def test_pages_are_requested_on_demand(client, backend):
+    records = iterate_records(client.sdk, 'iam', 'list_users', 'users', page_size=4)
+    assert next(RecordFilter().apply(records))['workloadUsername'] == 'user00000'
+    assert backend.calls == 1
+
+
+def test_write_ndjson(client, tmp_path):
+    path = str(tmp_path / 'users.ndjson')
+    records = RecordFilter(patterns=dict(workloadUsername='[02468]$')).apply(
+        iterate_records(client.sdk, 'iam', 'list_users', 'users', page_size=4), fields=['workloadUsername'])
+    assert write_ndjson(path, records) == 5
+    with open(path) as output:
+        assert [json.loads(line)['workloadUsername'] for line in output] == ['user%05d' % i for i in range(0, 10, 2)]
+
+
+def test_write_ndjson_keeps_file_on_error(tmp_path):
+    path = tmp_path / 'users.ndjson'
+    path.write_text(u'previous\n')
+
+    def records():
+        yield USERS[0]
+        raise RuntimeError('Listing failed')
+
+    with pytest.raises(RuntimeError):
+        write_ndjson(str(path), records())
+    assert path.read_text() == u'previous\n'
+    assert [p.name for p in tmp_path.iterdir()] == ['users.ndjson']
+
+
+def test_unhashable_values_do_not_match():
+    records = [dict(crn='crn:1', groups=['a', 'b']), dict(crn='crn:2', groups='a')]
+    assert _crns(RecordFilter(exact=dict(groups='a')).apply(records)) == ['crn:2']
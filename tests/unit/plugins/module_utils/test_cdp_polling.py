@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import DEFAULT_DELAY, POLLING_PROFILES, \
+    PollingStrategy, field_value, wait_for_state
+
+
+def _describe(*descriptors):
+    """Returns a describe function that returns each descriptor in turn, then the last one"""
+    remaining = list(descriptors)
+
+    def describe_resource(**params):
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    return describe_resource
+
+
+def test_fixed_profile_uses_delay():
+    strategy = PollingStrategy.from_profile('fixed', delay=7)
+    assert [strategy.next_delay() for _ in range(3)] == [7, 7, 7]
+    assert PollingStrategy.from_profile('fixed').min_delay == DEFAULT_DELAY
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        PollingStrategy.from_profile('eager')
+
+
+def test_backoff_is_bounded_and_resets_on_transition():
+    strategy = PollingStrategy(2, 10, factor=2)
+    assert [strategy.next_delay() for _ in range(5)] == [2, 4, 8, 10, 10]
+    assert strategy.next_delay(transitioned=True) == 2
+    strategy.reset()
+    assert strategy.next_delay() == 2
+
+
+@pytest.mark.parametrize('profile', [p for p, s in POLLING_PROFILES.items() if s is not None])
+def test_jitter_is_within_bounds(profile):
+    settings = POLLING_PROFILES[profile]
+    strategy = PollingStrategy.from_profile(profile)
+    for _ in range(50):
+        delay = strategy.next_delay()
+        assert 0 <= delay <= settings['max_delay'] * (1 + settings['jitter'])
+
+
+def test_field_value():
+    descriptor = dict(status='AVAILABLE', securityAccess=dict(cidr='0.0.0.0/0'), tags=None)
+    assert field_value(descriptor, 'status') == 'AVAILABLE'
+    assert field_value(descriptor, ['securityAccess', 'cidr']) == '0.0.0.0/0'
+    assert field_value(descriptor, ['tags', 'userDefined']) is None
+    assert field_value(descriptor, ['network', 'subnetIds']) is None
+
+
+def test_wait_for_state(client, no_sleep):
+    describe = _describe(dict(status='REQUESTED'), dict(status='REQUESTED'), dict(status='UPDATE_IN_PROGRESS'),
+                         dict(status='AVAILABLE'))
+    result = wait_for_state(client.sdk, describe, dict(name='example'), state='AVAILABLE',
+                            strategy=PollingStrategy(1, 8, factor=2), sleep=no_sleep)
+    assert result == dict(status='AVAILABLE')
+    # The interval grows while the status is unchanged and returns to the minimum on a transition
+    assert no_sleep.intervals == [1, 2, 1]
+
+
+def test_wait_for_absence(client, no_sleep):
+    describe = _describe(dict(status='DELETE_IN_PROGRESS'), None)
+    assert wait_for_state(client.sdk, describe, dict(), field=None, strategy=PollingStrategy(1, 1),
+                          sleep=no_sleep) is None
+    assert no_sleep.intervals == [1]
+
+
+def test_wait_for_state_fails_on_failure_state(client, no_sleep):
+    describe = _describe(dict(status='REQUESTED'), dict(status='CREATE_FAILED'))
+    with pytest.raises(Exception, match='CREATE_FAILED'):
+        wait_for_state(client.sdk, describe, dict(), state='AVAILABLE', strategy=PollingStrategy(1, 1),
+                       sleep=no_sleep)
+
+
+def test_wait_for_state_ignores_failures(client, no_sleep):
+    describe = _describe(dict(status='CREATE_FAILED'), dict(status='AVAILABLE'))
+    assert wait_for_state(client.sdk, describe, dict(), state='AVAILABLE', ignore_failures=True,
+                          strategy=PollingStrategy(1, 1), sleep=no_sleep) == dict(status='AVAILABLE')
+
+
+def test_wait_for_state_times_out(client, no_sleep):
+    describe = _describe(dict(status='REQUESTED'))
+    with pytest.raises(Exception, match='Timeout'):
+        wait_for_state(client.sdk, describe, dict(), state='AVAILABLE', timeout=0, strategy=PollingStrategy(1, 1),
+                       sleep=no_sleep)
+    assert no_sleep.intervals == []
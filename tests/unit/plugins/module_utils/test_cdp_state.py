@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from ansible_collections.cloudera.cloud.plugins.module_utils import cdp_state
+
+
+LISTING = dict(clusterName='example-hub', crn='crn:cdp:datahub:us-west-1:account:cluster:1', status='AVAILABLE')
+
+
+def _store(tmp_path, **kwargs):
+    return cdp_state.CdpStateStore(path=str(tmp_path / 'cdp_state.sqlite'), **kwargs)
+
+
+def test_state_path(monkeypatch, tmp_path):
+    monkeypatch.delenv('CDP_STATE_PATH', raising=False)
+    assert cdp_state.state_path() == cdp_state.STATE_PATH
+    monkeypatch.setenv('CDP_STATE_PATH', str(tmp_path / 'state.sqlite'))
+    assert cdp_state.CdpStateStore().path == str(tmp_path / 'state.sqlite')
+
+
+def test_resource_fingerprint():
+    fingerprint = cdp_state.resource_fingerprint(LISTING, 'AVAILABLE')
+    assert fingerprint == cdp_state.resource_fingerprint(dict(LISTING, nodeCount=4), 'AVAILABLE')
+    assert fingerprint != cdp_state.resource_fingerprint(LISTING, 'STOPPED')
+    assert fingerprint != cdp_state.resource_fingerprint(dict(LISTING, crn='crn:cdp:other'), 'AVAILABLE')
+
+
+def test_params_fingerprint_ignores_execution_params():
+    params = dict(name='example-hub', env='example-env', wait=True, delay=15, debug=False)
+    fingerprint = cdp_state.params_fingerprint('datahub_cluster', params)
+    assert fingerprint == cdp_state.params_fingerprint('datahub_cluster', dict(params, wait=False, delay=None,
+                                                                               fingerprint_ttl=60))
+    assert fingerprint != cdp_state.params_fingerprint('datahub_cluster', dict(params, env='other-env'))
+    assert fingerprint != cdp_state.params_fingerprint('datalake', params)
+
+
+def test_put_get_forget(tmp_path):
+    store = _store(tmp_path)
+    assert store.get('datahub', 'example-hub') is None
+    store.put('datahub', 'example-hub', 'resource', 'params', LISTING)
+    entry = store.get('datahub', 'example-hub')
+    assert (entry['resource'], entry['params'], entry['descriptor']) == ('resource', 'params', LISTING)
+    store.forget('datahub', 'example-hub')
+    assert store.get('datahub', 'example-hub') is None
+
+
+def test_entries_are_scoped_to_environment(tmp_path):
+    store = _store(tmp_path)
+    store.put('datahub', 'example-hub', 'resource', 'params', LISTING, environment='env0000')
+    assert store.get('datahub', 'example-hub', 'env0000') is not None
+    assert store.get('datahub', 'example-hub', 'env0001') is None
+    assert store.get('datahub', 'example-hub') is None
+    store.forget('datahub', 'example-hub', 'env0001')
+    assert store.get('datahub', 'example-hub', 'env0000') is not None
+
+
+def test_entries_expire(tmp_path, monkeypatch):
+    store = _store(tmp_path, ttl=60)
+    store.put('datahub', 'example-hub', 'resource', 'params', LISTING)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 30)
+    assert store.get('datahub', 'example-hub') is not None
+    monkeypatch.setattr(time, 'time', lambda: now + 90)
+    assert store.get('datahub', 'example-hub') is None
+
+
+def test_entries_do_not_expire_without_ttl(tmp_path, monkeypatch):
+    store = _store(tmp_path, ttl=0)
+    store.put('datahub', 'example-hub', 'resource', 'params', LISTING)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 10 * cdp_state.STATE_TTL)
+    assert store.get('datahub', 'example-hub') is not None
+
+
+def test_entries_are_shared(tmp_path):
+    _store(tmp_path).put('datahub', 'example-hub', 'resource', 'params', LISTING)
+    assert _store(tmp_path).get('datahub', 'example-hub')['descriptor'] == LISTING
+
+
+def test_entries_are_scoped_to_identity(tmp_path, monkeypatch):
+    monkeypatch.setenv('CDP_CREDENTIALS_FILE', '/accounts/a/credentials')
+    _store(tmp_path).put('datahub', 'example-hub', 'resource', 'params', LISTING)
+    monkeypatch.setenv('CDP_CREDENTIALS_FILE', '/accounts/b/credentials')
+    assert _store(tmp_path).get('datahub', 'example-hub') is None
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_polling import PollingStrategy
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_waiter import ABSENT, CdpResourceWaiter, \
+    find_resource, job_handle, job_status
+
+
+def _create_datahub(client, name, environment):
+    return client.sdk.call('datahub', 'create_aws_cluster', ret_field='cluster', clusterName=name,
+                           environmentName=environment, clusterTemplateName='7.2.12 - Data Engineering')
+
+
+def _create_workspace(client, name, environment):
+    client.sdk.call('ml', 'create_workspace', workspaceName=name, environmentName=environment)
+
+
+def _set_status(backend, collection, name, status, field='status'):
+    """Ends the lifecycle of the named resources of the collection in the status"""
+    with backend._state(write=True) as state:
+        for resource in state[collection]:
+            if name in resource.values():
+                resource.pop('_lifecycle', None)
+                resource[field] = status
+
+
+def test_find_resource_by_name_or_crn(client):
+    environment = find_resource(client, 'env', 'env0000')
+    assert environment['environmentName'] == 'env0000'
+    assert find_resource(client, 'env', environment['crn'])['environmentName'] == 'env0000'
+    assert find_resource(client, 'env', 'missing') is None
+
+
+def test_find_resource_within_environment(client):
+    hubs = dict((e, _create_datahub(client, 'example-hub', e)) for e in ['env0000', 'env0001'])
+    for environment in ['env0000', 'env0001']:
+        assert find_resource(client, 'datahub', 'example-hub', environment)['crn'] == hubs[environment]['crn']
+    assert find_resource(client, 'datahub', 'example-hub', 'env0001')['environmentName'] == 'env0001'
+
+
+def test_find_unscoped_resource_within_environment(client):
+    # ML Workspaces are listed for every Environment and are told apart by the fields of their listing entries
+    for environment in ['env0000', 'env0001']:
+        _create_workspace(client, 'example-ml', environment)
+    for environment in ['env0000', 'env0001']:
+        assert find_resource(client, 'ml', 'example-ml', environment)['environmentName'] == environment
+    environment_crn = find_resource(client, 'env', 'env0001')['crn']
+    assert find_resource(client, 'ml', 'example-ml', environment_crn)['environmentName'] == 'env0001'
+
+
+def _create_dw_clusters(client, backend, name):
+    """Creates a DW Cluster of the name in each Environment; returns the CRNs of the Environments"""
+    crns = [find_resource(client, 'env', e)['crn'] for e in ['env0000', 'env0001']]
+    for crn in crns:
+        client.sdk.call('dw', 'create_cluster', environmentCrn=crn)
+    with backend._state(write=True) as state:
+        for cluster in state['dw_clusters']:
+            cluster['name'] = name
+    return crns
+
+
+def test_find_dw_cluster_within_environment(client, backend):
+    crns = _create_dw_clusters(client, backend, 'example-dw')
+    assert find_resource(client, 'dw', 'example-dw', 'env0001')['environmentCrn'] == crns[1]
+    assert find_resource(client, 'dw', 'example-dw', crns[0])['environmentCrn'] == crns[0]
+    assert find_resource(client, 'dw', 'example-dw', 'missing') is None
+
+
+def test_poll_resolves_environment_names(client, backend):
+    crns = _create_dw_clusters(client, backend, 'example-dw')
+    waiter = CdpResourceWaiter(client, [dict(kind='dw', name='example-dw', environment=e)
+                                        for e in ['env0000', crns[1]]])
+    results = waiter.poll()
+    # One listing of DW Clusters, and one of Environments to resolve the name of env0000
+    assert waiter.calls == 2
+    assert [r['resource']['environmentCrn'] for r in results] == crns
+
+
+def test_unknown_kind(client):
+    with pytest.raises(ValueError):
+        CdpResourceWaiter(client, [dict(kind='cde', name='example')])
+
+
+def test_poll_lists_each_kind_once(client):
+    waiter = CdpResourceWaiter(client, [dict(kind='env', name='env0000'), dict(kind='env', name='env0001'),
+                                        dict(kind='datalake', name='env0000-dl', environment='env0000'),
+                                        dict(kind='datalake', name='env0001-dl', environment='env0001')])
+    results = waiter.poll()
+    # One listing of Environments, and one listing of Datalakes per Environment
+    assert waiter.calls == 3
+    assert [r['ready'] for r in results] == [True, True, True, True]
+    assert [r['status'] for r in results] == ['AVAILABLE', 'AVAILABLE', 'RUNNING', 'RUNNING']
+
+
+def test_wait_for_resources(client, no_sleep):
+    for environment in ['env0000', 'env0001']:
+        _create_datahub(client, 'example-hub', environment)
+    waiter = CdpResourceWaiter(client, [dict(kind='datahub', name='example-hub', environment=e)
+                                        for e in ['env0000', 'env0001']],
+                               strategy=PollingStrategy(1, 1), sleep=no_sleep)
+    results = waiter.wait()
+    assert [r['status'] for r in results] == ['AVAILABLE', 'AVAILABLE']
+    assert [r['resource']['environmentName'] for r in results] == ['env0000', 'env0001']
+    assert waiter.calls % 2 == 0
+
+
+def test_wait_for_absence(client, no_sleep):
+    _create_datahub(client, 'example-hub', 'env0000')
+    client.sdk.call('datahub', 'delete_cluster', clusterName='example-hub')
+    results = CdpResourceWaiter(client, [dict(kind='datahub', name='example-hub', environment='env0000',
+                                              state=ABSENT)], sleep=no_sleep).wait()
+    assert results[0]['ready'] and results[0]['resource'] is None
+
+
+def test_wait_fails_on_failure_state(client, backend, no_sleep):
+    _create_datahub(client, 'example-hub', 'env0000')
+    _set_status(backend, 'datahubs', 'example-hub', 'CREATE_FAILED')
+    waiter = CdpResourceWaiter(client, [dict(kind='datahub', name='example-hub', environment='env0000')],
+                               sleep=no_sleep)
+    with pytest.raises(Exception, match="datahub 'example-hub' \\(CREATE_FAILED\\)"):
+        waiter.wait()
+
+
+def test_wait_for_any_resource(client, backend, no_sleep):
+    for name in ['example-hub', 'example-hub-2']:
+        _create_datahub(client, name, 'env0000')
+    _set_status(backend, 'datahubs', 'example-hub', 'CREATE_FAILED')
+    results = CdpResourceWaiter(client, [dict(kind='datahub', name=n, environment='env0000')
+                                         for n in ['example-hub', 'example-hub-2']],
+                                condition='any', sleep=no_sleep).wait()
+    assert [r['ready'] for r in results] == [False, True]
+
+
+def test_wait_times_out(client, no_sleep):
+    _create_datahub(client, 'example-hub', 'env0000')
+    with pytest.raises(Exception, match='Timeout'):
+        CdpResourceWaiter(client, [dict(kind='datahub', name='example-hub', environment='env0000', state='STOPPED')],
+                          timeout=0, sleep=no_sleep).wait()
+
+
+def test_job_status(client, backend):
+    _create_datahub(client, 'example-hub', 'env0000')
+    _create_workspace(client, 'example-ml', 'env0001')
+    _set_status(backend, 'datahubs', 'example-hub', 'AVAILABLE')
+    _set_status(backend, 'workspaces', 'example-ml', 'CREATE_FAILED', field='instanceStatus')
+    jobs = [job_handle('datahub', 'example-hub', environment='env0000'),
+            job_handle('ml', 'example-ml', environment='env0001'),
+            dict(job_handle('env', 'env0000', state='ENV_STOPPED', timeout=60), started=0)]
+    results, calls = job_status(client, jobs)
+    assert calls == 3
+    assert [r['done'] for r in results] == [True, True, True]
+    assert [r['failed'] for r in results] == [False, True, False]
+    assert [r['timed_out'] for r in results] == [False, False, True]
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_dag import DONE
+from ansible_collections.cloudera.cloud.plugins.modules import cdp_stack
+
+
+STACK = dict(
+    cloud='aws',
+    environment=dict(environmentName='example-env', credentialName='cred', region='us-west-1'),
+    datalake=dict(datalakeName='example-dl'),
+    datahubs=[dict(clusterName='example-hub', clusterTemplateName='7.2.12 - Data Engineering')],
+    ml=[dict(workspaceName='example-ml')],
+    dw=dict(),
+    delay=1,
+)
+
+
+@pytest.fixture
+def run_stack(run_module, no_sleep, monkeypatch):
+    """Returns a function that executes the module with STACK, updated by the arguments, without sleeping"""
+    monkeypatch.setattr(time, 'sleep', no_sleep)
+
+    def _run(**params):
+        args = dict(STACK)
+        args.update(params)
+        return run_module(cdp_stack, **args)
+
+    return _run
+
+
+def _states(result):
+    return dict((r['id'], (r['state'], r['changed'])) for r in result['resources'])
+
+
+def test_create_stack(run_stack):
+    result = run_stack()
+    assert result['changed']
+    assert _states(result) == {
+        'environment': (DONE, True), 'datalake': (DONE, True), 'datahub:example-hub': (DONE, True),
+        'ml:example-ml': (DONE, True), 'dw': (DONE, True)}
+
+    # The resources that exist are not created again
+    result = run_stack()
+    assert not result['changed']
+    assert all(state == DONE for state, changed in _states(result).values())
+
+
+def test_existing_stack(run_stack, module_backend):
+    result = run_stack(environment=dict(environmentName='env0000'), datalake=dict(datalakeName='env0000-dl'),
+                       datahubs=[], ml=[], dw=None)
+    assert not result['changed']
+    assert _states(result) == {'environment': (DONE, False), 'datalake': (DONE, False)}
+
+
+def test_check_mode(run_stack, module_backend):
+    result = run_stack(_ansible_check_mode=True)
+    assert result['changed']
+    assert all(changed for state, changed in _states(result).values())
+    environments = module_backend.call('environments', 'list_environments')['environments']
+    assert 'example-env' not in [e['environmentName'] for e in environments]
+
+
+def test_invalid_request(run_stack):
+    result = run_stack(datahubs=[dict(clusterTemplateName='7.2.12 - Data Engineering')])
+    assert result['failed'] and result['msg'] == "Each 'datahubs' request requires 'clusterName'"
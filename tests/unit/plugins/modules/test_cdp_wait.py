@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ansible_collections.cloudera.cloud.plugins.modules import cdp_wait
+
+
+def _create_datahub(backend, name, environment):
+    backend.call('datahub', 'create_aws_cluster', clusterName=name, environmentName=environment,
+                 clusterTemplateName='7.2.12 - Data Engineering')
+
+
+def test_wait_for_resources(run_module, module_backend):
+    for environment in ['env0000', 'env0001']:
+        _create_datahub(module_backend, 'example-hub', environment)
+    result = run_module(cdp_wait, delay=0, resources=[
+        dict(kind='env', name='env0000'),
+        dict(kind='datahub', name='example-hub', env='env0000'),
+        dict(kind='datahub', name='example-hub', env='env0001'),
+    ])
+    assert [r['ready'] for r in result['resources']] == [True, True, True]
+    assert [r['resource']['environmentName'] for r in result['resources'][1:]] == ['env0000', 'env0001']
+
+
+def test_wait_for_dw_cluster_within_environment(run_module, module_backend):
+    crns = [module_backend.call('environments', 'describe_environment', environmentName=e)['environment']['crn']
+            for e in ['env0000', 'env0001']]
+    ids = [module_backend.call('dw', 'create_cluster', environmentCrn=crn)['clusterId'] for crn in crns]
+    with module_backend._state(write=True) as state:
+        for cluster in state['dw_clusters']:
+            cluster['name'] = 'example-dw'
+    result = run_module(cdp_wait, delay=0, resources=[dict(kind='dw', name='example-dw', env='env0001')])
+    assert result['resources'][0]['resource']['id'] == ids[1]
+
+
+def test_opdb_requires_environment(run_module):
+    result = run_module(cdp_wait, resources=[dict(kind='opdb', name='example-db')])
+    assert result['failed']
+    assert result['msg'] == "OpDB Database 'example-db' requires an 'environment'"
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from ansible_collections.cloudera.cloud.plugins.modules import datahub_cluster
+
+
+def _create(backend, name, environment):
+    backend.call('datahub', 'create_aws_cluster', clusterName=name, environmentName=environment,
+                 clusterTemplateName='7.2.12 - Data Engineering')
+
+
+def test_fingerprint_skips_describe(run_module, module_backend):
+    _create(module_backend, 'example-hub', 'env0000')
+    first = run_module(datahub_cluster, name='example-hub', env='env0000', fingerprint=True)
+    assert first['datahub']['status'] == 'AVAILABLE'
+
+    calls = module_backend.calls
+    second = run_module(datahub_cluster, name='example-hub', env='env0000', fingerprint=True)
+    # A single listing call confirms the converged Datahub
+    assert module_backend.calls - calls == 1
+    assert second['datahub'] == first['datahub']
+    assert not second['changed']
+
+
+def test_fingerprint_is_scoped_to_environment(run_module, module_backend):
+    _create(module_backend, 'example-hub', 'env0000')
+    run_module(datahub_cluster, name='example-hub', env='env0000', fingerprint=True)
+    # The fingerprint of the Datahub in env0000 does not answer for env0001
+    result = run_module(datahub_cluster, name='example-hub', env='env0001', fingerprint=True)
+    assert result['failed']
+    assert result['msg'].startswith('Datahub exists in a different Environment')
+
+
+def test_fingerprint_expires(run_module, module_backend, monkeypatch):
+    _create(module_backend, 'example-hub', 'env0000')
+    run_module(datahub_cluster, name='example-hub', env='env0000', fingerprint=True, fingerprint_ttl=60)
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 120)
+    calls = module_backend.calls
+    run_module(datahub_cluster, name='example-hub', env='env0000', fingerprint=True, fingerprint_ttl=60)
+    assert module_backend.calls - calls > 1
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from ansible_collections.cloudera.cloud.plugins.modules import datahub_template_info
+
+
+def test_list_templates(run_module, module_backend):
+    result = run_module(datahub_template_info)
+    assert len(result['templates']) == 4
+    assert all('clusterTemplateContent' not in t for t in result['templates'])
+    # A single listing call, without describing each template
+    assert module_backend.calls == 1
+
+
+def test_template_content(run_module, module_backend):
+    result = run_module(datahub_template_info, return_content=True, parallelism=4)
+    assert [json.loads(t['clusterTemplateContent'])['displayName'] for t in result['templates']] == \
+        ['Data Engineering', 'Data Mart', 'Flow Management', 'Streams Messaging']
+    assert module_backend.calls == 5
+
+
+def test_named_template_content(run_module):
+    result = run_module(datahub_template_info, name='7.2.12 - Data Mart', return_content=True)
+    assert [t['clusterTemplateName'] for t in result['templates']] == ['7.2.12 - Data Mart']
+    assert 'clusterTemplateContent' in result['templates'][0]
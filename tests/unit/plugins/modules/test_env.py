@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.modules import env
+
+
+PARAMS = dict(name='example-env', cloud='aws', region='us-east-1', credential='example-cred',
+              log_location='s3a://example/logs', log_identity='arn:aws:iam::1:instance-profile/example',
+              public_key_id='example-key', network_cidr='10.10.0.0/16', inbound_cidr='0.0.0.0/0', wait=False)
+
+
+@pytest.fixture
+def environment(run_module):
+    """Creates the Environment of PARAMS, with tags and a proxy config, and returns a function to reconcile it"""
+    result = run_module(env, tags=dict(project='example'), proxy='example-proxy', **PARAMS)
+    assert result['changed']
+
+    def _reconcile(**params):
+        args = dict(PARAMS)
+        args.update(params)
+        return run_module(env, **args)
+
+    return _reconcile
+
+
+def test_unchanged(environment, module_backend):
+    calls = module_backend.calls
+    result = environment(tags=dict(project='example'), proxy='example-proxy')
+    assert not result['changed'] and 'updates' not in result
+    assert module_backend.calls == calls + 1
+
+
+def test_update(environment):
+    result = environment(credential='other-cred', workload_analytics=False, proxy='')
+    assert result['changed']
+    assert [u['func'] for u in result['updates']] == ['change_environment_credential', 'update_proxy_config',
+                                                      'set_telemetry_features']
+    assert result['environment']['credentialName'] == 'other-cred'
+    assert 'proxyConfig' not in result['environment']
+
+
+def test_check_mode(environment):
+    result = environment(credential='other-cred', _ansible_check_mode=True)
+    assert result['changed'] and result['updates'][0]['func'] == 'change_environment_credential'
+    assert result['environment']['credentialName'] == 'example-cred'
+
+
+def test_fixed_field(environment):
+    result = environment(region='us-west-2')
+    assert result['failed']
+    assert result['violations'] == [['region', 'us-east-1']]
+
+
+def test_tags_are_reported(environment):
+    result = environment(tags=dict(project='other', owner='example'))
+    assert not result['changed'] and not result.get('failed')
+    assert len([w for w in result['warnings'] if "parameter 'tags'" in str(w)]) == 1
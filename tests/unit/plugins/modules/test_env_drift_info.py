@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ansible_collections.cloudera.cloud.plugins.modules import env_drift_info
+
+
+def test_compliant_and_missing(run_module):
+    # Values are converted to the types of M(cloudera.cloud.env) before they are compared
+    result = run_module(env_drift_info, environments=[
+        dict(name='env0000', cloud='aws', credential='cred', tunnel='yes', freeipa=dict(instanceCountByGroup='1')),
+        dict(name='example-env', cloud='aws'),
+    ])
+    assert result['drift'] == []
+    assert result['compliant'] == ['env0000']
+    assert result['missing'] == ['example-env']
+
+
+def test_drift(run_module):
+    result = run_module(env_drift_info, environments=[
+        dict(name='env0000', cloud='aws', credential='other-cred', environment_tags=dict(project='example')),
+        dict(name='env0001', cloud='azure'),
+    ])
+    assert [(d['environment'], d['param'], d['actual'], d['update'], d['strict']) for d in result['drift']] == [
+        ('env0000', 'credential', 'cred', 'credential', True),
+        ('env0000', 'tags', dict(project=None), None, False),
+        ('env0001', 'cloud', 'aws', None, True)]
+    assert result['compliant'] == []
+
+
+def test_invalid_parameters(run_module):
+    result = run_module(env_drift_info, environments=[dict(name='env0000', cloud='aws', tunnel='sometimes')])
+    assert result['failed'] and 'tunnel' in result['msg']
+
+    result = run_module(env_drift_info, environments=[dict(name='env0000', cloud='aws',
+                                                           freeipa=dict(instanceCountByGroup='two'))])
+    assert result['failed'] and 'instanceCountByGroup' in result['msg']
+
+    result = run_module(env_drift_info, environments=[dict(name='env0000', cloud='aws', credentials='cred')])
+    assert result['failed'] and 'credentials' in result['msg']
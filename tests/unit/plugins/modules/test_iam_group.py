@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import fake_backend
+from ansible_collections.cloudera.cloud.plugins.modules import iam_group
+
+
+@pytest.fixture
+def groups_backend(monkeypatch, module_backend):
+    """The fake CDP control plane of module_backend, with 2 groups of the 10 users"""
+    monkeypatch.setenv('CDP_FAKE_GROUPS', '2')
+    return fake_backend()
+
+
+def _crns(backend, *emails):
+    return sorted(u['crn'] for u in backend.call('iam', 'list_users', userIds=list(emails))['users'])
+
+
+def test_unchanged_group(run_module, groups_backend):
+    members = groups_backend.call('iam', 'list_group_members', groupName='group0000')['memberCrns']
+    result = run_module(iam_group, name='group0000', users=members)
+    assert not result['changed']
+    assert sorted(result['group']['users']) == sorted(members)
+
+
+def test_add_members(run_module, groups_backend):
+    result = run_module(iam_group, name='group0000', users=['user00001@example.com', 'user00003@example.com'],
+                        roles=['example-role'], parallelism=4)
+    assert result['changed']
+    # The members of the group, every other user, are kept
+    expected = _crns(groups_backend, *['user%05d@example.com' % i for i in [0, 1, 2, 3, 4, 6, 8]])
+    assert sorted(result['group']['users']) == expected
+    assert result['group']['roles'] == ['example-role']
+
+
+def test_purge_members(run_module, groups_backend):
+    result = run_module(iam_group, name='group0000', users=['user00001@example.com'], purge=True)
+    assert result['changed']
+    assert result['group']['users'] == _crns(groups_backend, 'user00001@example.com')
+
+
+def test_check_mode(run_module, groups_backend):
+    result = run_module(iam_group, name='group0000', users=['user00001@example.com'], purge=True, sync=False,
+                        _ansible_check_mode=True)
+    assert result['changed']
+    assert len(groups_backend.call('iam', 'list_group_members', groupName='group0000')['memberCrns']) == 5
+
+
+def test_delete_group(run_module, groups_backend):
+    result = run_module(iam_group, name='group0001', state='absent')
+    assert result['changed']
+    assert [g['groupName'] for g in groups_backend.call('iam', 'list_groups')['groups']] == ['group0000']
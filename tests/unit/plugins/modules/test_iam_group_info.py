@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import fake_backend
+from ansible_collections.cloudera.cloud.plugins.modules import iam_group_info
+
+
+@pytest.fixture
+def groups_backend(monkeypatch, module_backend):
+    """The fake CDP control plane of module_backend, with more groups than it returns in a single page"""
+    monkeypatch.setenv('CDP_FAKE_GROUPS', '250')
+    return fake_backend()
+
+
+def test_list_groups(run_module, groups_backend):
+    result = run_module(iam_group_info, fields=['groupName'])
+    assert len(result['groups']) == 250
+    assert groups_backend.calls == 3
+
+
+def test_limit_requests_only_needed_pages(run_module, groups_backend):
+    result = run_module(iam_group_info, fields=['groupName'], limit=2)
+    assert result['groups'] == [dict(groupName='group0000'), dict(groupName='group0001')]
+    assert groups_backend.calls == 1
+
+
+def test_output_file(run_module, groups_backend, tmp_path):
+    path = str(tmp_path / 'groups.ndjson')
+    result = run_module(iam_group_info, fields=['groupName'], output_file=path)
+    assert result['groups'] == [] and result['count'] == 250
+    with open(path) as output:
+        assert len([json.loads(line) for line in output]) == 250
+    assert groups_backend.calls == 3
+
+
+def test_group_details(run_module, groups_backend):
+    result = run_module(iam_group_info, name=['group0001'])
+    assert [g['groupName'] for g in result['groups']] == ['group0001']
+    assert len(result['groups'][0]['users']) == 1
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import fake_backend
+from ansible_collections.cloudera.cloud.plugins.modules import iam_groups
+
+
+@pytest.fixture
+def groups_backend(monkeypatch, module_backend):
+    """The fake CDP control plane of module_backend, with 20 groups of the 10 users"""
+    monkeypatch.setenv('CDP_FAKE_GROUPS', '20')
+    return fake_backend()
+
+
+def _members(result):
+    return dict((g['groupName'], sorted(g['users'])) for g in result['groups'])
+
+
+def test_unchanged_groups(run_module, groups_backend):
+    result = run_module(iam_groups, groups=[dict(name='GROUP0001')])
+    assert not result['changed']
+    assert [g['groupName'] for g in result['groups']] == ['group0001']
+    # A single group listing, then the details of the requested group alone
+    assert groups_backend.calls == 5
+
+
+def test_create_update_and_delete(run_module, groups_backend):
+    user = groups_backend.call('iam', 'list_users', userIds=['user00003@example.com'])['users'][0]
+    result = run_module(iam_groups, groups=[
+        dict(name='example-group', users=['user00003@example.com'], roles=['example-role']),
+        dict(name='group0002', sync=False),
+        dict(name='group0003', state='absent'),
+        dict(name='missing', state='absent'),
+    ])
+    assert result['changed']
+    assert [(c['group'], c['action']) for c in result['changes']] == [
+        ('example-group', 'create_group'), ('group0002', 'update_group'), ('group0003', 'delete_group'),
+        ('example-group', 'add_group_user'), ('example-group', 'assign_group_role')]
+    assert _members(result) == {'example-group': [user['crn']], 'group0002': [result['groups'][1]['users'][0]]}
+    assert result['groups'][0]['roles'] == ['example-role']
+    assert result['groups'][1]['syncMembershipOnUserLogin'] is False
+
+    groups = groups_backend.call('iam', 'list_groups')['groups']
+    assert len(groups) == 20 and 'group0003' not in [g['groupName'] for g in groups]
+
+
+def test_unknown_user(run_module, groups_backend):
+    result = run_module(iam_groups, groups=[dict(name='group0001', users=['unknown'])])
+    assert result['failed']
+    assert result['failures'] == [dict(group='group0001', action='add_group_user', args=['unknown'],
+                                       error="User not found, 'unknown'")]
+
+
+def test_check_mode(run_module, groups_backend):
+    result = run_module(iam_groups, groups=[dict(name='example-group')], _ansible_check_mode=True)
+    assert result['changed'] and result['groups'] == []
+    assert 'example-group' not in [g['groupName'] for g in groups_backend.call('iam', 'list_groups')['groups']]
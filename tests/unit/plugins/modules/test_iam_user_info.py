@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2021 Cloudera, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from ansible_collections.cloudera.cloud.plugins.module_utils.cdp_common import fake_backend
+from ansible_collections.cloudera.cloud.plugins.modules import iam_user_info
+
+
+@pytest.fixture
+def users_backend(monkeypatch, module_backend):
+    """The fake CDP control plane of module_backend, with more users than it returns in a single page"""
+    monkeypatch.setenv('CDP_FAKE_USERS', '250')
+    return fake_backend()
+
+
+def test_list_users(run_module, users_backend):
+    result = run_module(iam_user_info)
+    assert len(result['users']) == 250
+    assert users_backend.calls == 3
+
+
+def test_limit_requests_only_needed_pages(run_module, users_backend):
+    result = run_module(iam_user_info, limit=2)
+    assert [u['workloadUsername'] for u in result['users']] == ['user00000', 'user00001']
+    assert users_backend.calls == 1
+
+
+def test_output_file(run_module, users_backend, tmp_path):
+    path = str(tmp_path / 'users.ndjson')
+    result = run_module(iam_user_info, output_file=path, match=dict(workloadUsername=['user00001', 'user00201']),
+                        fields=['workloadUsername'])
+    assert result['users'] == [] and result['count'] == 2
+    with open(path) as output:
+        records = [json.loads(line) for line in output]
+    assert records == [dict(workloadUsername='user00001'), dict(workloadUsername='user00201')]